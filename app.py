@@ -11,6 +11,8 @@ else:
     logging.info("Arquivo .env carregado com sucesso.")
 
 from flask import Flask
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
 from extensions import db
 from config import WORDPRESS_CONFIG
 from services.scheduler import init_scheduler, get_scheduler
@@ -18,6 +20,29 @@ from services.scheduler import init_scheduler, get_scheduler
 # Configuração básica de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+def _add_missing_columns():
+    """
+    Adds columns declared in the models but missing from tables that already exist.
+    db.create_all() only creates new tables, so databases created by an older version of the
+    models would otherwise never receive new columns. Only nullable columns are supported.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                for index in table.indexes:
+                    if column.name in index.columns:
+                        conn.execute(CreateIndex(index, if_not_exists=True))
+                logging.info(f"Coluna '{table.name}.{column.name}' adicionada ao banco de dados existente.")
+
 def create_app():
     """Cria e configura uma instância da aplicação Flask."""
     app = Flask(__name__)
@@ -35,9 +60,20 @@ def create_app():
     # Inicializa as extensões
     db.init_app(app)
 
+    # Painel e API de status (/api/ai-status, /api/feed-health, /api/http-metrics, ...)
+    from routes.dashboard import dashboard_bp
+    from routes.api import api_bp
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(api_bp, url_prefix='/api')
+
+    # Callback público dos hubs WebSub (verificação de intenção e recebimento de conteúdo)
+    from routes.websub import websub_bp
+    app.register_blueprint(websub_bp, url_prefix='/websub')
+
     # Cria as tabelas do banco de dados se não existirem
     with app.app_context():
         db.create_all()
+        _add_missing_columns()
 
     return app
 
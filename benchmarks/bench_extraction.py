@@ -0,0 +1,124 @@
+"""
+Compares the ContentExtractor parsers ('legacy' BeautifulSoup pipeline vs single-parse 'lxml')
+in milliseconds per page, and checks that both produce the same output.
+
+    python -m benchmarks.bench_extraction                    # synthetic Valnet-style pages
+    python -m benchmarks.bench_extraction --pages saved/     # saved .html / .html.gz pages
+
+Saved pages are resolved against their <link rel="canonical"> URL. Results are written as JSON
+to benchmarks/results/ (or --output).
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+sys.path.insert(0, ROOT)
+
+import config  # noqa: E402
+from services.content_extractor import ContentExtractor  # noqa: E402
+from benchmarks.valnet_pages import corpus  # noqa: E402
+
+_CANONICAL_RE = re.compile(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', re.I)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_pages(directory: str) -> list[tuple[str, str]]:
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith('.html.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+                html = f.read()
+        elif name.endswith('.html'):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                html = f.read()
+        else:
+            continue
+        match = _CANONICAL_RE.search(html)
+        pages.append((match.group(1) if match else f'https://localhost/{name}', html))
+    return pages
+
+
+def _percentile(values: list, percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+def measure(pages: list, parser: str, repeat: int) -> tuple[dict, list]:
+    config.EXTRACTION_CONFIG['parser'] = parser
+    extractor = ContentExtractor()
+    outputs = [extractor.extract_from_html(html, url) for url, html in pages]  # warm-up
+    timings = []
+    for _ in range(repeat):
+        for url, html in pages:
+            start = time.perf_counter()
+            extractor.extract_from_html(html, url)
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'pages': len(pages),
+        'runs': repeat,
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'p50_ms': round(_percentile(timings, 50), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+    }, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', help='directory with saved .html / .html.gz pages (default: synthetic pages)')
+    parser.add_argument('--synthetic-per-site', type=int, default=5, help='synthetic pages per source site')
+    parser.add_argument('--repeat', type=int, default=3, help='timed passes over the pages')
+    parser.add_argument('--output', help='path of the JSON report (default: benchmarks/results/extraction-<timestamp>.json)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    pages = load_pages(args.pages) if args.pages else corpus(args.synthetic_per_site)
+    if not pages:
+        raise SystemExit('No pages to benchmark.')
+
+    report = {
+        'benchmark': 'extraction',
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': args.pages or f'synthetic ({args.synthetic_per_site} per site)',
+        'avg_page_kb': round(statistics.fmean(len(html) for _, html in pages) / 1024, 1),
+        'parsers': {},
+    }
+    outputs = {}
+    for name in ('legacy', 'lxml'):
+        report['parsers'][name], outputs[name] = measure(pages, name, args.repeat)
+        stats = report['parsers'][name]
+        print(f"{name:>6}: {stats['mean_ms']:8.2f} ms/page (p50 {stats['p50_ms']:.2f}, p95 {stats['p95_ms']:.2f}) over {len(pages)} pages")
+
+    report['speedup'] = round(report['parsers']['legacy']['mean_ms'] / report['parsers']['lxml']['mean_ms'], 2)
+    report['identical_outputs'] = sum(a == b for a, b in zip(outputs['legacy'], outputs['lxml']))
+    print(f"speedup x{report['speedup']}, identical outputs: {report['identical_outputs']}/{len(pages)}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"extraction-{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+
+if __name__ == '__main__':
+    main()
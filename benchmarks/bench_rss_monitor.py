@@ -0,0 +1,213 @@
+"""
+Throughput benchmark for RSSMonitor.fetch_new_articles.
+
+Replays the recorded feeds in benchmarks/feeds/ through a local HTTP server and runs the
+discovery step the way the scheduler does (prefetch + fetch_new_articles per feed key) against
+a throwaway SQLite database seeded with a given number of known articles.
+
+Each known-URL set size is measured in three phases:
+    cold     no feed state and nothing from the corpus stored yet: every entry is parsed
+    settled  the corpus entries are now stored: full download and parse, nothing new
+    warm     validators were stored by the settled phase: every feed answers 304
+
+    python -m benchmarks.bench_rss_monitor --known-sizes 0 10000 100000
+
+Results are written as JSON to benchmarks/results/ (or --output) so runs can be compared.
+Timings are taken with tracemalloc running unless --no-tracemalloc is given.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEEDS_DIR = os.path.join(ROOT, 'benchmarks', 'feeds')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# The app reads these when it is imported, so they must be set first
+_workdir = tempfile.mkdtemp(prefix='iamn-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_workdir, 'bench.db')}"
+os.environ['URL_BLOOM_PATH'] = os.path.join(_workdir, 'known_urls.bloom')
+sys.path.insert(0, ROOT)
+
+from app import create_app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import Article, FeedState, hash_url  # noqa: E402
+from config import RSS_FEEDS  # noqa: E402
+from services.rss_monitor import RSSMonitor  # noqa: E402
+from services.url_index import KnownUrlIndex  # noqa: E402
+from benchmarks.feed_server import FeedServer  # noqa: E402
+
+# Seeded articles from the corpus itself, so the Bloom filter + IN query path is exercised
+CORPUS_KNOWN_PER_FEED = 10
+
+_ITEM_LINK_RE = re.compile(r'<item>.*?<link>([^<]+)</link>', re.S)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _seed_articles(count: int, extra_urls: list):
+    """Replaces the articles table with `count` synthetic rows plus `extra_urls`."""
+    db.session.query(Article).delete()
+    db.session.query(FeedState).delete()
+    db.session.commit()
+    urls = [f"https://seed.example.com/article-{i}/" for i in range(count)] + list(extra_urls)
+    for start in range(0, len(urls), 10000):
+        db.session.execute(
+            Article.__table__.insert(),
+            [{'source_url': url, 'source_url_hash': hash_url(url), 'status': 'published'} for url in urls[start:start + 10000]]
+        )
+        db.session.commit()
+
+
+def _run_phase(feed_urls: dict, trace_memory: bool) -> tuple[dict, list]:
+    """Runs one discovery pass over every feed and returns its measurements and the new articles."""
+    monitor = RSSMonitor()
+    monitor.start_cycle()
+
+    index = KnownUrlIndex()
+    refresh_start = time.perf_counter()
+    index.refresh()
+    refresh_ms = (time.perf_counter() - refresh_start) * 1000
+
+    # Time spent deciding which entries are new
+    lookup = {'calls': 0, 'urls': 0, 'ms': 0.0}
+    original_unknown = index.unknown
+
+    def timed_unknown(urls):
+        start = time.perf_counter()
+        try:
+            return original_unknown(urls)
+        finally:
+            lookup['calls'] += 1
+            lookup['urls'] += len(urls)
+            lookup['ms'] += (time.perf_counter() - start) * 1000
+    index.unknown = timed_unknown
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    monitor.prefetch_feeds({url: feed_key for feed_key, url in feed_urls.items()})
+    new_articles = []
+    for feed_key, url in feed_urls.items():
+        new_articles.extend(monitor.fetch_new_articles(feed_key, [url], 10_000, index))
+    elapsed = time.perf_counter() - start
+    peak_kb = None
+    if trace_memory:
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    index.save()
+
+    stats = monitor.cycle_stats.values()
+    results = {}
+    for stat in stats:
+        results[stat['result']] = results.get(stat['result'], 0) + 1
+    entries = sum(stat.get('entries', 0) for stat in stats)
+    return {
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'entries_parsed': entries,
+        'entries_per_second': round(entries / elapsed, 1) if elapsed and entries else 0.0,
+        'new_articles': len(new_articles),
+        'parse_ms': round(sum(stat.get('parse_ms', 0.0) for stat in stats), 2),
+        'bytes_downloaded': sum(stat.get('bytes_downloaded', 0) for stat in stats),
+        'feed_results': results,
+        'peak_memory_kb': round(peak_kb, 1) if peak_kb is not None else None,
+        'dedup': {
+            'index_refresh_ms': round(refresh_ms, 2),
+            'lookup_calls': lookup['calls'],
+            'lookup_urls': lookup['urls'],
+            'lookup_ms': round(lookup['ms'], 2),
+        },
+    }, new_articles
+
+
+def run(known_sizes: list, latency: float, trace_memory: bool) -> dict:
+    routes = FeedServer.load_directory(FEEDS_DIR, '.xml')
+    feed_keys = [key for key in RSS_FEEDS if f'/{key}.xml' in routes]
+    if not feed_keys:
+        raise SystemExit(f"No recorded feeds in {FEEDS_DIR}. Run `python -m benchmarks.record_feeds` first.")
+
+    app = create_app()
+    logging.getLogger().setLevel(logging.WARNING)
+    corpus_links = {}
+    for key in feed_keys:
+        # Links are taken from the raw XML so seeding does not depend on the code being measured
+        corpus_links[key] = _ITEM_LINK_RE.findall(routes[f'/{key}.xml'].decode('utf-8', 'replace'))
+
+    report = {
+        'benchmark': 'rss_monitor',
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'latency_s': latency,
+        'tracemalloc': trace_memory,
+        'corpus': {
+            'feeds': len(feed_keys),
+            'entries': sum(len(links) for links in corpus_links.values()),
+            'bytes': sum(len(routes[f'/{key}.xml']) for key in feed_keys),
+        },
+        'runs': [],
+    }
+
+    with FeedServer(routes, latency=latency) as server, app.app_context():
+        feed_urls = {key: f"{server.base_url}/{key}.xml" for key in feed_keys}
+        for size in known_sizes:
+            seeded_from_corpus = [url for links in corpus_links.values() for url in links[:CORPUS_KNOWN_PER_FEED]]
+            _seed_articles(size, seeded_from_corpus)
+            if os.path.exists(os.environ['URL_BLOOM_PATH']):
+                os.remove(os.environ['URL_BLOOM_PATH'])
+
+            phases = {}
+            phases['cold'], new_articles = _run_phase(feed_urls, trace_memory)
+            # Stand-in for the processing step: the discovered articles are now stored
+            for dto in new_articles:
+                db.session.add(Article(source_url=dto.source_url, status='published'))
+            db.session.commit()
+            phases['settled'], _ = _run_phase(feed_urls, trace_memory)
+            phases['warm'], _ = _run_phase(feed_urls, trace_memory)
+
+            report['runs'].append({'known_urls': size + len(seeded_from_corpus), 'phases': phases})
+            print(
+                f"known={size + len(seeded_from_corpus):>7}  "
+                + '  '.join(
+                    f"{name}: {p['elapsed_ms']:8.1f} ms {p['entries_per_second']:8.0f} e/s "
+                    f"parse {p['parse_ms']:6.1f} ms dedup {p['dedup']['index_refresh_ms'] + p['dedup']['lookup_ms']:7.1f} ms"
+                    for name, p in phases.items()
+                )
+            )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--known-sizes', type=int, nargs='+', default=[0, 10_000, 100_000],
+                        help='number of synthetic known articles to seed for each run')
+    parser.add_argument('--latency', type=float, default=0.0, help='artificial delay per HTTP request, in seconds')
+    parser.add_argument('--no-tracemalloc', action='store_true', help='do not measure peak memory')
+    parser.add_argument('--output', help='path of the JSON report (default: benchmarks/results/rss_monitor-<timestamp>.json)')
+    args = parser.parse_args()
+
+    report = run(args.known_sizes, args.latency, not args.no_tracemalloc)
+    output = args.output or os.path.join(RESULTS_DIR, f"rss_monitor-{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+
+if __name__ == '__main__':
+    main()
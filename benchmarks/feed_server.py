@@ -0,0 +1,73 @@
+"""
+Local HTTP stand-in for the source sites, used by the benchmarks.
+Serves files from a directory with ETag/Last-Modified validators, so conditional GETs
+behave like the real Valnet feeds, and can add an artificial per-request latency.
+"""
+import email.utils
+import hashlib
+import http.server
+import os
+import threading
+import time
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    routes = {}
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        body = self.routes.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=UTF-8' if self.path.endswith('.xml') else 'text/html; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', email.utils.formatdate(usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FeedServer:
+    """Serves `routes` (path -> bytes) on 127.0.0.1 in a background thread."""
+
+    def __init__(self, routes: dict, latency: float = 0.0):
+        handler = type('Handler', (_Handler,), {'routes': routes, 'latency': latency})
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @staticmethod
+    def load_directory(directory: str, suffix: str) -> dict:
+        """Maps '/<file name>' to the contents of every file in `directory` ending with `suffix`."""
+        routes = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(suffix):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    routes[f'/{name}'] = f.read()
+        return routes
@@ -0,0 +1,304 @@
+"""
+Golden-corpus benchmark and quality regression suite for ContentExtractor.extract.
+
+The corpus lives in benchmarks/extraction_corpus/: one gzip page per entry of manifest.json
+plus its golden output (<name>.golden.json). Pages are served to the shared HTTP client by an
+in-process adapter, so extract() runs end to end (streaming download included) without network.
+
+    python -m benchmarks.golden_extraction                   # benchmark + compare with golden outputs
+    python -m benchmarks.golden_extraction --update-golden   # accept the current outputs
+    python -m benchmarks.golden_extraction --import-cache    # add pages from the HTML cache (data/html_cache)
+    python -m benchmarks.golden_extraction --synthetic 2     # regenerate the synthetic Valnet pages
+
+Reports p50/p95 ms per page, the peak traced allocation per page and the process peak RSS,
+and compares text, metadata fields, embeds and media with the golden outputs. Exits with status 1
+when any page differs, so it can gate parser changes.
+
+Golden outputs are whatever the extractor produced when they were accepted, so a manifest entry
+can also carry hand-written expectations ("expect") that hold regardless of them: sentences the
+text must or must not contain (the last paragraph catches truncated bodies, card titles catch
+page furniture), media URLs that must or must not be listed, embeds and metadata values. The
+"handwritten" pages reproduce real Valnet layouts that the synthetic generator does not: cards
+and <article> tags before or inside the body, lazy-loaded images and embeds between paragraphs.
+These checks run with --update-golden too.
+"""
+import argparse
+import difflib
+import gzip
+import io
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from urllib.parse import urlparse
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(ROOT, 'benchmarks', 'extraction_corpus')
+MANIFEST_PATH = os.path.join(CORPUS_DIR, 'manifest.json')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+sys.path.insert(0, ROOT)
+
+import config  # noqa: E402
+
+config.HTML_CACHE_CONFIG['enabled'] = False  # Every run must go through the download path
+config.POLITENESS_CONFIG['enabled'] = False  # Pages are served locally; no rate limit to respect
+
+from requests.adapters import BaseAdapter  # noqa: E402
+from requests.models import Response  # noqa: E402
+from requests.structures import CaseInsensitiveDict  # noqa: E402
+
+from services.content_extractor import ContentExtractor  # noqa: E402
+from services.http_client import get_http_client  # noqa: E402
+
+_EMBED_RES = (
+    re.compile(r'<iframe[^>]+src="([^"]+)"', re.I),
+    re.compile(r'https?://(?:www\.)?(?:twitter|x)\.com/\w+/status/\d+', re.I),
+    re.compile(r'https?://(?:www\.)?youtube\.com/(?:embed/|watch\?v=)[\w-]+', re.I),
+)
+
+
+class CorpusAdapter(BaseAdapter):
+    """requests transport adapter that answers GETs from the in-memory corpus."""
+
+    def __init__(self, pages: dict):
+        super().__init__()
+        self.pages = pages
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.url = request.url
+        response.request = request
+        body = self.pages.get(request.url)
+        response.status_code = 200 if body is not None else 404
+        response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=UTF-8'})
+        response.encoding = 'UTF-8'
+        response.raw = io.BytesIO(body or b'')
+        return response
+
+    def close(self):
+        pass
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_manifest() -> list:
+    if not os.path.exists(MANIFEST_PATH):
+        return []
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(entries: list):
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(sorted(entries, key=lambda entry: entry['name']), f, indent=2)
+        f.write('\n')
+
+
+def add_page(entries: list, url: str, html: str, source: str):
+    site = urlparse(url).netloc.replace('www.', '')
+    existing = next((entry for entry in entries if entry['url'] == url), None)
+    name = existing['name'] if existing else f"{site.split('.')[0]}-{sum(e['name'].startswith(site.split('.')[0] + '-') for e in entries) + 1:02d}"
+    with open(os.path.join(CORPUS_DIR, f'{name}.html.gz'), 'wb') as f:
+        # mtime=0 keeps the file byte-identical between recordings of the same page
+        f.write(gzip.compress(html.encode('utf-8'), compresslevel=9, mtime=0))
+    if not existing:
+        entries.append({'name': name, 'url': url, 'source': source})
+
+
+def embeds_of(result: dict) -> list:
+    content = (result or {}).get('content_html') or ''
+    found = []
+    for pattern in _EMBED_RES:
+        for match in pattern.finditer(content):
+            value = match.group(1) if pattern.groups else match.group(0)
+            if value not in found:
+                found.append(value)
+    return found
+
+
+def golden_of(result: dict) -> dict:
+    return {
+        'metadata': (result or {}).get('metadata'),
+        'text': (result or {}).get('content_html'),
+        'embeds': embeds_of(result),
+        'media': (result or {}).get('media'),
+    }
+
+
+def compare(golden: dict, current: dict) -> list:
+    """Returns human-readable differences between a golden output and the current one."""
+    differences = []
+    for field, expected in (golden.get('metadata') or {}).items():
+        actual = (current.get('metadata') or {}).get(field)
+        if actual != expected:
+            differences.append(f"metadata.{field}: {expected!r} -> {actual!r}")
+    if golden.get('text') != current.get('text'):
+        ratio = difflib.SequenceMatcher(None, golden.get('text') or '', current.get('text') or '').quick_ratio()
+        differences.append(f"text differs (similarity {ratio:.3f}, {len(golden.get('text') or '')} -> {len(current.get('text') or '')} chars)")
+    if golden.get('embeds') != current.get('embeds'):
+        differences.append(f"embeds: {golden.get('embeds')} -> {current.get('embeds')}")
+    if 'media' in golden and golden['media'] != current.get('media'):
+        differences.append(f"media: {len(golden['media'] or [])} -> {len(current.get('media') or [])} item(s)")
+    return differences
+
+
+def check_expectations(expect: dict, current: dict) -> list:
+    """Returns the hand-written expectations of a manifest entry that the current output breaks."""
+    failures = []
+    text = current.get('text') or ''
+    media_urls = [item['url'] for item in current.get('media') or []]
+    for sentence in expect.get('text_contains', []):
+        if sentence not in text:
+            failures.append(f"expected text missing: {sentence!r}")
+    for sentence in expect.get('text_excludes', []):
+        if sentence in text:
+            failures.append(f"unexpected text present: {sentence!r}")
+    for url in expect.get('media_includes', []):
+        if url not in media_urls:
+            failures.append(f"expected media missing: {url}")
+    for url in expect.get('media_excludes', []):
+        if url in media_urls:
+            failures.append(f"unexpected media present: {url}")
+    if 'embeds' in expect and expect['embeds'] != current.get('embeds'):
+        failures.append(f"embeds: expected {expect['embeds']}, got {current.get('embeds')}")
+    for field, expected in expect.get('metadata', {}).items():
+        actual = (current.get('metadata') or {}).get(field)
+        if actual != expected:
+            failures.append(f"metadata.{field}: expected {expected!r}, got {actual!r}")
+    return failures
+
+
+def _percentile(values: list, percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+def run(entries: list, repeat: int, update_golden: bool) -> tuple[dict, bool]:
+    pages = {}
+    for entry in entries:
+        with gzip.open(os.path.join(CORPUS_DIR, f"{entry['name']}.html.gz"), 'rb') as f:
+            pages[entry['url']] = f.read()
+
+    session = get_http_client().session
+    adapter = CorpusAdapter(pages)
+    for host in {urlparse(url).netloc for url in pages}:
+        session.mount(f'https://{host}/', adapter)
+        session.mount(f'http://{host}/', adapter)
+
+    extractor = ContentExtractor()
+    results = {entry['url']: extractor.extract(entry['url']) for entry in entries}  # Warm-up + outputs
+
+    timings = []
+    for _ in range(repeat):
+        for entry in entries:
+            start = time.perf_counter()
+            extractor.extract(entry['url'])
+            timings.append((time.perf_counter() - start) * 1000)
+
+    peaks_kb = []
+    for entry in entries:
+        tracemalloc.start()
+        extractor.extract(entry['url'])
+        peaks_kb.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    report = {
+        'benchmark': 'golden_extraction',
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parser': config.EXTRACTION_CONFIG.get('parser'),
+        'pages': len(entries),
+        'runs': repeat,
+        'p50_ms': round(_percentile(timings, 50), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'alloc_peak_kb_p50': round(_percentile(peaks_kb, 50), 1),
+        'alloc_peak_kb_max': round(max(peaks_kb), 1),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) if resource else None,
+        'mismatches': {},
+    }
+
+    failed_expectations = False
+    for entry in entries:
+        golden_path = os.path.join(CORPUS_DIR, f"{entry['name']}.golden.json")
+        current = golden_of(results[entry['url']])
+        differences = check_expectations(entry.get('expect') or {}, current)
+        failed_expectations = failed_expectations or bool(differences)
+        if update_golden or not os.path.exists(golden_path):
+            with open(golden_path, 'w', encoding='utf-8') as f:
+                json.dump(current, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+        else:
+            with open(golden_path, encoding='utf-8') as f:
+                differences += compare(json.load(f), current)
+        if differences:
+            report['mismatches'][entry['name']] = differences
+    report['failed_expectations'] = failed_expectations
+    return report, not report['mismatches']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='timed passes over the corpus')
+    parser.add_argument('--update-golden', action='store_true', help='overwrite the golden outputs with the current ones')
+    parser.add_argument('--import-cache', action='store_true', help='add the pages stored in the HTML cache to the corpus')
+    parser.add_argument('--synthetic', type=int, metavar='N', help='(re)generate N synthetic pages per source site')
+    parser.add_argument('--output', help='path of the JSON report (default: benchmarks/results/golden_extraction-<timestamp>.json)')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+
+    entries = load_manifest()
+    if args.synthetic:
+        from benchmarks.valnet_pages import corpus
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        for url, html in corpus(args.synthetic):
+            add_page(entries, url, html, 'synthetic')
+        save_manifest(entries)
+    if args.import_cache:
+        from services.html_cache import HtmlCache
+        os.makedirs(CORPUS_DIR, exist_ok=True)
+        for page in HtmlCache().iter_pages():
+            add_page(entries, page.url, page.html, f'live {page.fetched_at:%Y-%m-%d}')
+        save_manifest(entries)
+    if not entries:
+        raise SystemExit(f"The corpus in {CORPUS_DIR} is empty. Use --import-cache or --synthetic.")
+
+    report, passed = run(entries, args.repeat, args.update_golden)
+    print(f"{report['pages']} pages: p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, "
+          f"alloc peak p50 {report['alloc_peak_kb_p50']} KB, peak RSS {report['peak_rss_mb']} MB")
+    for name, differences in report['mismatches'].items():
+        print(f"  {name}:")
+        for difference in differences:
+            print(f"    {difference}")
+    print('Golden outputs updated.' if args.update_golden else ('All pages match their golden outputs.' if passed else 'REGRESSION: outputs differ from golden.'))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"golden_extraction-{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+    sys.exit(0 if passed or (args.update_golden and not report['failed_expectations']) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Records the feed corpus used by bench_rss_monitor.py into benchmarks/feeds/<feed_key>.xml.
+
+    python -m benchmarks.record_feeds              # capture the live RSS_FEEDS
+    python -m benchmarks.record_feeds --synthetic  # deterministic offline corpus
+
+The synthetic corpus reproduces the structure of the Valnet feeds (RSS 2.0 with dc:creator,
+enclosure, categories and CDATA descriptions, newest first) so the benchmark can run without
+network access. Re-record from the live feeds whenever their format changes.
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from urllib.parse import urlparse
+
+FEEDS_DIR = os.path.join(os.path.dirname(__file__), 'feeds')
+
+_WORDS = (
+    'marvel dc star wars batman superman spider-man avengers season finale trailer release date '
+    'cast director sequel reboot box office streaming netflix disney hbo prime video episode '
+    'showrunner reveals confirms update theory ending explained villain hero franchise studio '
+    'nintendo playstation xbox switch patch dlc remake boss quest open-world multiplayer'
+).split()
+
+
+def record_live():
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config import RSS_FEEDS
+    from services.http_client import get_http_client
+
+    os.makedirs(FEEDS_DIR, exist_ok=True)
+    for feed_key, feed_config in RSS_FEEDS.items():
+        response = get_http_client().get(feed_config['urls'][0], timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(FEEDS_DIR, f'{feed_key}.xml'), 'wb') as f:
+            f.write(response.content)
+        print(f"{feed_key}: {len(response.content)} bytes")
+
+
+def synthetic_feed(feed_key: str, feed_url: str, items: int, seed: int) -> str:
+    rng = random.Random(seed)
+    host = urlparse(feed_url).netloc
+    now = datetime(2025, 1, 15, 18, 0, tzinfo=timezone.utc)
+    entries = []
+    published = now
+    for i in range(items):
+        published -= timedelta(minutes=rng.randint(4, 45))
+        title = ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(7, 12))).title()
+        slug = '-'.join(title.lower().split())[:80].strip('-')
+        link = f"https://{host}/{slug}-{seed}-{i}/"
+        description = ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(35, 60))).capitalize() + '.'
+        image = f"https://static{rng.randint(0, 3)}.{host.split('.')[-2]}images.com/wordpress/wp-content/uploads/2025/01/{slug[:40]}.jpg"
+        entries.append(
+            f"<item><title><![CDATA[{title}]]></title><link>{link}</link>"
+            f"<dc:creator><![CDATA[{rng.choice(['Ana Costa', 'John Smith', 'Maria Lee', 'Sam Park'])}]]></dc:creator>"
+            f"<enclosure url=\"{image}\" length=\"0\" type=\"image/jpeg\"/>"
+            f"<category><![CDATA[{feed_key.split('_')[-1].title()} News]]></category>"
+            f"<description><![CDATA[{description}]]></description>"
+            f"<pubDate>{format_datetime(published, usegmt=True)}</pubDate>"
+            f"<guid isPermaLink=\"true\">{link}</guid></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f'<channel><title>{host} | {feed_key}</title><link>https://{host}/</link>'
+        f'<atom:link href="{feed_url}" rel="self" type="application/rss+xml"/>'
+        f'<description>Latest news</description><language>en-US</language>'
+        f'<lastBuildDate>{format_datetime(now, usegmt=True)}</lastBuildDate>\n'
+        + '\n'.join(entries) +
+        '\n</channel></rss>\n'
+    )
+
+
+def record_synthetic(items: int):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config import RSS_FEEDS
+
+    os.makedirs(FEEDS_DIR, exist_ok=True)
+    for seed, (feed_key, feed_config) in enumerate(RSS_FEEDS.items()):
+        xml = synthetic_feed(feed_key, feed_config['urls'][0], items, seed)
+        with open(os.path.join(FEEDS_DIR, f'{feed_key}.xml'), 'w', encoding='utf-8') as f:
+            f.write(xml)
+        print(f"{feed_key}: {len(xml.encode('utf-8'))} bytes (synthetic)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--synthetic', action='store_true', help='generate an offline corpus instead of recording')
+    parser.add_argument('--items', type=int, default=50, help='items per synthetic feed')
+    args = parser.parse_args()
+    if args.synthetic:
+        record_synthetic(args.items)
+    else:
+        record_live()
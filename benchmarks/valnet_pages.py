@@ -0,0 +1,129 @@
+"""
+Deterministic article pages shaped like the Valnet templates (Screen Rant, CBR, Collider, ...),
+for extraction benchmarks that must run without network access.
+
+Each page has what makes the real ones expensive to parse: a head with dozens of meta tags
+and JSON-LD, large inline scripts, a long navigation menu, the article itself with images,
+a YouTube embed and an embedded tweet, related-article and newsletter widgets, and a footer.
+"""
+import json
+import random
+
+_WORDS = (
+    'the a of to and in that is for it with as was on his they be at one have this from by '
+    'movie series season episode trailer director cast studio franchise sequel release fans '
+    'character story villain hero marvel star wars dc netflix disney streaming box office game '
+    'update confirmed reveals first look ending finale premiere showrunner production filming'
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _paragraph(rng: random.Random) -> str:
+    return ' '.join(_sentence(rng, rng.randint(10, 24)) for _ in range(rng.randint(3, 6)))
+
+
+def article_page(site: str, index: int, seed: int = 0) -> tuple[str, str]:
+    """Returns (url, html) of a synthetic article page on `site` (e.g. 'screenrant.com')."""
+    rng = random.Random(f'{site}-{index}-{seed}')
+    title = _sentence(rng, rng.randint(8, 13)).rstrip('.').title()
+    slug = '-'.join(title.lower().split())[:90]
+    url = f"https://{site}/{slug}/"
+    image_host = f"https://static{rng.randint(0, 3)}.{site.replace('www.', '').split('.')[0]}images.com"
+    image = f"{image_host}/wordpress/wp-content/uploads/2025/01/{slug[:40]}.jpg"
+    published = f"2025-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z"
+    author = rng.choice(['Ana Costa', 'John Smith', 'Maria Lee', 'Sam Park'])
+
+    json_ld = json.dumps({
+        '@context': 'https://schema.org',
+        '@type': 'NewsArticle',
+        'headline': title,
+        'datePublished': published,
+        'dateModified': published,
+        'author': [{'@type': 'Person', 'name': author}],
+        'image': {'@type': 'ImageObject', 'url': image, 'width': 1400, 'height': 700},
+        'publisher': {'@type': 'Organization', 'name': site},
+        'mainEntityOfPage': url,
+    })
+    inline_script = 'window.__APP_STATE__ = ' + json.dumps({
+        'widgets': [{'id': i, 'html': _paragraph(rng), 'targeting': [rng.choice(_WORDS) for _ in range(20)]} for i in range(60)]
+    }) + ';'
+
+    head = [
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">',
+        f'<title>{title}</title>',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        f'<meta name="description" content="{_sentence(rng, 25)}">',
+        f'<meta name="author" content="{author}">',
+        f'<link rel="canonical" href="{url}">',
+        f'<meta property="og:title" content="{title}">',
+        f'<meta property="og:description" content="{_sentence(rng, 25)}">',
+        f'<meta property="og:image" content="{image}">',
+        f'<meta property="og:url" content="{url}">',
+        '<meta property="og:type" content="article">',
+        f'<meta property="article:published_time" content="{published}">',
+        f'<meta property="article:modified_time" content="{published}">',
+        f'<meta name="twitter:image" content="{image}">',
+        '<meta name="twitter:card" content="summary_large_image">',
+    ]
+    head += [f'<link rel="preload" as="font" href="/public/fonts/font-{i}.woff2" crossorigin>' for i in range(8)]
+    head += [f'<meta name="x-adtag-{i}" content="{rng.choice(_WORDS)}">' for i in range(25)]
+    head += [
+        f'<script type="application/ld+json">{json_ld}</script>',
+        f'<script>{inline_script}</script>',
+        '<style>' + ''.join(f'.c{i}{{margin:{i}px;padding:{i % 7}px}}' for i in range(800)) + '</style>',
+        '</head>',
+    ]
+
+    nav = '<header><nav class="main-menu"><ul>' + ''.join(
+        f'<li><a href="/{rng.choice(_WORDS)}-{i}/">{rng.choice(_WORDS).title()}</a></li>' for i in range(150)
+    ) + '</ul></nav></header>'
+
+    body_parts = [f'<h1 class="article-header-title">{title}</h1>',
+                  f'<div class="article-byline"><a class="author" href="/author/{author.lower().replace(" ", "-")}/">{author}</a>'
+                  f'<time datetime="{published}">{published[:10]}</time></div>',
+                  f'<figure><img src="{image}" alt="{title}" width="1400" height="700"></figure>']
+    for section in range(rng.randint(3, 5)):
+        body_parts.append(f'<h2>{_sentence(rng, 6).rstrip(".").title()}</h2>')
+        for _ in range(rng.randint(3, 5)):
+            body_parts.append(f'<p>{_paragraph(rng)}</p>')
+        if section == 0:
+            body_parts.append('<div class="w-youtube"><iframe src="https://www.youtube.com/embed/'
+                              f'{rng.getrandbits(40):x}?feature=oembed" width="560" height="315" allowfullscreen></iframe></div>')
+        if section == 1:
+            body_parts.append('<blockquote class="twitter-tweet"><p>' + _sentence(rng, 15) +
+                              f'</p><a href="https://twitter.com/{rng.choice(_WORDS)}/status/{rng.getrandbits(60)}">January 2025</a></blockquote>')
+            body_parts.append(f'<figure><img src="/wordpress/wp-content/uploads/2025/01/inline-{index}.jpg" alt=""></figure>')
+        body_parts.append('<div class="related-single"><span>Related</span><a href="/related-'
+                          f'{section}/">{_sentence(rng, 9)}</a></div>')
+    body_parts.append('<div class="newsletter-widget"><h3>Sign up for our newsletter</h3>'
+                      '<form><input type="email" placeholder="Email"><button>Subscribe</button></form></div>')
+
+    related = '<section class="related-articles">' + ''.join(
+        f'<article class="display-card"><a href="/{rng.choice(_WORDS)}-related-{i}/"><img src="{image_host}/thumb-{i}.jpg">'
+        f'<h5>{_sentence(rng, 10)}</h5></a></article>' for i in range(24)
+    ) + '</section>'
+    footer = '<footer><ul>' + ''.join(
+        f'<li><a href="/{rng.choice(_WORDS)}-footer-{i}/">{rng.choice(_WORDS).title()}</a></li>' for i in range(120)
+    ) + '</ul><p>Copyright 2025 Valnet Inc.</p></footer>'
+    trailing_scripts = ''.join(f'<script src="/public/build/chunk-{i}.js" async></script>' for i in range(20))
+
+    page = (
+        ''.join(head)
+        + '<body>' + nav
+        + '<main><article class="article"><div class="article-body" id="article-body">'
+        + ''.join(body_parts)
+        + '</div></article>' + related + '</main>'
+        + footer + trailing_scripts + '</body></html>'
+    )
+    return url, page
+
+
+SITES = ('screenrant.com', 'movieweb.com', 'collider.com', 'www.cbr.com', 'gamerant.com', 'www.thegamer.com')
+
+
+def corpus(pages_per_site: int, seed: int = 0) -> list[tuple[str, str]]:
+    """Returns (url, html) for `pages_per_site` pages of every source site."""
+    return [article_page(site, i, seed) for site in SITES for i in range(pages_per_site)]
@@ -0,0 +1,218 @@
+"""
+Local WebSub hub for testing the subscription flow end to end without a public hub.
+
+LocalHub serves a feed that advertises it (<atom:link rel="hub">), accepts subscription
+requests, verifies the intent on the subscriber's callback and distributes signed content.
+Run as a script, it starts the app on a local port with a temporary SQLite database and goes
+through subscribe -> verify -> signed push, plus the edge cases of WebSubSubscriber:
+
+    python -m benchmarks.websub_local_hub
+
+Exits with status 1 when any step does not behave as expected.
+"""
+import hashlib
+import hmac
+import http.server
+import logging
+import os
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlencode
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+<channel>
+<title>Local feed</title>
+<atom:link rel="hub" href="{hub}"/>
+<atom:link rel="self" href="{topic}"/>
+{items}
+</channel>
+</rss>"""
+
+ITEM_TEMPLATE = """<item><title>{title}</title><link>{link}</link>
+<pubDate>Fri, 17 Oct 2026 12:00:00 GMT</pubDate></item>"""
+
+
+class _HubHandler(http.server.BaseHTTPRequestHandler):
+    hub = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path != '/feed.xml':
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = self.hub.feed_body()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()).items()}
+        if self.path != '/hub' or form.get('hub.mode') not in ('subscribe', 'unsubscribe') or not form.get('hub.callback'):
+            self.send_response(400)
+            self.end_headers()
+            return
+        self.send_response(202)
+        self.end_headers()
+        # Intent verification happens after the request is accepted, as on a real hub
+        threading.Thread(target=self.hub.verify, args=(form,), daemon=True).start()
+
+
+class LocalHub:
+    """A WebSub hub and the feed it serves, on 127.0.0.1 in a background thread."""
+
+    def __init__(self, lease_seconds: str = '3600'):
+        self.lease_seconds = lease_seconds  # Sent in the verification; a string to test malformed values
+        self.subscriptions = {}  # callback -> {'topic', 'secret', 'verified'}
+        self.verifications = []  # (callback, mode, status code)
+        self.items = []
+        handler = type('Handler', (_HubHandler,), {'hub': self})
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    @property
+    def topic_url(self) -> str:
+        return f"{self.base_url}/feed.xml"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def feed_body(self) -> bytes:
+        items = ''.join(ITEM_TEMPLATE.format(title=title, link=link) for title, link in self.items)
+        return FEED_TEMPLATE.format(hub=f"{self.base_url}/hub", topic=self.topic_url, items=items).encode('utf-8')
+
+    def verify(self, form: dict):
+        """Verification of intent: GET on the callback, which must echo the challenge."""
+        challenge = secrets.token_hex(8)
+        params = {'hub.mode': form['hub.mode'], 'hub.topic': form.get('hub.topic'), 'hub.challenge': challenge,
+                  'hub.lease_seconds': self.lease_seconds}
+        separator = '&' if '?' in form['hub.callback'] else '?'
+        response = requests.get(form['hub.callback'] + separator + urlencode(params), timeout=10)
+        self.verifications.append((form['hub.callback'], form['hub.mode'], response.status_code))
+        if response.status_code == 200 and response.text == challenge and form['hub.mode'] == 'subscribe':
+            self.subscriptions[form['hub.callback']] = {'topic': form.get('hub.topic'), 'secret': form.get('hub.secret'), 'verified': True}
+
+    def publish(self, title: str, link: str, secret: str = None) -> list:
+        """Adds an item and pushes the feed to every verified subscriber. Returns the status codes."""
+        self.items.insert(0, (title, link))
+        body = self.feed_body()
+        statuses = []
+        for callback, subscription in self.subscriptions.items():
+            key = (secret or subscription['secret'] or '').encode('utf-8')
+            signature = 'sha256=' + hmac.new(key, body, hashlib.sha256).hexdigest()
+            response = requests.post(callback, data=body, timeout=10, headers={
+                'Content-Type': 'application/rss+xml', 'X-Hub-Signature-256': signature,
+            })
+            statuses.append(response.status_code)
+        return statuses
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+    workdir = tempfile.mkdtemp(prefix='websub-hub-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'app.db')}"
+
+    from werkzeug.serving import make_server
+
+    import config
+    config.POLITENESS_CONFIG['enabled'] = False  # Everything is local
+
+    failures = []
+
+    def check(name: str, ok: bool, detail: str = ''):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail and not ok else ''}")
+        if not ok:
+            failures.append(name)
+
+    with LocalHub() as hub:
+        from app import create_app
+        from extensions import db
+        from models import WebSubSubscription
+        from services.websub import WebSubSubscriber
+
+        app = create_app()
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        config.WEBSUB_CONFIG.update(enabled=True, callback_base_url=f"http://127.0.0.1:{server.server_port}")
+        config.RSS_FEEDS.clear()
+        config.RSS_FEEDS['local_feed'] = {'urls': [hub.topic_url], 'category': 'movies'}
+
+        def subscription() -> WebSubSubscription:
+            db.session.expire_all()
+            return WebSubSubscription.query.filter_by(topic_url=hub.topic_url).first()
+
+        with app.app_context():
+            subscriber = WebSubSubscriber()
+
+            # 1. Discovery + subscription request + verification of intent
+            subscriber.subscribe_all()
+            check('hub discovered from <atom:link rel="hub">', subscription() is not None and subscription().hub_url == f"{hub.base_url}/hub")
+            # The hub records the subscription once the callback has answered
+            check('intent verified', _wait_for(lambda: hub.subscriptions and subscription().state == 'verified'), f"state={subscription().state}")
+            first_secret = subscription().secret
+            check('hub got the subscriber secret', hub.subscriptions and next(iter(hub.subscriptions.values()))['secret'] == first_secret)
+
+            # 2. Signed push
+            statuses = hub.publish('First story', 'https://example.com/first-story/')
+            check('signed push accepted', statuses == [202] and subscription().push_count == 1, f"{statuses}, push_count={subscription().push_count}")
+
+            # 3. Push signed with the wrong secret is ignored
+            hub.publish('Forged story', 'https://example.com/forged/', secret='not-the-secret')
+            check('push with a bad signature ignored', subscription().push_count == 1, f"push_count={subscription().push_count}")
+
+            # 4. Renewal: pushes signed with the current secret keep working until the hub re-verifies
+            hub.lease_seconds = 'not-a-number'  # The renewal's verification is malformed and refused
+            subscriber.subscribe('local_feed', hub.topic_url)
+            check('malformed hub.lease_seconds refused with 400', _wait_for(lambda: hub.verifications[-1][2] == 400 if len(hub.verifications) > 1 else False),
+                  f"{hub.verifications}")
+            current = subscription()
+            check('renewal keeps state and secret until verified', current.state == 'verified' and current.secret == first_secret and current.pending_secret)
+            hub.publish('Second story', 'https://example.com/second-story/')
+            check('push during the renewal accepted', subscription().push_count == 2, f"push_count={subscription().push_count}")
+
+            hub.lease_seconds = '3600'
+            subscriber.subscribe('local_feed', hub.topic_url)
+            check('renewal verified', _wait_for(lambda: subscription().secret != first_secret and not subscription().pending_secret
+                                                and next(iter(hub.subscriptions.values()))['secret'] == subscription().secret))
+            hub.publish('Third story', 'https://example.com/third-story/')
+            check('push signed with the renewed secret accepted', subscription().push_count == 3, f"push_count={subscription().push_count}")
+
+        server.shutdown()
+
+    print(f"\n{len(failures)} failure(s)." if failures else "\nWebSub flow OK.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
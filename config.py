@@ -15,6 +15,9 @@ PIPELINE_ORDER = [
 ]
 
 # Configuração dos Feeds RSS, organizados por fontes
+# Cada feed pode definir 'rate_limit' com qualquer chave de POLITENESS_CONFIG['default_limits']
+# (ex.: {'requests_per_second': 0.5, 'max_concurrency': 1}). O limite vale para o host inteiro;
+# se vários feeds do mesmo host definirem limites, o mais restritivo é usado.
 RSS_FEEDS = {
     'screenrant_movies': {
         'urls': ['https://screenrant.com/feed/movie-news/'],
@@ -84,6 +87,51 @@ AI_CONFIG = {
     ],
 }
 
+# Limites de uso de cada chave da API Gemini (padrão: nível gratuito do gemini-1.5-flash)
+AI_RATE_LIMIT_CONFIG = {
+    'default_limits': {
+        'requests_per_minute': int(os.getenv('GEMINI_RPM', '15')),
+        'tokens_per_minute': int(os.getenv('GEMINI_TPM', '1000000')),
+        'request_burst': 1,  # Requisições que uma chave ociosa pode enviar de uma vez
+        'requests_per_day': int(os.getenv('GEMINI_RPD', '1500')),
+    },
+    'key_overrides': {},  # Últimos 4 caracteres da chave -> limites próprios (ex.: chaves pagas)
+    'expected_output_tokens': 2000,  # Reservados por requisição além do prompt; corrigidos pelo uso real
+    'default_cooldown_seconds': 60,  # Pausa da chave após um 429 sem retry_delay
+    'max_wait_seconds': 180,  # Espera máxima por uma chave com capacidade antes de desistir do artigo
+    'quota_timezone': 'America/Los_Angeles',  # A cota diária do Gemini zera à meia-noite do Pacífico
+    # Uso diário de cada chave (requisições e tokens do dia do Pacífico), salvo para sobreviver a reinícios
+    'usage_path': os.getenv('AI_KEY_USAGE_PATH', os.path.join('data', 'ai_key_usage.json')),
+    'circuit_failure_threshold': 3,  # Erros seguidos (exceto 429) até tirar a chave de rotação
+    'circuit_cooldown_seconds': 300,  # Dobra a cada nova abertura seguida, até 8x
+    'latency_ewma_alpha': 0.3,
+}
+
+# Envio concorrente de prompts (opcional): até N prompts por categoria ao mesmo tempo, limitados ao número
+# de chaves da categoria. O padrão 1 processa os artigos um a um, como antes; ative com AI_MAX_CONCURRENT_PROMPTS.
+AI_DISPATCH_CONFIG = {
+    'max_concurrent_prompts': int(os.getenv('AI_MAX_CONCURRENT_PROMPTS', '1')),
+}
+
+# Modo de chaves compartilhadas (opcional): quando as chaves da própria categoria estão sem capacidade,
+# a categoria pega emprestada uma chave ociosa de outra. As primeiras 'reserved_keys' chaves de cada
+# categoria nunca são emprestadas, e uma categoria com prompts pendentes (na fila, em andamento ou esperando
+# por chave) não empresta nenhuma.
+AI_POOL_CONFIG = {
+    'enabled': os.getenv('AI_POOLED_KEYS', '0') == '1',
+    'reserved_keys': int(os.getenv('AI_RESERVED_KEYS', '2')),  # Por categoria, na ordem de AI_CONFIG
+    'max_borrowed_in_flight': int(os.getenv('AI_MAX_BORROWED_IN_FLIGHT', '2')),  # Prompts simultâneos em chaves emprestadas, por categoria
+    'recheck_seconds': 5,  # Espera máxima antes de procurar de novo uma chave para emprestar
+}
+
+# Cache persistente das respostas da IA (chave: modelo + configuração de geração + prompt)
+AI_CACHE_CONFIG = {
+    'enabled': os.getenv('AI_CACHE_ENABLED', '1') == '1',
+    'path': os.getenv('AI_CACHE_DIR', os.path.join('data', 'ai_cache')),
+    'ttl_hours': 168,  # Respostas mais antigas são geradas de novo
+    'max_size_mb': 200,  # Ao passar do limite, as respostas usadas há mais tempo são removidas (LRU)
+}
+
 # WordPress Configuration
 WORDPRESS_CONFIG = {
     'url': os.getenv('WORDPRESS_URL'),
@@ -103,10 +151,155 @@ WORDPRESS_CATEGORIES = {
 SCHEDULE_CONFIG = {
     'check_interval': 15,  # minutes
     'max_articles_per_feed': 3,  # Limite de artigos por fonte em cada ciclo
-    'api_call_delay': 20, # Aumentado para 20 segundos para respeitar os limites da API gratuita (15 req/min) e evitar pausas longas.
     'cleanup_after_hours': 12
 }
 
+# API de controle (/api/execute-now, /api/pause-automation, /api/resume-automation)
+API_CONFIG = {
+    # Token exigido no cabeçalho 'Authorization: Bearer <token>'. Sem token as rotas de controle ficam
+    # desativadas (403); as rotas de status continuam abertas.
+    'control_token': os.getenv('API_CONTROL_TOKEN'),
+}
+
+# Cliente HTTP compartilhado (pools de conexão por host com keep-alive e retries)
+HTTP_CLIENT_CONFIG = {
+    'default_timeout': 15,  # seconds
+    'pool_connections': 16,  # Número de hosts com pool próprio
+    'pool_maxsize': 8,  # Conexões mantidas por host
+    'max_retries': 2,  # Apenas para GET/HEAD/OPTIONS
+    'backoff_factor': 0.5,
+    'backoff_jitter': 0.5,  # seconds
+    'latency_samples': 200,
+}
+
+# Limites por host para os sites de origem (hosts das URLs em RSS_FEEDS: feeds e páginas de artigos)
+POLITENESS_CONFIG = {
+    'enabled': True,
+    'default_limits': {
+        'requests_per_second': 1.0,  # Taxa de reposição do token bucket
+        'burst': 3,  # Requisições que podem sair de uma vez após um período ocioso
+        'max_concurrency': 4,  # Requisições simultâneas no máximo; a concorrência efetiva começa em initial_concurrency
+    },
+    'initial_concurrency': 2,
+    'throttle_statuses': [403, 429, 503],  # Respostas que indicam bloqueio ou limite do CDN/WAF
+    'default_cooldown_seconds': 60,  # Pausa do host após um bloqueio sem Retry-After
+    'max_cooldown_seconds': 900,
+    'max_wait_seconds': 30,  # Acima disso a requisição falha na hora (HostCooldownError) em vez de esperar
+    'error_rate_threshold': 0.2,  # Média móvel de erros acima da qual a concorrência é reduzida
+    'increase_after': 20,  # Sucessos seguidos para aumentar a concorrência e a taxa
+}
+
+# RSS Monitor Configuration
+RSS_MONITOR_CONFIG = {
+    'request_timeout': 15,  # seconds
+    'conditional_get': True,  # Envia If-None-Match/If-Modified-Since e pula o parsing em 304 ou corpo inalterado
+    'max_concurrent_fetches': 9,  # Feeds baixados em paralelo na fase de descoberta
+    'per_host_limit': 2,  # Conexões simultâneas por host (vários feeds compartilham o mesmo domínio)
+    'circuit_failure_threshold': 3,  # Falhas seguidas até abrir o circuito de uma URL
+    'circuit_base_backoff': 5,  # minutes, dobra a cada nova falha
+    'circuit_max_backoff': 240,  # minutes
+    'latency_samples': 50,  # Tempos de resposta guardados por URL para os percentis
+}
+
+# Known URL index (Bloom filter persisted on disk + indexed source_url_hash lookups)
+URL_INDEX_CONFIG = {
+    'bloom_path': os.getenv('URL_BLOOM_PATH', os.path.join('data', 'known_urls.bloom')),
+    'capacity': 1_000_000,  # O filtro é reconstruído com o dobro da capacidade quando ela é excedida
+    'error_rate': 0.001,
+    'batch_size': 10000,
+}
+
+# Adaptive polling: cada feed é consultado conforme o ritmo de publicação observado.
+# Com o modo ativado, o job principal roda a cada 'tick_minutes' e só consulta os feeds vencidos.
+ADAPTIVE_POLLING_CONFIG = {
+    'enabled': os.getenv('ADAPTIVE_POLLING', '0') == '1',
+    'tick_minutes': 5,
+    'min_interval': 5,  # minutes
+    'max_interval': 60,  # minutes
+    'polls_per_arrival': 2,  # Consultas por intervalo médio entre novos artigos
+    'ewma_alpha': 0.3,  # Peso do intervalo mais recente na média móvel
+    # Multiplicadores aplicados ao intervalo por faixa de horário (timezone do scheduler, fim exclusivo)
+    'hour_boosts': [
+        {'start': 9, 'end': 13, 'factor': 0.75},
+        {'start': 17, 'end': 22, 'factor': 0.75},
+        {'start': 1, 'end': 7, 'factor': 1.5},
+    ],
+}
+
+# Detecção de notícias quase duplicadas entre fontes, antes de gastar chamadas de IA
+DEDUP_CONFIG = {
+    'enabled': True,
+    'window_hours': 12,  # Só compara com histórias processadas nesta janela
+    'max_hamming_distance': 3,  # Distância máxima entre os SimHash (64 bits) do texto extraído
+    'min_text_words': 50,  # Textos mais curtos não recebem SimHash
+    # Títulos parecidos sozinhos não bastam ("Season 2 Trailer" x "Season 3 Trailer"): o SimHash dos
+    # textos também precisa concordar, com uma distância mais folgada que a de textos quase idênticos
+    'title_similarity': 0.8,  # Similaridade de Jaccard mínima entre títulos normalizados
+    'title_max_hamming_distance': 12,  # Distância máxima entre os SimHash quando os títulos coincidem
+    'min_title_words': 4,  # Títulos normalizados mais curtos que isso não são comparados
+}
+
+# WebSub: os hubs dos feeds enviam novas entradas por push; o polling vira uma rede de segurança mais lenta.
+WEBSUB_CONFIG = {
+    'enabled': os.getenv('WEBSUB_ENABLED', '0') == '1',
+    'callback_base_url': os.getenv('WEBSUB_CALLBACK_URL'),  # URL pública da aplicação, ex.: https://app.exemplo.com
+    'hub_url': os.getenv('WEBSUB_HUB_URL'),  # Força um hub (ex.: um hub local de testes) em vez do anunciado pelo feed
+    'lease_seconds': 5 * 24 * 3600,
+    'renew_before_hours': 12,
+    'safety_net_interval': 60,  # minutes, intervalo do polling enquanto houver assinaturas ativas
+}
+
+# Novas tentativas de artigos que falharam no meio do pipeline (extração, IA, JSON ou banco)
+RETRY_CONFIG = {
+    'base_delay_minutes': 30,  # Espera após a primeira falha; dobra a cada nova falha
+    'max_delay_minutes': 12 * 60,
+    'max_retries': 4,  # Depois disso o artigo é salvo com status 'failed' e não é mais tentado
+    'max_per_cycle': 3,  # Novas tentativas processadas por ciclo, além dos artigos novos
+}
+
+# Extração de conteúdo das páginas dos artigos
+EXTRACTION_CONFIG = {
+    # 'lxml': a página é parseada uma única vez e a árvore é compartilhada entre metadados,
+    # trafilatura e sanitização. 'legacy': caminho antigo com BeautifulSoup (html.parser).
+    'parser': os.getenv('EXTRACTION_PARSER', 'lxml'),
+    # Download em streaming: o corpo é lido em blocos e decodificado aos poucos
+    'max_download_bytes': 4 * 1024 * 1024,  # O restante de páginas maiores é descartado
+    'chunk_size': 16 * 1024,
+    # Opcional: para de ler quando o <head> já chegou e um destes marcadores aparece depois dele.
+    # Desativado por padrão: as páginas da Valnet têm <article class="display-card"> antes do
+    # artigo principal, então '</article>' cortaria o corpo. Páginas cortadas não vão para o cache.
+    'body_end_markers': [],
+}
+
+# Cache local do HTML bruto das páginas dos artigos (reaproveitado em novas tentativas e benchmarks)
+HTML_CACHE_CONFIG = {
+    'enabled': os.getenv('HTML_CACHE_ENABLED', '1') == '1',
+    'path': os.getenv('HTML_CACHE_DIR', os.path.join('data', 'html_cache')),
+    'ttl_hours': 72,  # Páginas mais antigas são baixadas de novo
+    'max_size_mb': 500,  # Ao passar do limite, as páginas usadas há mais tempo são removidas (LRU)
+}
+
+# Extração em processos separados: usa todos os núcleos e isola páginas patológicas
+EXTRACTION_POOL_CONFIG = {
+    'workers': int(os.getenv('EXTRACTION_WORKERS', '0')),  # 0 = extração no próprio thread do scheduler
+    'timeout_seconds': 30,  # Tempo máximo por página; o processo é encerrado e substituído
+    'max_rss_mb': 512,  # Pico de memória a partir do qual o processo é reciclado após a página
+    'max_tasks_per_worker': 200,  # Recicla o processo depois de tantas páginas
+}
+
+# Redução do conteúdo antes de montar o prompt (opcional): remove blocos de template da Valnet e limita os tokens
+PROMPT_REDUCTION_CONFIG = {
+    'enabled': os.getenv('PROMPT_REDUCTION_ENABLED', '0') == '1',
+    # Orçamento de tokens do texto visível do campo {content} por categoria (~4 caracteres por token, sem as tags HTML)
+    'token_budget': {
+        'movies': 2500,
+        'series': 2500,
+        'games': 2000,
+    },
+    'default_token_budget': 2500,
+    'keep_leading_blocks': 2,  # Os primeiros parágrafos (lide) nunca são cortados
+}
+
 # Pipeline Configuration
 PIPELINE_CONFIG = {
     'images_mode': os.getenv('IMAGES_MODE', 'hotlink'),  # 'hotlink' or 'download_upload'
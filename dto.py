@@ -1,13 +1,15 @@
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import List, Optional
 
 @dataclass
 class ExtractedArticleDTO:
     """
     Data Transfer Object para um artigo recém-encontrado no feed RSS.
-    Nesta fase inicial, carrega apenas a URL de origem.
+    Nesta fase inicial, carrega apenas a URL de origem e a data de publicação informada no feed.
     """
     source_url: str
+    published_at: Optional[datetime] = None
 
 @dataclass
 class FeaturedImageDTO:
@@ -28,4 +30,14 @@ class PublishedArticleDTO:
     tags: List[str]
     category: str
     schema_json_ld: str
-    attribution: str
\ No newline at end of file
+    attribution: str
+
+
+@dataclass
+class CachedPageDTO:
+    """DTO para uma página de artigo lida do cache local de HTML."""
+    url: str
+    final_url: str
+    html: str
+    content_hash: str
+    fetched_at: datetime
@@ -1,12 +1,23 @@
+import hashlib
 from datetime import datetime
 from extensions import db
 
+def hash_url(url: str) -> str:
+    """Returns the fixed-width sha256 hex digest of a URL, used for indexed URL lookups."""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+def _default_source_url_hash(context):
+    return hash_url(context.get_current_parameters()['source_url'])
+
 class Article(db.Model):
     __tablename__ = 'articles'
+    # Ids are never reused after the newest rows are deleted (KnownUrlIndex tracks new rows by id)
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
     
     # Core identifier and status
     source_url = db.Column(db.String(1024), nullable=False, unique=True, index=True)
+    source_url_hash = db.Column(db.String(64), unique=True, index=True, default=_default_source_url_hash)
     status = db.Column(db.String(50), nullable=False, default='pending', index=True) # e.g., pending, extracting, processing, published, failed
     
     # Data from source
@@ -62,5 +73,112 @@ class ExtractedMedia(db.Model):
     article_id = db.Column(db.Integer, db.ForeignKey('articles.id'), nullable=False)
     media_type = db.Column(db.String(50)) # 'image', 'youtube', 'twitter', etc.
     url = db.Column(db.String(1024), nullable=False)
+    url_hash = db.Column(db.String(64), index=True)  # MediaAsset.url_hash, shared by every article using the media
     status = db.Column(db.String(50), default='pending') # pending, downloaded, uploaded
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class MediaAsset(db.Model):
+    """A media URL seen in any article, stored once so it is processed (e.g. uploaded) only once."""
+    __tablename__ = 'media_assets'
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(1024), nullable=False)
+    url_hash = db.Column(db.String(64), nullable=False, unique=True, index=True)
+    media_type = db.Column(db.String(50))  # image, youtube, twitter
+    status = db.Column(db.String(50), default='pending')  # pending, uploaded, failed
+    wordpress_media_id = db.Column(db.Integer)
+    hosted_url = db.Column(db.String(1024))
+    article_count = db.Column(db.Integer, default=0)  # Articles in which the media appeared
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class FeedState(db.Model):
+    """Per-feed-URL HTTP validators and cache hit counters used for conditional GETs."""
+    __tablename__ = 'feed_states'
+    id = db.Column(db.Integer, primary_key=True)
+    feed_url = db.Column(db.String(1024), nullable=False, unique=True, index=True)
+    feed_key = db.Column(db.String(100), index=True)
+
+    # Validators from the last fully consumed response
+    etag = db.Column(db.String(255))
+    last_modified = db.Column(db.String(100))
+    body_hash = db.Column(db.String(64))  # sha256 hex of the raw feed body
+    last_body_size = db.Column(db.Integer)  # in bytes
+    last_parse_ms = db.Column(db.Float)
+
+    # High-water mark: newest entry of the last fully consumed response
+    hwm_guid = db.Column(db.String(1024))
+    hwm_published = db.Column(db.DateTime)
+
+    # Hit-rate counters
+    fetch_count = db.Column(db.Integer, default=0)
+    not_modified_count = db.Column(db.Integer, default=0)  # HTTP 304 responses
+    unchanged_count = db.Column(db.Integer, default=0)  # 200 responses with an identical body hash
+    bytes_downloaded = db.Column(db.BigInteger, default=0)
+    bytes_saved = db.Column(db.BigInteger, default=0)
+    parse_ms_saved = db.Column(db.Float, default=0.0)
+
+    # Health record and circuit breaker
+    circuit_state = db.Column(db.String(20), default='closed')  # closed, open, half_open
+    circuit_open_until = db.Column(db.DateTime)
+    consecutive_failures = db.Column(db.Integer, default=0)
+    failure_count = db.Column(db.Integer, default=0)
+    bozo_count = db.Column(db.Integer, default=0)
+    recent_latencies_ms = db.Column(db.Text)  # JSON list with the latest response times
+    last_error = db.Column(db.Text)
+    last_success_at = db.Column(db.DateTime)
+    last_failure_at = db.Column(db.DateTime)
+
+    last_checked_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class FeedCadence(db.Model):
+    """Observed publish rate of a feed key, used by the adaptive polling mode."""
+    __tablename__ = 'feed_cadences'
+    id = db.Column(db.Integer, primary_key=True)
+    feed_key = db.Column(db.String(100), nullable=False, unique=True, index=True)
+    avg_interarrival_seconds = db.Column(db.Float)  # EWMA of the gaps between published entries
+    samples = db.Column(db.Integer, default=0)
+    last_entry_at = db.Column(db.DateTime)  # publish time of the newest entry seen
+    interval_minutes = db.Column(db.Float)
+    last_polled_at = db.Column(db.DateTime)
+    next_poll_at = db.Column(db.DateTime, index=True)
+
+class StoryFingerprint(db.Model):
+    """Title and text fingerprint of a processed story, used to skip near-duplicates from other sources."""
+    __tablename__ = 'story_fingerprints'
+    id = db.Column(db.Integer, primary_key=True)
+    source_url = db.Column(db.String(1024), nullable=False)
+    feed_key = db.Column(db.String(100))
+    title_normalized = db.Column(db.String(512))
+    simhash = db.Column(db.String(16))  # 64-bit SimHash as hex, empty for texts too short to fingerprint
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class WebSubSubscription(db.Model):
+    """WebSub (PubSubHubbub) subscription of a feed URL to its hub."""
+    __tablename__ = 'websub_subscriptions'
+    id = db.Column(db.Integer, primary_key=True)
+    feed_key = db.Column(db.String(100), index=True)
+    topic_url = db.Column(db.String(1024), nullable=False, unique=True)  # URL in RSS_FEEDS
+    hub_topic = db.Column(db.String(1024))  # Topic announced by the feed (rel="self"), sent to the hub
+    hub_url = db.Column(db.String(1024))
+    secret = db.Column(db.String(128))
+    pending_secret = db.Column(db.String(128))  # Secret of a renewal not yet verified by the hub
+    state = db.Column(db.String(20), default='pending')  # pending, verified, denied, unsubscribing, unsubscribed
+    lease_expires_at = db.Column(db.DateTime)
+    last_push_at = db.Column(db.DateTime)
+    push_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ArticleAttempt(db.Model):
+    """Failed processing attempt of an article, with the time it may be retried."""
+    __tablename__ = 'article_attempts'
+    id = db.Column(db.Integer, primary_key=True)
+    source_url = db.Column(db.String(1024), nullable=False, unique=True)
+    feed_key = db.Column(db.String(100), index=True)
+    stage = db.Column(db.String(20))  # extraction, ai, json, db
+    retry_count = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text)
+    last_attempt_at = db.Column(db.DateTime)
+    next_eligible_at = db.Column(db.DateTime, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,8 +1,13 @@
 import json
+import hmac
 from flask import Blueprint, request, jsonify
+from config import API_CONFIG
 from services.scheduler import get_scheduler
 from services.wordpress_publisher import WordPressPublisher
 from services.ai_processor import AIProcessor
+from services.rss_monitor import RSSMonitor
+from services.http_client import get_http_client
+from services.media_index import MediaIndex
 from models import Article, ProcessingLog
 from extensions import db
 import logging
@@ -11,6 +16,19 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 api_bp = Blueprint('api', __name__)
 
+@api_bp.before_request
+def require_control_token():
+    """Control routes (POST) need API_CONFIG['control_token']; they are disabled when it is not set"""
+    if request.method != 'POST':
+        return None
+    token = API_CONFIG.get('control_token')
+    if not token:
+        return jsonify({'error': 'Control endpoints are disabled (API_CONTROL_TOKEN not set)'}), 403
+    provided = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(provided.encode('utf-8'), f"Bearer {token}".encode('utf-8')):
+        return jsonify({'error': 'Invalid or missing control token'}), 401
+    return None
+
 @api_bp.route('/stats')
 def get_stats():
     """Get system statistics"""
@@ -52,6 +70,46 @@ def get_ai_status():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@api_bp.route('/feed-cache-stats')
+def get_feed_cache_stats():
+    """Get conditional GET hit rates per feed URL"""
+    try:
+        return jsonify(RSSMonitor().get_feed_cache_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/feed-health')
+def get_feed_health():
+    """Get health and circuit breaker state per feed URL"""
+    try:
+        return jsonify(RSSMonitor().get_feed_health())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/http-metrics')
+def get_http_metrics():
+    """Get request counts and latency per host of the shared HTTP client"""
+    try:
+        return jsonify(get_http_client().get_metrics())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/host-politeness')
+def get_host_politeness():
+    """Get the adaptive rate and concurrency limits of each source site"""
+    try:
+        return jsonify(get_http_client().politeness.get_status())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/media-index')
+def get_media_index():
+    """Get counts of distinct media URLs, uploads and article references"""
+    try:
+        return jsonify(MediaIndex().get_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @api_bp.route('/scheduler-status')
 def get_scheduler_status():
     """Get scheduler status"""
@@ -0,0 +1,33 @@
+from flask import Blueprint, request
+from services.scheduler import get_scheduler
+from services.websub import WebSubSubscriber
+import logging
+
+logger = logging.getLogger(__name__)
+websub_bp = Blueprint('websub', __name__)
+
+@websub_bp.route('/callback/<int:subscription_id>', methods=['GET'])
+def verify_intent(subscription_id):
+    """Answer the hub's verification of intent"""
+    body, status = WebSubSubscriber().verify_intent(subscription_id, request.args)
+    return body, status, {'Content-Type': 'text/plain'}
+
+@websub_bp.route('/callback/<int:subscription_id>', methods=['POST'])
+def receive_content(subscription_id):
+    """Receive content distributed by the hub"""
+    try:
+        feed_key, articles = WebSubSubscriber().receive_push(
+            subscription_id,
+            request.get_data(),
+            request.headers.get('X-Hub-Signature-256') or request.headers.get('X-Hub-Signature')
+        )
+        if articles:
+            scheduler = get_scheduler()
+            if scheduler:
+                scheduler.enqueue_pushed_articles(feed_key, articles)
+            else:
+                logger.warning("Scheduler not available; pushed entries will be picked up by polling.")
+    except Exception as e:
+        logger.error(f"Error handling WebSub content for subscription {subscription_id}: {str(e)}", exc_info=True)
+    # The hub only needs to know the content was received; invalid content is ignored locally.
+    return '', 202
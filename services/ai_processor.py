@@ -1,7 +1,10 @@
+import hashlib
 import json
 import logging
 import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 # Usaremos o cliente de serviço de baixo nível para gerenciar chaves de API individuais
 from google.ai.generativelanguage_v1beta.services.generative_service import \
@@ -9,10 +12,17 @@ from google.ai.generativelanguage_v1beta.services.generative_service import \
 from google.api_core import client_options as client_options_lib
 # Tipos necessários para construir a requisição de baixo nível
 from google.ai.generativelanguage_v1beta.types import (Content, Part, GenerationConfig, GenerateContentRequest)
-from config import AI_CONFIG
+from google.api_core import exceptions as google_exceptions
+from services.key_rate_limiter import KeyRateLimiter
+from services.ai_response_cache import AIResponseCache, response_cache_key
+from services.prompt_reducer import estimate_tokens
+from config import AI_CONFIG, AI_RATE_LIMIT_CONFIG, AI_DISPATCH_CONFIG, AI_CACHE_CONFIG, AI_POOL_CONFIG
 
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = "models/gemini-1.5-flash"
+GENERATION_CONFIG = {'response_mime_type': 'application/json'}
+
 class AIProcessor:
     _instance = None
     _initialized = False
@@ -27,6 +37,15 @@ class AIProcessor:
             self.clients = {}
             self.client_counters = {}
             self.last_used_times = {}
+            self.rate_limiter = KeyRateLimiter()
+            self._counter_lock = threading.Lock()
+            self._executors = {}  # category -> ThreadPoolExecutor for submit_prompt
+            # Key pool (AI_POOL_CONFIG), guarded by _counter_lock
+            self._waiting = {}  # category -> prompts waiting for a key
+            self._outstanding = {}  # category -> prompts submitted with submit_prompt and not finished
+            self._borrowed_in_flight = {}  # category -> prompts running on borrowed keys
+            self.pool_stats = {}  # category -> {'borrowed', 'lent'}
+            self.response_cache = AIResponseCache() if AI_CACHE_CONFIG.get('enabled', True) else None
             self._init_clients()
             AIProcessor._initialized = True
 
@@ -34,6 +53,10 @@ class AIProcessor:
         """Initialize Gemini models for each AI configuration."""
         for ai_type, api_keys in AI_CONFIG.items():
             self.client_counters[ai_type] = 0
+            self._waiting[ai_type] = 0
+            self._outstanding[ai_type] = 0
+            self._borrowed_in_flight[ai_type] = 0
+            self.pool_stats[ai_type] = {'borrowed': 0, 'lent': 0}
             self.clients[ai_type] = []
             for i, api_key in enumerate(filter(None, api_keys)):  # filter(None, ...) removes empty keys
                 try:
@@ -42,103 +65,248 @@ class AIProcessor:
                     client_opts = client_options_lib.ClientOptions(api_key=api_key)
                     service_client = GenerativeServiceClient(client_options=client_opts)
 
-                    self.clients[ai_type].append((service_client, f"...{api_key[-4:]}"))
+                    # Chaves repetidas em várias categorias compartilham o mesmo limite
+                    key_id = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+                    self.rate_limiter.register(key_id, f"...{api_key[-4:]}")
+                    self.clients[ai_type].append((service_client, f"...{api_key[-4:]}", key_id))
                     logger.info(f"Initialized {ai_type} AI model #{i+1} (key ending in ...{api_key[-4:]})")
                 except Exception as e:
                     logger.error(f"Failed to initialize {ai_type} AI model #{i+1}: {str(e)}")
             if not self.clients[ai_type]:
                 logger.warning(f"No valid API keys found or initialized for AI type: {ai_type}")
 
-    def send_prompt(self, prompt: str, category: str) -> str | None:
+    def send_prompt(self, prompt: str, category: str, bypass_cache: bool = False) -> str | None:
         """
         Sends a prompt to the appropriate AI model for the given category.
-        It uses a round-robin approach to select the starting API key and
-        cycles through the rest if the initial one fails.
+        Among the keys with RPM/TPM/daily capacity right now and a closed circuit, the fastest
+        healthy one is used (round-robin order breaks ties); when none is available, it waits
+        only until the first one is. A key that answers 429 goes into cooldown for its
+        retry_delay and the next key is used. With AI_POOL_CONFIG enabled, a category whose
+        keys are all busy borrows an idle key of another category (see _borrow_key).
+        Responses are cached (AI_CACHE_CONFIG); `bypass_cache` forces a new generation, which
+        replaces the cached one.
         Returns the AI's response as a JSON string, or None on failure.
         """
         ai_type = category
 
+        cache_key = response_cache_key(MODEL_NAME, GENERATION_CONFIG, prompt) if self.response_cache else None
+        if cache_key and not bypass_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached:
+                logger.info(f"AI response for this {ai_type} prompt read from the response cache.")
+                return cached
+
         clients_for_category = self.clients.get(ai_type)
         if not clients_for_category:
             logger.error(f"No AI clients configured or initialized for category: '{ai_type}'")
             return None
 
         num_clients = len(clients_for_category)
-        start_index = self.client_counters[ai_type] % num_clients
-        
-        # Increment counter for the next call to start with a different key
-        self.client_counters[ai_type] += 1
+        with self._counter_lock:
+            start_index = self.client_counters[ai_type] % num_clients
+            # Increment counter for the next call to start with a different key
+            self.client_counters[ai_type] += 1
+
+        order = [(start_index + i) % num_clients for i in range(num_clients)]
+        pooled = AI_POOL_CONFIG.get('enabled', False)
+        reserved_tokens = estimate_tokens(prompt) + AI_RATE_LIMIT_CONFIG.get('expected_output_tokens', 2000)
+        deadline = time.monotonic() + AI_RATE_LIMIT_CONFIG.get('max_wait_seconds', 180)
+        failed = set()  # Keys that gave a non-rate-limit error for this prompt
+        attempt = 0
 
         last_error = "Unknown AI processing error."
-        # Iterate through clients starting from the round-robin index
-        for i in range(num_clients):
-            client_index = (start_index + i) % num_clients
-            client, partial_key = clients_for_category[client_index]
-            ai_name = f"{ai_type}_model_#{client_index + 1}"
-            
-            logger.info(f"Attempting to send prompt with {ai_name} using key {partial_key} (Attempt {i+1}/{num_clients} for this article)...")
-            
-            # Retry logic specifically for the current key
-            max_retries = 2
-            for attempt in range(max_retries):
+        while True:
+            candidates = [clients_for_category[index][2] for index in order if clients_for_category[index][2] not in failed]
+            key_id, wait = self.rate_limiter.reserve(candidates, reserved_tokens) if candidates else (None, None)
+            owner = ai_type
+            if key_id is None and pooled:
+                key_id, owner, borrow_wait = self._borrow_key(ai_type, failed, reserved_tokens)
+                if borrow_wait is not None:
+                    wait = borrow_wait if wait is None else min(wait, borrow_wait)
+            if key_id is None:
+                if wait is None:
+                    break  # Every key failed and there is none to borrow
+                if time.monotonic() + wait > deadline:
+                    last_error = f"No key with capacity within {AI_RATE_LIMIT_CONFIG.get('max_wait_seconds', 180)}s"
+                    break
+                if pooled:
+                    wait = min(wait, AI_POOL_CONFIG.get('recheck_seconds', 5))  # Another category may free a key sooner
+                logger.info(f"Every {ai_type} key is at its rate limit. Waiting {wait:.1f}s for the first one to refill.")
+                with self._counter_lock:
+                    self._waiting[ai_type] += 1
                 try:
-                    request = GenerateContentRequest(
-                        model="models/gemini-1.5-flash",
-                        contents=[Content(parts=[Part(text=prompt)])],
-                        generation_config=GenerationConfig(
-                            response_mime_type="application/json"
-                        )
-                    )
-                    response = client.generate_content(request=request, timeout=90) # Increased timeout for longer articles
-
-                    if response.candidates:
-                        candidate = response.candidates[0]
-                        finish_reason = candidate.finish_reason.name
-                        safety_ratings = [(rating.category.name, rating.probability.name) for rating in candidate.safety_ratings]
-                        logger.info(f"AI response details from {ai_name}: Finish reason='{finish_reason}', Safety ratings={safety_ratings}")
-
-                        # Only accept the response if the model stopped naturally.
-                        if finish_reason != "STOP":
-                            last_error = f"AI generation from {ai_name} finished with non-ideal reason: {finish_reason}."
-                            logger.warning(f"{last_error} This might result in a truncated or empty response. Trying next model.")
-                            break # Break from retry loop and try next key
-
-                        if candidate.content and candidate.content.parts:
-                            response_text = candidate.content.parts[0].text
-                            logger.info(f"Successfully received complete response from {ai_name}.")
-                            self.last_used_times[ai_type] = datetime.now()
-                            return response_text
+                    time.sleep(wait)
+                finally:
+                    with self._counter_lock:
+                        self._waiting[ai_type] -= 1
+                continue
 
-                except Exception as e:
-                    error_str = str(e)
-                    last_error = f"API call to {ai_name} failed: {error_str}"
-
-                    # Check for rate limit error and respect retry_delay if present
-                    if "429" in error_str and ("exceeded" in error_str or "exhausted" in error_str):
-                        match = re.search(r"retry_delay {\s*seconds: (\d+)\s*}", error_str)
-                        if match:
-                            delay = int(match.group(1))
-                            sleep_time = min(delay + 2, 60) 
-                            logger.warning(f"Rate limit hit for key {partial_key}. Retrying with same key in {sleep_time} seconds (Attempt {attempt + 1}/{max_retries}).")
-                            time.sleep(sleep_time)
-                            continue # Retry with the same key
-                    
-                    logger.warning(f"{last_error}. Trying next model if available.")
-                    break # Break from retry loop for non-rate-limit errors
+            client_index = next(index for index, entry in enumerate(self.clients[owner]) if entry[2] == key_id)
+            client, partial_key, _ = self.clients[owner][client_index]
+            ai_name = f"{owner}_model_#{client_index + 1}"
+            attempt += 1
+
+            if owner != ai_type:
+                logger.info(f"Borrowing {ai_name} for a {ai_type} prompt (every {ai_type} key is busy).")
+            logger.info(f"Attempting to send prompt with {ai_name} using key {partial_key} (Attempt {attempt} for this article)...")
+
+            try:
+                request = GenerateContentRequest(
+                    model=MODEL_NAME,
+                    contents=[Content(parts=[Part(text=prompt)])],
+                    generation_config=GenerationConfig(**GENERATION_CONFIG)
+                )
+                started = time.monotonic()
+                response = client.generate_content(request=request, timeout=90) # Increased timeout for longer articles
+                used_tokens = response.usage_metadata.total_token_count if response.usage_metadata else None
+                self.rate_limiter.record_success(key_id, time.monotonic() - started, reserved_tokens, used_tokens)
+
+                if response.candidates:
+                    candidate = response.candidates[0]
+                    finish_reason = candidate.finish_reason.name
+                    safety_ratings = [(rating.category.name, rating.probability.name) for rating in candidate.safety_ratings]
+                    logger.info(f"AI response details from {ai_name}: Finish reason='{finish_reason}', Safety ratings={safety_ratings}")
+
+                    # Only accept the response if the model stopped naturally.
+                    if finish_reason != "STOP":
+                        last_error = f"AI generation from {ai_name} finished with non-ideal reason: {finish_reason}."
+                        logger.warning(f"{last_error} This might result in a truncated or empty response. Trying next model.")
+                        failed.add(key_id)
+                        continue
+
+                    if candidate.content and candidate.content.parts:
+                        response_text = candidate.content.parts[0].text
+                        logger.info(f"Successfully received complete response from {ai_name}.")
+                        self.last_used_times[ai_type] = datetime.now()
+                        if cache_key:
+                            self.response_cache.put(cache_key, response_text, model=MODEL_NAME)
+                        return response_text
+
+            except Exception as e:
+                error_str = str(e)
+                last_error = f"API call to {ai_name} failed: {error_str}"
+
+                # Rate limit: the key sits out its retry_delay while the other keys keep working
+                if isinstance(e, google_exceptions.ResourceExhausted) or ("429" in error_str and ("exceeded" in error_str or "exhausted" in error_str)):
+                    retry_delay = self._retry_delay(e)
+                    delay = retry_delay + 2 if retry_delay is not None else AI_RATE_LIMIT_CONFIG.get('default_cooldown_seconds', 60)
+                    self.rate_limiter.cooldown(key_id, delay, retry_delay)
+                    continue
+
+                logger.warning(f"{last_error}. Trying next model if available.")
+                self.rate_limiter.record_failure(key_id)
+                failed.add(key_id)
+                continue
+            finally:
+                if owner != ai_type:
+                    with self._counter_lock:
+                        self._borrowed_in_flight[ai_type] -= 1
 
             last_error = f"Empty or invalid response from {ai_name}"
             logger.warning(f"{last_error}. The model may not have generated content. Trying next model if available.")
+            failed.add(key_id)
 
         logger.error(f"All AI clients for category '{ai_type}' failed. Last error: {last_error}")
         return None
 
+    def _borrow_key(self, category: str, exclude: set, tokens: int) -> tuple[str | None, str | None, float | None]:
+        """
+        Reserves a key of another category for a `category` prompt (AI_POOL_CONFIG). Only the
+        keys after each category's first 'reserved_keys' are lent, only by categories with no
+        prompt pending (queued in submit_prompt, running or waiting for a key), and a category runs at most 'max_borrowed_in_flight' prompts
+        on borrowed keys. Returns (key_id, owner category, 0), or (None, None, seconds worth
+        waiting) — None when no key could ever be lent.
+        """
+        own_ids = {key_id for _, _, key_id in self.clients.get(category, [])}
+        reserved = AI_POOL_CONFIG.get('reserved_keys', 2)
+        recheck = AI_POOL_CONFIG.get('recheck_seconds', 5)
+        with self._counter_lock:
+            lendable = {}  # key_id -> owner category; a key in several categories is not lent to itself
+            for owner, clients in self.clients.items():
+                if owner != category:
+                    for _, _, key_id in clients[reserved:]:
+                        if key_id not in own_ids and key_id not in exclude:
+                            lendable.setdefault(key_id, owner)
+            if not lendable:
+                return None, None, None
+            if self._borrowed_in_flight[category] >= AI_POOL_CONFIG.get('max_borrowed_in_flight', 2):
+                return None, None, recheck
+            # Queued prompts count too: a category with a backlog has no idle capacity to lend
+            idle = [key_id for key_id, owner in lendable.items() if not self._waiting[owner] and not self._outstanding[owner]]
+            if not idle:
+                return None, None, recheck
+            key_id, wait = self.rate_limiter.reserve(idle, tokens)
+            if key_id is None:
+                return None, None, wait
+            owner = lendable[key_id]
+            self._borrowed_in_flight[category] += 1
+            self.pool_stats[category]['borrowed'] += 1
+            self.pool_stats[owner]['lent'] += 1
+        return key_id, owner, 0.0
+
+    def _retry_delay(self, error: Exception) -> int | None:
+        """Returns the retry_delay in seconds of a 429 (RetryInfo detail or error text), if any."""
+        for detail in getattr(error, 'details', None) or []:
+            retry_delay = getattr(detail, 'retry_delay', None)
+            if retry_delay is not None and getattr(retry_delay, 'seconds', None) is not None:
+                return int(retry_delay.seconds)
+        match = re.search(r"retry_delay {\s*seconds: (\d+)\s*}", str(error))
+        return int(match.group(1)) if match else None
+
+    def discard_cached_response(self, prompt: str):
+        """Drops the cached response of a prompt, e.g. when it could not be used."""
+        if self.response_cache:
+            self.response_cache.delete(response_cache_key(MODEL_NAME, GENERATION_CONFIG, prompt))
+
+    def submit_prompt(self, prompt: str, category: str) -> Future:
+        """
+        Sends a prompt in the background and returns a Future with the result of send_prompt.
+        Each category runs up to AI_DISPATCH_CONFIG['max_concurrent_prompts'] prompts at once,
+        never more than its number of keys (plus the borrowed ones in pooled mode).
+        """
+        with self._counter_lock:
+            executor = self._executors.get(category)
+            if executor is None:
+                keys = len(self.clients.get(category) or [])
+                if AI_POOL_CONFIG.get('enabled', False):
+                    keys += AI_POOL_CONFIG.get('max_borrowed_in_flight', 2)
+                workers = max(1, min(AI_DISPATCH_CONFIG.get('max_concurrent_prompts', 1), keys))
+                executor = self._executors[category] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'ai-{category}')
+            self._outstanding[category] = self._outstanding.get(category, 0) + 1
+        try:
+            future = executor.submit(self.send_prompt, prompt, category)
+        except RuntimeError:  # Executor shut down
+            self._prompt_finished(category)
+            raise
+        future.add_done_callback(lambda _: self._prompt_finished(category))
+        return future
+
+    def _prompt_finished(self, category: str):
+        with self._counter_lock:
+            self._outstanding[category] -= 1
+
+    def shutdown(self):
+        """Stops the submit_prompt threads; prompts already queued are dropped."""
+        with self._counter_lock:
+            executors, self._executors = list(self._executors.values()), {}
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def get_ai_status(self):
         """Get status of all AIs"""
         status = {}
         for ai_type in AI_CONFIG.keys():
             last_used = self.last_used_times.get(ai_type)
+            keys = self.rate_limiter.get_status([key_id for _, _, key_id in self.clients.get(ai_type, [])])
             status[ai_type] = {
                 'available_keys': len(self.clients.get(ai_type, [])),
-                'last_used': last_used.isoformat() if last_used else "Never"
+                'healthy_keys': sum(1 for key in keys if key['healthy']),
+                'last_used': last_used.isoformat() if last_used else "Never",
+                'keys': keys
             }
+            if AI_POOL_CONFIG.get('enabled', False):
+                with self._counter_lock:
+                    status[ai_type]['pool'] = dict(self.pool_stats[ai_type], borrowed_in_flight=self._borrowed_in_flight[ai_type])
+        if self.response_cache:
+            status['response_cache'] = self.response_cache.get_stats()
         return status
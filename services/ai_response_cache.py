@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from config import AI_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+def response_cache_key(model: str, generation_config: dict, prompt: str) -> str:
+    """sha256 of the model name, the generation config and the fully rendered prompt."""
+    material = json.dumps({'model': model, 'generation_config': generation_config, 'prompt': prompt}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+class AIResponseCache:
+    """
+    On-disk cache of successful AI responses (one JSON file per key), so an article retried
+    after a failure in a later stage (JSON fields, database, publishing) does not pay for the
+    same generation again. Entries expire after 'ttl_hours'; when the cache outgrows
+    'max_size_mb' the least recently used ones are removed.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or AI_CACHE_CONFIG['path']
+        self._lock = threading.Lock()
+        self._size = None  # Bytes in path, computed on first write
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached response text, or None if it is missing or older than the TTL."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+        if time.time() - entry.get('created_at', 0) > AI_CACHE_CONFIG.get('ttl_hours', 168) * 3600:
+            self.delete(key)
+            self._count('misses')
+            return None
+        try:
+            os.utime(entry_path)  # Recency for the LRU eviction
+        except OSError:
+            pass
+        self._count('hits')
+        return entry.get('response')
+
+    def put(self, key: str, response: str, model: str = None):
+        """Stores a response. Failures are logged and never interrupt the pipeline."""
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            data = json.dumps({'model': model, 'created_at': time.time(), 'response': response}, ensure_ascii=False).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._entry_path(key))
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            with self._lock:
+                self.stats['stores'] += 1
+                self._size = self._total_size() if self._size is None else self._size + len(data)
+                if self._size > AI_CACHE_CONFIG.get('max_size_mb', 200) * 1024 * 1024:
+                    self._evict()
+        except OSError as e:
+            logger.warning(f"Could not store the AI response in the cache: {e}")
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def purge_expired(self) -> int:
+        """Removes expired entries. Returns the entries removed."""
+        if not os.path.isdir(self.path):
+            return 0
+        cutoff = time.time() - AI_CACHE_CONFIG.get('ttl_hours', 168) * 3600
+        removed = 0
+        for name in os.listdir(self.path):
+            entry_path = os.path.join(self.path, name)
+            # mtime is never older than created_at, so old files are removed without being read
+            if name.startswith('.tmp-') or os.path.getmtime(entry_path) >= cutoff and self._created_at(entry_path) >= cutoff:
+                continue
+            os.remove(entry_path)
+            removed += 1
+        with self._lock:
+            self._size = self._total_size()
+        logger.info(f"AI response cache: {removed} expired response(s) removed.")
+        return removed
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        entries = len([name for name in os.listdir(self.path) if not name.startswith('.tmp-')]) if os.path.isdir(self.path) else 0
+        return dict(stats, hit_rate=round(stats['hits'] / lookups, 3) if lookups else None,
+                    entries=entries, size_mb=round(self._total_size() / 1024 / 1024, 2))
+
+    def _evict(self):
+        """Removes the least recently used entries until the cache is 10% below its limit. Caller holds the lock."""
+        target = AI_CACHE_CONFIG.get('max_size_mb', 200) * 1024 * 1024 * 0.9
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.startswith('.tmp-'):
+                stat = os.stat(os.path.join(self.path, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+        for _, size, name in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                continue
+            self._size -= size
+            self.stats['evictions'] += 1
+
+    def _created_at(self, entry_path: str) -> float:
+        try:
+            with open(entry_path, encoding='utf-8') as f:
+                return json.load(f).get('created_at', 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _total_size(self) -> int:
+        if not os.path.isdir(self.path):
+            return 0
+        return sum(os.path.getsize(os.path.join(self.path, name)) for name in os.listdir(self.path))
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}.json')
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
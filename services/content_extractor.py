@@ -1,67 +1,374 @@
+import codecs
+import html
+import json
+import re
 import requests
 import trafilatura
 import logging
+import lxml.html
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from trafilatura.utils import load_html
+from urllib.parse import urljoin, urlparse, parse_qs
 
-from config import USER_AGENT
+from services.http_client import get_http_client
+from services.html_cache import HtmlCache
+from config import EXTRACTION_CONFIG, HTML_CACHE_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Where the article body is, from the most to the least specific; the page body otherwise
+_CONTENT_ROOT_XPATHS = (
+    '//*[@itemprop="articleBody"]',
+    '//*[contains(concat(" ", normalize-space(@class), " "), " article-body ")]',
+    '//article',
+)
+# schema.org types whose JSON-LD block describes the article itself
+_ARTICLE_TYPES = ('NewsArticle', 'Article', 'BlogPosting', 'ReportageNewsArticle', 'AnalysisNewsArticle',
+                  'OpinionNewsArticle', 'ReviewNewsArticle')
+_HEAD_END_RE = re.compile(r'</head\s*>|<body[\s>]', re.IGNORECASE)
+# Media inside these containers is page furniture (menus, related-article cards, widgets)
+_NON_CONTENT_TAGS = ('nav', 'header', 'footer', 'aside', 'form')
+# Valnet related-article cards, which also appear between the paragraphs of the body
+_PRUNE_XPATHS = ['//*[contains(concat(" ", normalize-space(@class), " "), " display-card ")]']
+_NON_CONTENT_CLASSES = ('related', 'display-card', 'newsletter', 'sidebar', 'author-box', 'ad-zone', 'social', 'share')
+
 class ContentExtractor:
     """
     Extracts, cleans, and normalizes content from a given URL.
     Implements fallback logic for metadata and sanitizes HTML content.
     """
 
+    def __init__(self):
+        self.html_cache = HtmlCache() if HTML_CACHE_CONFIG.get('enabled', True) else None
+
     def extract(self, url: str) -> dict:
         """
         Main method to perform content extraction from a URL.
+        Pages downloaded in the last HTML_CACHE_CONFIG['ttl_hours'] are read from the local cache.
         """
         try:
-            response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=15)
-            response.raise_for_status()
-            html_content = response.text
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Extract main content using trafilatura as a base
-            main_content_html = trafilatura.extract(
-                html_content,
-                include_comments=False,
-                include_tables=True,
-                no_fallback=True
-            )
-
-            if not main_content_html:
-                logger.warning(f"Trafilatura failed to extract main content from {url}. Falling back to body.")
-                body_tag = soup.find('body')
-                main_content_html = str(body_tag) if body_tag else ''
-
-            # Sanitize and process the extracted content
-            sanitized_content = self._sanitize_and_process_content(main_content_html, url)
-
-            return {
-                "metadata": self._extract_metadata(soup, url),
-                "content_html": sanitized_content
-            }
+            html_content = self.fetch_html(url)
+            return self.extract_from_html(html_content, url)
 
         except requests.RequestException as e:
             logger.error(f"Failed to fetch URL {url}: {e}")
             return None
         except Exception as e:
+            # The cached copy may be what broke the extraction; download it again next time.
+            if self.html_cache:
+                self.html_cache.delete(url)
             logger.error(f"An unexpected error occurred during extraction from {url}: {e}", exc_info=True)
             return None
 
-    def _extract_metadata(self, soup: BeautifulSoup, base_url: str) -> dict:
-        """Extracts metadata using fallback logic: OG -> Twitter -> Standard tags."""
-        meta = {
-            'canonical_url': self._find_tag(soup, 'link', {'rel': 'canonical'}, 'href') or base_url,
-            'title': self._find_tag(soup, 'meta', {'property': 'og:title'}, 'content') or self._find_tag(soup, 'title'),
-            'summary': self._find_tag(soup, 'meta', {'property': 'og:description'}, 'content') or self._find_tag(soup, 'meta', {'name': 'description'}, 'content'),
-            'featured_image': self._find_tag(soup, 'meta', {'property': 'og:image'}, 'content') or self._find_tag(soup, 'meta', {'name': 'twitter:image'}, 'content'),
-            'published_time': self._find_tag(soup, 'meta', {'property': 'article:published_time'}, 'content'),
-            'author': self._find_tag(soup, 'meta', {'name': 'author'}, 'content')
+    def fetch_html(self, url: str) -> str:
+        """Returns the HTML of a page, from the cache when possible."""
+        if self.html_cache:
+            cached = self.html_cache.get(url)
+            if cached:
+                logger.debug(f"HTML of {url} read from the local cache ({cached.fetched_at:%Y-%m-%d %H:%M}).")
+                return cached.html
+
+        with get_http_client().get(url, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            html_content, complete = self._read_body(response, url)
+        # A cut-off page would be reused as is on every retry
+        if self.html_cache and complete:
+            self.html_cache.put(url, html_content, final_url=response.url)
+        return html_content
+
+    def _read_body(self, response: requests.Response, url: str) -> tuple[str, bool]:
+        """
+        Reads a streamed response in chunks, decoding as it goes. Stops at the byte cap, or
+        early once the head and one of EXTRACTION_CONFIG['body_end_markers'] have been received.
+        Returns (html, complete); complete is False when the page was cut off.
+        """
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        max_bytes = EXTRACTION_CONFIG.get('max_download_bytes', 4 * 1024 * 1024)
+        markers = [marker.lower() for marker in EXTRACTION_CONFIG.get('body_end_markers', [])]
+        overlap = max([len('</head>')] + [len(marker) for marker in markers])
+
+        parts = []
+        received = 0
+        head_complete = False
+        tail = ''
+        for chunk in response.iter_content(chunk_size=EXTRACTION_CONFIG.get('chunk_size', 16 * 1024)):
+            if received + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - received]
+                parts.append(decoder.decode(chunk))
+                logger.warning(f"Page {url} is larger than {max_bytes} bytes. The rest was not downloaded.")
+                return ''.join(parts), False
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            parts.append(text)
+
+            if markers:
+                window = tail + text.lower()
+                if not head_complete:
+                    position = window.find('</head>')
+                    if position >= 0:
+                        head_complete = True
+                        window = window[position:]
+                if head_complete and any(marker in window for marker in markers):
+                    logger.debug(f"Stopped reading {url} after {received} bytes: article body complete.")
+                    return ''.join(parts), False
+                tail = window[-overlap:]
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts), True
+
+    def extract_from_html(self, html_content: str, url: str) -> dict:
+        """
+        Extracts metadata and main content from an already downloaded page.
+        With EXTRACTION_CONFIG['parser'] == 'lxml' the page is parsed once and the same tree is
+        used for the metadata, for trafilatura and for the body fallback.
+        """
+        if EXTRACTION_CONFIG.get('parser', 'lxml') != 'lxml':
+            return self._extract_legacy(html_content, url)
+
+        # Same parser settings trafilatura uses internally, so its output does not change
+        tree = load_html(html_content)
+        if tree is None:
+            return self._extract_legacy(html_content, url)
+
+        # Metadata and media first: trafilatura works on a copy, but the fallback below edits the tree
+        metadata = self._extract_metadata_from_tree(tree, url)
+        media = self._collect_media(tree, url, metadata.get('featured_image'))
+
+        main_content = trafilatura.extract(
+            tree,
+            include_comments=False,
+            include_tables=True,
+            no_fallback=True,
+            prune_xpath=_PRUNE_XPATHS
+        )
+        if main_content:
+            content = self._sanitize_text(main_content)
+        else:
+            logger.warning(f"Trafilatura failed to extract main content from {url}. Falling back to body.")
+            body = tree.find('body')
+            content = self._sanitize_tree(body, url) if body is not None else ''
+
+        return {
+            "metadata": metadata,
+            "content_html": content,
+            "media": media
+        }
+
+    def _extract_legacy(self, html_content: str, url: str) -> dict:
+        """Original BeautifulSoup pipeline, which parses the page up to three times."""
+        soup = BeautifulSoup(html_content, 'html.parser')
+
+        # Extract main content using trafilatura as a base
+        main_content_html = trafilatura.extract(
+            html_content,
+            include_comments=False,
+            include_tables=True,
+            no_fallback=True,
+            prune_xpath=_PRUNE_XPATHS
+        )
+
+        if not main_content_html:
+            logger.warning(f"Trafilatura failed to extract main content from {url}. Falling back to body.")
+            body_tag = soup.find('body')
+            main_content_html = str(body_tag) if body_tag else ''
+
+        # Sanitize and process the extracted content
+        sanitized_content = self._sanitize_and_process_content(main_content_html, url)
+
+        metadata = self._extract_metadata(soup, url, html_content)
+        tree = load_html(html_content)
+        return {
+            "metadata": metadata,
+            "content_html": sanitized_content,
+            "media": self._collect_media(tree, url, metadata.get('featured_image')) if tree is not None else []
+        }
+
+    def _extract_metadata(self, soup: BeautifulSoup, base_url: str, html_content: str = None) -> dict:
+        """
+        Reads the head (JSON-LD and OG tags) first; the fallback chain OG -> Twitter -> standard
+        tags then runs only for the fields still missing.
+        """
+        head = None
+        if html_content:
+            match = _HEAD_END_RE.search(html_content)
+            head = lxml.html.document_fromstring(html_content[:match.start()] if match else html_content).find('head')
+        meta = self._extract_head_metadata(head)
+        return self._fill_missing_metadata(meta, base_url, {
+            'canonical_url': lambda: self._find_tag(soup, 'link', {'rel': 'canonical'}, 'href'),
+            'title': lambda: self._find_tag(soup, 'meta', {'property': 'og:title'}, 'content') or self._find_tag(soup, 'title'),
+            'summary': lambda: self._find_tag(soup, 'meta', {'property': 'og:description'}, 'content') or self._find_tag(soup, 'meta', {'name': 'description'}, 'content'),
+            'featured_image': lambda: self._find_tag(soup, 'meta', {'property': 'og:image'}, 'content') or self._find_tag(soup, 'meta', {'name': 'twitter:image'}, 'content'),
+            'published_time': lambda: self._find_tag(soup, 'meta', {'property': 'article:published_time'}, 'content'),
+            'modified_time': lambda: self._find_tag(soup, 'meta', {'property': 'article:modified_time'}, 'content'),
+            'author': lambda: self._find_tag(soup, 'meta', {'name': 'author'}, 'content'),
+        })
+
+    def _extract_metadata_from_tree(self, tree, base_url: str) -> dict:
+        """Same as _extract_metadata, with the fallback chain in XPath on the lxml tree."""
+        meta = self._extract_head_metadata(tree.find('head'))
+        return self._fill_missing_metadata(meta, base_url, {
+            'canonical_url': lambda: self._xpath_first(tree, '//link[contains(concat(" ", normalize-space(@rel), " "), " canonical ")]/@href'),
+            'title': lambda: self._xpath_first(tree, '//meta[@property="og:title"]/@content') or self._xpath_first(tree, '//title'),
+            'summary': lambda: self._xpath_first(tree, '//meta[@property="og:description"]/@content') or self._xpath_first(tree, '//meta[@name="description"]/@content'),
+            'featured_image': lambda: self._xpath_first(tree, '//meta[@property="og:image"]/@content') or self._xpath_first(tree, '//meta[@name="twitter:image"]/@content'),
+            'published_time': lambda: self._xpath_first(tree, '//meta[@property="article:published_time"]/@content'),
+            'modified_time': lambda: self._xpath_first(tree, '//meta[@property="article:modified_time"]/@content'),
+            'author': lambda: self._xpath_first(tree, '//meta[@name="author"]/@content'),
+        })
+
+    def _extract_head_metadata(self, head) -> dict:
+        """
+        Fast path: one pass over the <head> children, reading the NewsArticle JSON-LD block and
+        the OG/Twitter/standard meta tags. The author and dates come from JSON-LD when present.
+        """
+        metas, canonical, title, article = {}, None, None, {}
+        for element in (head.iterchildren() if head is not None else ()):
+            tag = element.tag
+            if tag == 'meta':
+                key = (element.get('property') or element.get('name') or '').lower()
+                if key and element.get('content') and key not in metas:
+                    metas[key] = element.get('content').strip()
+            elif tag == 'link' and canonical is None and 'canonical' in (element.get('rel') or '').lower().split():
+                canonical = element.get('href')
+            elif tag == 'title' and title is None:
+                title = element.text_content().strip() or None
+            elif tag == 'script' and not article and (element.get('type') or '').lower() == 'application/ld+json':
+                try:
+                    article = self._find_article_ld(json.loads(element.text or '', strict=False)) or {}
+                except ValueError:
+                    continue
+
+        main_entity = article.get('mainEntityOfPage')
+        return {
+            'canonical_url': canonical or (main_entity.get('@id') if isinstance(main_entity, dict) else main_entity) or article.get('url'),
+            'title': metas.get('og:title') or self._ld_text(article.get('headline')) or title,
+            'summary': metas.get('og:description') or self._ld_text(article.get('description')) or metas.get('description'),
+            'featured_image': metas.get('og:image') or self._ld_image(article.get('image')) or metas.get('twitter:image'),
+            'published_time': self._ld_text(article.get('datePublished')) or metas.get('article:published_time'),
+            'modified_time': self._ld_text(article.get('dateModified')) or metas.get('article:modified_time'),
+            'author': self._ld_author(article.get('author')) or metas.get('author'),
         }
+
+    def _find_article_ld(self, data) -> dict | None:
+        """Returns the first article object of a JSON-LD document (top level, list or @graph)."""
+        if isinstance(data, list):
+            for item in data:
+                found = self._find_article_ld(item)
+                if found:
+                    return found
+        elif isinstance(data, dict):
+            types = data.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if any(t in _ARTICLE_TYPES for t in types):
+                return data
+            if '@graph' in data:
+                return self._find_article_ld(data['@graph'])
+        return None
+
+    def _ld_text(self, value) -> str | None:
+        return value.strip() or None if isinstance(value, str) else None
+
+    def _ld_image(self, value) -> str | None:
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('url') or value.get('contentUrl')
+        return self._ld_text(value)
+
+    def _ld_author(self, value) -> str | None:
+        authors = value if isinstance(value, list) else [value]
+        names = [self._ld_text(author.get('name') if isinstance(author, dict) else author) for author in authors]
+        return ', '.join(name for name in names if name) or None
+
+    def _fill_missing_metadata(self, meta: dict, base_url: str, fallbacks: dict) -> dict:
+        for field, fallback in fallbacks.items():
+            if not meta.get(field):
+                meta[field] = fallback()
+        meta['canonical_url'] = meta['canonical_url'] or base_url
+        return self._resolve_metadata_urls(meta, base_url)
+
+    def _collect_media(self, tree, base_url: str, featured_image: str = None) -> list:
+        """
+        Lists the images, YouTube videos and tweets of the article body as
+        [{'media_type', 'url'}], in page order and without repeats. URLs are absolute and
+        embeds normalized (https://www.youtube.com/embed/<id>, https://twitter.com/<user>/status/<id>).
+        """
+        root = None
+        for expression in _CONTENT_ROOT_XPATHS:
+            found = tree.xpath(expression)
+            if found:
+                root = found[0]
+                break
+        if root is None:
+            root = tree.find('body')
+
+        media = []
+        seen = set()
+
+        def add(media_type, url):
+            if url and url not in seen:
+                seen.add(url)
+                media.append({'media_type': media_type, 'url': url})
+
+        if featured_image:
+            add('image', featured_image)
+        if root is None:
+            return media
+
+        for element in root.iter('img', 'iframe', 'blockquote'):
+            if self._in_page_furniture(element, root):
+                continue
+            if element.tag == 'img':
+                src = element.get('src')
+                if not src or src.startswith('data:'):
+                    src = element.get('data-src')  # Lazy-loaded: src is empty or a placeholder
+                if src and not src.startswith('data:'):
+                    add('image', urljoin(base_url, src))
+            elif element.tag == 'iframe':
+                add('youtube', self._youtube_embed_url(element.get('src') or element.get('data-src') or ''))
+            elif 'twitter-tweet' in element.get('class', ''):
+                for href in element.xpath('.//a/@href'):
+                    parsed = urlparse(href)
+                    parts = parsed.path.strip('/').split('/')
+                    if parsed.netloc.replace('www.', '') in ('twitter.com', 'x.com') and len(parts) >= 3 and parts[1] == 'status':
+                        add('twitter', f"https://twitter.com/{parts[0]}/status/{parts[2]}")
+                        break
+        return media
+
+    def _in_page_furniture(self, element, root) -> bool:
+        for ancestor in element.iterancestors():
+            if ancestor is root:
+                return False
+            if ancestor.tag in _NON_CONTENT_TAGS:
+                return True
+            classes = (ancestor.get('class') or '').lower()
+            if any(name in classes for name in _NON_CONTENT_CLASSES):
+                return True
+        return False
+
+    def _youtube_embed_url(self, src: str) -> str | None:
+        """Normalizes a YouTube embed or watch URL to https://www.youtube.com/embed/<id>."""
+        parsed = urlparse(src)
+        host = parsed.netloc.lower()
+        if host.endswith('youtu.be'):
+            video_id = parsed.path.strip('/')
+        elif 'youtube.com' in host or 'youtube-nocookie.com' in host:
+            video_id = parse_qs(parsed.query).get('v', [''])[0] or parsed.path.rstrip('/').split('/')[-1]
+        else:
+            return None
+        return f"https://www.youtube.com/embed/{video_id}" if video_id and video_id != 'watch' else None
+
+    def _xpath_first(self, tree, expression: str):
+        """Returns the first attribute value or the stripped text of the first element matched."""
+        results = tree.xpath(expression)
+        if not results:
+            return None
+        first = results[0]
+        return str(first) if isinstance(first, str) else first.text_content().strip()
+
+    def _resolve_metadata_urls(self, meta: dict, base_url: str) -> dict:
         # Resolve relative URLs for images and canonical
         if meta['featured_image']:
             meta['featured_image'] = urljoin(base_url, meta['featured_image'])
@@ -102,4 +409,28 @@ class ContentExtractor:
             if img.get('src'):
                 img['src'] = urljoin(base_url, img['src'])
 
-        return str(soup)
\ No newline at end of file
+        return str(soup)
+
+    def _sanitize_text(self, text: str) -> str:
+        """
+        Escapes the plain text returned by trafilatura. Re-parsing it as HTML, as the legacy
+        pipeline does, drops literal text such as "<tags>" or "&D" that looks like markup.
+        """
+        return html.escape(text, quote=False)
+
+    def _sanitize_tree(self, element, base_url: str) -> str:
+        """Normalizes embeds and resolves image URLs in place on an lxml element, then serializes it."""
+        for iframe in element.iter('iframe'):
+            src = iframe.get('src', '')
+            if 'youtube.com' in src or 'youtu.be' in src:
+                video_id = urlparse(src).path.split('/')[-1]
+                iframe.attrib.clear()
+                iframe.set('src', f"https://www.youtube.com/embed/{video_id}")
+                iframe.set('frameborder', '0')
+                iframe.set('allowfullscreen', '')
+
+        for img in element.iter('img'):
+            if img.get('src'):
+                img.set('src', urljoin(base_url, img.get('src')))
+
+        return lxml.html.tostring(element, encoding='unicode', with_tail=False)
@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import StoryFingerprint
+from config import DEDUP_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Palavras que não ajudam a distinguir uma notícia da outra nos títulos em inglês dos feeds
+_TITLE_STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'from', 'as',
+    'is', 'are', 'was', 'be', 'its', 'it', 'this', 'that', 'after', 'new', 'just', 'why', 'how',
+    'what', 'gets', 'reveals', 'revealed', 'confirms', 'confirmed', 'official', 'officially',
+}
+
+def _tokens(text: str) -> list:
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return _WORD_RE.findall(text)
+
+def normalize_title(title: str) -> str:
+    """Lowercases, strips accents and punctuation and drops stopwords, keeping the word order."""
+    return ' '.join(token for token in _tokens(title) if token not in _TITLE_STOPWORDS)
+
+def simhash(text: str, shingle_size: int = 3) -> int | None:
+    """
+    Computes a 64-bit SimHash over the word shingles of a text.
+    Returns None for texts too short to produce a meaningful fingerprint.
+    """
+    tokens = _tokens(_TAG_RE.sub(' ', text or ''))
+    if len(tokens) < max(DEDUP_CONFIG.get('min_text_words', 50), shingle_size):
+        return None
+    shingles = [' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+def title_similarity(a: str, b: str) -> float:
+    """Jaccard similarity between the word sets of two normalized titles."""
+    words_a, words_b = set(a.split()), set(b.split())
+    # Títulos muito curtos coincidem por acaso com frequência
+    min_words = DEDUP_CONFIG.get('min_title_words', 4)
+    if len(words_a) < min_words or len(words_b) < min_words:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+class NearDuplicateDetector:
+    """
+    Detects the same story published by different sources within a time window, so that
+    only the first copy is sent to the AI. Each processed article leaves a fingerprint made
+    of its normalized title and a SimHash of its extracted text. A story is a duplicate when
+    the texts are nearly identical, or when the titles match and the texts are close; a
+    similar title alone never is. Stories still waiting for the AI can be held in memory
+    (hold/release) so they also count as earlier copies.
+    """
+
+    def __init__(self):
+        self._held = {}  # source_url -> unsaved StoryFingerprint of a story in flight
+
+    def hold(self, source_url: str, feed_key: str, title: str, content: str):
+        """Makes a story not yet saved count in find_duplicate until release()."""
+        text_hash = simhash(content)
+        self._held[source_url] = StoryFingerprint(
+            source_url=source_url,
+            feed_key=feed_key,
+            title_normalized=normalize_title(title)[:512],
+            simhash=f"{text_hash:016x}" if text_hash is not None else None
+        )
+
+    def release(self, source_url: str):
+        self._held.pop(source_url, None)
+
+    def is_held(self, source_url: str) -> bool:
+        """True while the story of `source_url` is held in flight (not saved yet)."""
+        return source_url in self._held
+
+    def find_duplicate(self, title: str, content: str, now: datetime = None) -> StoryFingerprint | None:
+        """Returns the fingerprint of an earlier story that the given one duplicates, if any."""
+        if not DEDUP_CONFIG.get('enabled', True):
+            return None
+
+        now = now or datetime.utcnow()
+        window_start = now - timedelta(hours=DEDUP_CONFIG.get('window_hours', 12))
+        title_norm = normalize_title(title)
+        text_hash = simhash(content)
+        max_distance = DEDUP_CONFIG.get('max_hamming_distance', 3)
+        min_title_similarity = DEDUP_CONFIG.get('title_similarity', 0.8)
+        title_max_distance = DEDUP_CONFIG.get('title_max_hamming_distance', 12)
+
+        fingerprints = StoryFingerprint.query.filter(StoryFingerprint.created_at >= window_start).all()
+        for fingerprint in fingerprints + list(self._held.values()):
+            if text_hash is None or not fingerprint.simhash:
+                continue  # Without both texts, a similar title alone is not enough
+            distance = bin(int(fingerprint.simhash, 16) ^ text_hash).count('1')
+            similarity = title_similarity(title_norm, fingerprint.title_normalized or '')
+            if distance <= max_distance or (similarity >= min_title_similarity and distance <= title_max_distance):
+                logger.info(
+                    f"Near-duplicate of {fingerprint.source_url} detected "
+                    f"(SimHash distance {distance}, title similarity {similarity:.2f})."
+                )
+                return fingerprint
+        return None
+
+    def remember(self, source_url: str, feed_key: str, title: str, content: str):
+        """Stores the fingerprint of a story so later copies of it can be detected."""
+        if not DEDUP_CONFIG.get('enabled', True):
+            return
+        text_hash = simhash(content)
+        fingerprint = StoryFingerprint(
+            source_url=source_url,
+            feed_key=feed_key,
+            title_normalized=normalize_title(title)[:512],
+            simhash=f"{text_hash:016x}" if text_hash is not None else None
+        )
+        db.session.add(fingerprint)
+        db.session.commit()
+
+    def cleanup(self):
+        """Removes fingerprints older than the detection window."""
+        cutoff = datetime.utcnow() - timedelta(hours=DEDUP_CONFIG.get('window_hours', 12))
+        removed = StoryFingerprint.query.filter(StoryFingerprint.created_at < cutoff).delete()
+        db.session.commit()
+        logger.info(f"Removed {removed} story fingerprints older than the deduplication window.")
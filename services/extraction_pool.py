@@ -0,0 +1,153 @@
+import logging
+import multiprocessing
+import queue
+import threading
+
+try:
+    import resource  # Not available on Windows; workers are then recycled by task count only
+except ImportError:
+    resource = None
+
+from config import EXTRACTION_POOL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+def _worker_main(conn):
+    """Worker process loop: receives (url, html), answers (result, error, peak RSS in MB)."""
+    from services.content_extractor import ContentExtractor
+
+    extractor = ContentExtractor()
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        url, html = task
+        try:
+            result, error = extractor.extract_from_html(html, url), None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None
+        conn.send((result, error, peak_rss_mb))
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True, name='extraction-worker')
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self, force: bool = False):
+        if not force:
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=5)
+            except (OSError, EOFError):
+                pass
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        self.conn.close()
+
+class ExtractionPool:
+    """
+    Runs ContentExtractor.extract_from_html in worker processes.
+
+    extract() is blocking and thread-safe: call it from several threads to use several
+    workers. A page that takes longer than 'timeout_seconds' gets its worker terminated and
+    replaced, so a pathological parse cannot stall the cycle. Workers whose peak RSS passes
+    'max_rss_mb', or that processed 'max_tasks_per_worker' pages, are recycled.
+    Results are the same plain dicts returned by ContentExtractor.
+    """
+
+    def __init__(self, workers: int = None):
+        self.size = workers or EXTRACTION_POOL_CONFIG.get('workers') or multiprocessing.cpu_count()
+        self._context = multiprocessing.get_context('spawn')  # No fork of the scheduler threads/DB connections
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+        self.stats = {'pages': 0, 'errors': 0, 'timeouts': 0, 'recycled': 0}
+
+    def extract(self, url: str, html: str) -> dict | None:
+        """Extracts a page in a worker process. Returns None on error or timeout."""
+        worker = self._checkout()
+        timeout = EXTRACTION_POOL_CONFIG.get('timeout_seconds', 30)
+        try:
+            worker.conn.send((url, html))
+            if not worker.conn.poll(timeout):
+                logger.error(f"Extraction of {url} exceeded {timeout}s. Terminating its worker process.")
+                self._count('timeouts')
+                self._discard(worker, force=True)
+                return None
+            result, error, peak_rss_mb = worker.conn.recv()
+        except (OSError, EOFError) as e:
+            logger.error(f"Extraction worker died while processing {url}: {e}")
+            self._count('errors')
+            self._discard(worker, force=True)
+            return None
+
+        worker.tasks += 1
+        self._count('pages')
+        if error:
+            self._count('errors')
+            logger.error(f"An unexpected error occurred during extraction from {url}: {error}")
+
+        max_rss_mb = EXTRACTION_POOL_CONFIG.get('max_rss_mb', 512)
+        if (peak_rss_mb and peak_rss_mb > max_rss_mb) or worker.tasks >= EXTRACTION_POOL_CONFIG.get('max_tasks_per_worker', 200):
+            logger.info(f"Recycling extraction worker after {worker.tasks} page(s) (peak RSS {peak_rss_mb or 0:.0f} MB).")
+            self._count('recycled')
+            self._discard(worker)
+        elif self._closed:
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+        return result
+
+    def close(self):
+        """Stops every idle worker. Workers still busy are stopped when they are returned."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(worker)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self.stats, workers=self.size, running=self._started)
+
+    def _checkout(self) -> _Worker:
+        # Workers are started on demand up to the pool size
+        while True:
+            with self._lock:
+                start_new = self._idle.empty() and self._started < self.size
+                if start_new:
+                    self._started += 1
+            if start_new:
+                try:
+                    return _Worker(self._context)
+                except Exception:
+                    with self._lock:
+                        self._started -= 1
+                    raise
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue  # A discarded worker may have freed a slot
+
+    def _discard(self, worker: _Worker, force: bool = False):
+        worker.stop(force=force)
+        with self._lock:
+            self._started -= 1
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
@@ -0,0 +1,191 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from models import hash_url
+from dto import CachedPageDTO
+from config import HTML_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class HtmlCache:
+    """
+    Content-addressed on-disk cache of the raw HTML of article pages.
+
+    Each URL has a small JSON entry (index/<sha256 of the URL>.json) pointing to a gzip
+    compressed body stored under its content hash (pages/<sha256 of the HTML>.html.gz), so
+    identical pages reached through different URLs are stored once. Entries expire after
+    'ttl_hours'; when the pages outgrow 'max_size_mb' the least recently used ones are removed.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or HTML_CACHE_CONFIG['path']
+        self.index_dir = os.path.join(self.path, 'index')
+        self.pages_dir = os.path.join(self.path, 'pages')
+        self._lock = threading.Lock()
+        self._size = None  # Bytes in pages_dir, computed on first write
+
+    def get(self, url: str, allow_expired: bool = False) -> CachedPageDTO | None:
+        """Returns the cached page of a URL, or None if it is missing or older than the TTL."""
+        entry = self._read_entry(self._entry_path(url))
+        if entry is None:
+            return None
+
+        fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        if not allow_expired and datetime.utcnow() - fetched_at > timedelta(hours=HTML_CACHE_CONFIG.get('ttl_hours', 72)):
+            return None
+
+        page_path = self._page_path(entry['content_hash'])
+        try:
+            with gzip.open(page_path, 'rt', encoding='utf-8') as f:
+                html = f.read()
+            os.utime(page_path)  # Recency for the LRU eviction
+        except (OSError, EOFError):
+            self.delete(url)
+            return None
+        return CachedPageDTO(
+            url=entry['url'],
+            final_url=entry.get('final_url') or entry['url'],
+            html=html,
+            content_hash=entry['content_hash'],
+            fetched_at=fetched_at
+        )
+
+    def put(self, url: str, html: str, final_url: str = None):
+        """Stores the HTML of a page. Failures are logged and never interrupt the pipeline."""
+        try:
+            data = html.encode('utf-8')
+            content_hash = hashlib.sha256(data).hexdigest()
+            page_path = self._page_path(content_hash)
+            os.makedirs(self.pages_dir, exist_ok=True)
+            os.makedirs(self.index_dir, exist_ok=True)
+
+            added = 0
+            if os.path.exists(page_path):
+                os.utime(page_path)
+            else:
+                added = self._write_atomic(page_path, gzip.compress(data, compresslevel=6))
+            self._write_atomic(self._entry_path(url), json.dumps({
+                'url': url,
+                'final_url': final_url or url,
+                'content_hash': content_hash,
+                'fetched_at': datetime.utcnow().isoformat(),
+            }).encode('utf-8'))
+
+            with self._lock:
+                if self._size is None:
+                    self._size = self._pages_size()
+                else:
+                    self._size += added
+                if self._size > HTML_CACHE_CONFIG.get('max_size_mb', 500) * 1024 * 1024:
+                    self._evict()
+        except OSError as e:
+            logger.warning(f"Could not store {url} in the HTML cache: {e}")
+
+    def delete(self, url: str):
+        """Drops the entry of a URL. Its page is left to the eviction, as other URLs may share it."""
+        try:
+            os.remove(self._entry_path(url))
+        except OSError:
+            pass
+
+    def iter_pages(self, allow_expired: bool = True):
+        """Yields every cached page (e.g. for reprocessing or benchmarks)."""
+        if not os.path.isdir(self.index_dir):
+            return
+        for name in sorted(os.listdir(self.index_dir)):
+            entry = self._read_entry(os.path.join(self.index_dir, name))
+            if entry:
+                page = self.get(entry['url'], allow_expired=allow_expired)
+                if page:
+                    yield page
+
+    def purge_expired(self) -> int:
+        """Removes expired entries and the pages no longer referenced. Returns the entries removed."""
+        if not os.path.isdir(self.index_dir):
+            return 0
+        cutoff = datetime.utcnow() - timedelta(hours=HTML_CACHE_CONFIG.get('ttl_hours', 72))
+        removed = 0
+        referenced = set()
+        for name in os.listdir(self.index_dir):
+            entry_path = os.path.join(self.index_dir, name)
+            entry = self._read_entry(entry_path)
+            if entry is None:
+                continue
+            if datetime.fromisoformat(entry['fetched_at']) < cutoff:
+                os.remove(entry_path)
+                removed += 1
+            else:
+                referenced.add(entry['content_hash'])
+
+        with self._lock:
+            for name in os.listdir(self.pages_dir) if os.path.isdir(self.pages_dir) else []:
+                if not name.startswith('.tmp-') and name.split('.', 1)[0] not in referenced:
+                    os.remove(os.path.join(self.pages_dir, name))
+            self._size = self._pages_size()
+        logger.info(f"HTML cache: {removed} expired page(s) removed.")
+        return removed
+
+    def get_stats(self) -> dict:
+        entries = len(os.listdir(self.index_dir)) if os.path.isdir(self.index_dir) else 0
+        pages = len(os.listdir(self.pages_dir)) if os.path.isdir(self.pages_dir) else 0
+        return {'entries': entries, 'pages': pages, 'size_mb': round(self._pages_size() / 1024 / 1024, 2)}
+
+    def _evict(self):
+        """Removes the least recently used pages until the cache is 10% below its limit. Caller holds the lock."""
+        target = HTML_CACHE_CONFIG.get('max_size_mb', 500) * 1024 * 1024 * 0.9
+        pages = []
+        for name in os.listdir(self.pages_dir):
+            if name.startswith('.tmp-'):
+                continue
+            stat = os.stat(os.path.join(self.pages_dir, name))
+            pages.append((stat.st_mtime, stat.st_size, name))
+        pages.sort()
+
+        removed = 0
+        for _, size, name in pages:
+            if self._size <= target:
+                break
+            try:
+                os.remove(os.path.join(self.pages_dir, name))
+            except OSError:
+                continue
+            self._size -= size
+            removed += 1
+        # Entries of removed pages are dropped lazily by get()
+        logger.info(f"HTML cache over {HTML_CACHE_CONFIG.get('max_size_mb', 500)} MB: evicted {removed} page(s).")
+
+    def _pages_size(self) -> int:
+        if not os.path.isdir(self.pages_dir):
+            return 0
+        return sum(os.path.getsize(os.path.join(self.pages_dir, name)) for name in os.listdir(self.pages_dir))
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.index_dir, f'{hash_url(url)}.json')
+
+    def _page_path(self, content_hash: str) -> str:
+        return os.path.join(self.pages_dir, f'{content_hash}.html.gz')
+
+    def _read_entry(self, entry_path: str) -> dict | None:
+        try:
+            with open(entry_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path: str, data: bytes) -> int:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return len(data)
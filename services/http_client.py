@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+from services.politeness import HostPoliteness
+from config import USER_AGENT, HTTP_CLIENT_CONFIG, POLITENESS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class HttpClient:
+    """
+    Shared HTTP client for feeds, article pages, WebSub hubs and the WordPress API.
+
+    A single requests.Session keeps per-host connection pools alive between calls, so the
+    few hosts we talk to are not paying a new TCP+TLS handshake on every request. Idempotent
+    requests are retried with exponential backoff and jitter, responses are decoded from
+    gzip/deflate (and brotli when the `brotli` package is installed), and the time spent on
+    each host is recorded. Requests to the source sites go through HostPoliteness.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = self._build_adapter(status_forcelist=(500, 502, 503, 504))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.politeness = HostPoliteness()
+        if POLITENESS_CONFIG.get('enabled', True):
+            # Throttle statuses from the source sites (e.g. a 503 from the CDN/WAF) are not retried
+            # right away: HostPoliteness sees them on the first response and cools the host down
+            throttle_statuses = set(POLITENESS_CONFIG.get('throttle_statuses', [403, 429, 503]))
+            polite_adapter = self._build_adapter(status_forcelist=tuple(status for status in (500, 502, 503, 504) if status not in throttle_statuses))
+            for host in self.politeness.hosts():
+                self.session.mount(f'http://{host}/', polite_adapter)
+                self.session.mount(f'https://{host}/', polite_adapter)
+
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        # Anuncia apenas as codificações que o urllib3 consegue decodificar neste ambiente
+        self.session.headers.update({'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']})
+
+        self._metrics_lock = threading.Lock()
+        self._host_metrics = defaultdict(lambda: {
+            'requests': 0,
+            'errors': 0,
+            'total_ms': 0.0,
+            'latencies_ms': deque(maxlen=HTTP_CLIENT_CONFIG.get('latency_samples', 200))
+        })
+
+    def _build_adapter(self, status_forcelist: tuple) -> HTTPAdapter:
+        retry = Retry(
+            total=HTTP_CLIENT_CONFIG.get('max_retries', 2),
+            connect=HTTP_CLIENT_CONFIG.get('max_retries', 2),
+            backoff_factor=HTTP_CLIENT_CONFIG.get('backoff_factor', 0.5),
+            backoff_jitter=HTTP_CLIENT_CONFIG.get('backoff_jitter', 0.5),
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),  # POSTs are never retried
+            # urllib3 would sleep for the whole Retry-After, with no upper bound, while holding the
+            # caller's thread; HostPoliteness reads it from the final response and caps the pause
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        return HTTPAdapter(
+            pool_connections=HTTP_CLIENT_CONFIG.get('pool_connections', 16),
+            pool_maxsize=HTTP_CLIENT_CONFIG.get('pool_maxsize', 8),
+            max_retries=retry
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request through the shared session and records its timing for the host."""
+        kwargs.setdefault('timeout', HTTP_CLIENT_CONFIG.get('default_timeout', 15))
+        host = urlparse(url).netloc
+        polite = self.politeness.manages(host)
+        if polite:
+            self.politeness.acquire(host)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self._record(url, (time.perf_counter() - start) * 1000, error=True)
+            if polite:
+                self.politeness.release(host, error=True)
+            raise
+        self._record(url, (time.perf_counter() - start) * 1000, error=response.status_code >= 500)
+        if polite:
+            self.politeness.release(host, response.status_code, response.headers.get('Retry-After'))
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def _record(self, url: str, elapsed_ms: float, error: bool):
+        host = urlparse(url).netloc
+        with self._metrics_lock:
+            metrics = self._host_metrics[host]
+            metrics['requests'] += 1
+            metrics['errors'] += int(error)
+            metrics['total_ms'] += elapsed_ms
+            metrics['latencies_ms'].append(elapsed_ms)
+
+    def get_metrics(self) -> dict:
+        """Returns request counts, error counts and latency percentiles per host."""
+        with self._metrics_lock:
+            snapshot = {host: (dict(m), sorted(m['latencies_ms'])) for host, m in self._host_metrics.items()}
+        metrics = {}
+        for host, (m, latencies) in snapshot.items():
+            metrics[host] = {
+                'requests': m['requests'],
+                'errors': m['errors'],
+                'avg_ms': round(m['total_ms'] / m['requests'], 1) if m['requests'] else None,
+                'p50_ms': round(latencies[len(latencies) // 2], 1) if latencies else None,
+                'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1) if latencies else None,
+            }
+        return metrics
+
+
+# Global client instance
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide HTTP client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,235 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from pytz import timezone
+
+from config import AI_RATE_LIMIT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+def _seconds_until_quota_reset() -> float:
+    now = datetime.now(timezone(AI_RATE_LIMIT_CONFIG.get('quota_timezone', 'America/Los_Angeles')))
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+def _quota_day() -> str:
+    return datetime.now(timezone(AI_RATE_LIMIT_CONFIG.get('quota_timezone', 'America/Los_Angeles'))).strftime('%Y-%m-%d')
+
+class _KeyBuckets:
+    def __init__(self, label: str, limits: dict):
+        self.label = label
+        self.rpm = float(limits['requests_per_minute'])
+        self.tpm = float(limits['tokens_per_minute'])
+        self.rpd = limits.get('requests_per_day')
+        self.request_capacity = max(1.0, float(limits.get('request_burst', 1)))
+        self.requests = self.request_capacity
+        self.tokens = self.tpm
+        self.refilled_at = time.monotonic()
+        self.cooldown_until = 0.0
+
+        # Health record
+        self.day = _quota_day()
+        self.daily_requests = 0
+        self.daily_tokens = 0
+        self.recent_429s = deque()  # monotonic times of the 429s of the last hour
+        self.last_retry_delay = None
+        self.error_rate = 0.0  # EWMA of failed calls (429s excluded)
+        self.latency_ms = None  # EWMA of successful calls
+        self.consecutive_failures = 0
+        self.circuit_opens = 0  # Consecutive circuit openings, for the backoff
+        self.circuit_open_until = 0.0
+
+    def refill(self, now: float):
+        elapsed = now - self.refilled_at
+        self.requests = min(self.request_capacity, self.requests + elapsed * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+        self.refilled_at = now
+        day = _quota_day()
+        if day != self.day:
+            self.day, self.daily_requests, self.daily_tokens = day, 0, 0
+        while self.recent_429s and now - self.recent_429s[0] > 3600:
+            self.recent_429s.popleft()
+
+    def wait_for(self, tokens: int, now: float) -> float:
+        """Seconds until this key can take a request of `tokens` tokens (0 if it can now)."""
+        waits = [self.cooldown_until - now, self.circuit_open_until - now, (1 - self.requests) * 60 / self.rpm]
+        # A prompt larger than the whole TPM budget only needs a full bucket
+        waits.append((min(tokens, self.tpm) - self.tokens) * 60 / self.tpm)
+        if self.rpd and self.daily_requests >= self.rpd:
+            waits.append(_seconds_until_quota_reset())
+        return max(0.0, *waits)
+
+    def score(self) -> float:
+        """Lower is better: latency EWMA plus up to 30 s for the error rate. Untried keys come first."""
+        return (self.latency_ms or 0.0) + 30000 * self.error_rate
+
+class KeyRateLimiter:
+    """
+    Rate limits and health of every Gemini API key.
+
+    Each key has token buckets for requests and tokens per minute (AI_RATE_LIMIT_CONFIG,
+    overridable per key), a daily request quota and a health record: recent 429s and their
+    retry_delay, error rate, latency EWMA and a circuit breaker that takes a key out of
+    rotation after consecutive failures. reserve() only considers keys that can take the
+    request right now, favoring the fastest healthy one; when none can, it says how long
+    until the first one will, so callers wait only that long instead of hitting exhausted keys.
+    The daily usage of each key is saved to 'usage_path' and loaded back on startup, so a
+    restart does not forget how much of the day's quota is already spent.
+    """
+
+    def __init__(self, usage_path: str = None):
+        self._keys = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.usage_path = usage_path if usage_path is not None else AI_RATE_LIMIT_CONFIG.get('usage_path')
+        self._saved_usage = self._load_usage()
+
+    def register(self, key_id: str, label: str):
+        """Adds a key. `label` is the masked key (e.g. '...abcd') used for the per-key overrides and logs."""
+        limits = dict(AI_RATE_LIMIT_CONFIG['default_limits'], **AI_RATE_LIMIT_CONFIG.get('key_overrides', {}).get(label[-4:], {}))
+        with self._lock:
+            if key_id in self._keys:
+                return
+            bucket = self._keys[key_id] = _KeyBuckets(label, limits)
+            saved = self._saved_usage.get(key_id, {})
+            if saved.get('day') == bucket.day:
+                bucket.daily_requests = int(saved.get('requests', 0))
+                bucket.daily_tokens = int(saved.get('tokens', 0))
+
+    def reserve(self, key_ids: list, tokens: int) -> tuple[str | None, float]:
+        """
+        Takes one request and `tokens` tokens from the best key of `key_ids` with capacity
+        (ties keep the given order). Returns (key_id, 0), or (None, seconds until the earliest
+        key can take it).
+        """
+        now = time.monotonic()
+        with self._lock:
+            earliest = None
+            ready = []
+            for key_id in key_ids:
+                bucket = self._keys[key_id]
+                bucket.refill(now)
+                wait = bucket.wait_for(tokens, now)
+                if wait == 0:
+                    ready.append(bucket)
+                    continue
+                earliest = wait if earliest is None else min(earliest, wait)
+            if not ready:
+                return None, earliest if earliest is not None else 0.0
+            best = min(ready, key=lambda bucket: bucket.score())
+            best.requests -= 1
+            best.tokens -= min(tokens, best.tpm)
+            best.daily_requests += 1
+            key_id = next(key_id for key_id in key_ids if self._keys[key_id] is best)
+        self._save_usage()
+        return key_id, 0.0
+
+    def record_success(self, key_id: str, latency_s: float, reserved: int, used: int = None):
+        """Records a completed call; `used` (real token usage) corrects the token bucket."""
+        alpha = AI_RATE_LIMIT_CONFIG.get('latency_ewma_alpha', 0.3)
+        with self._lock:
+            bucket = self._keys[key_id]
+            if used:
+                bucket.tokens = min(bucket.tpm, bucket.tokens + min(reserved, bucket.tpm) - used)
+            bucket.daily_tokens += used or reserved
+            latency_ms = latency_s * 1000
+            bucket.latency_ms = latency_ms if bucket.latency_ms is None else alpha * latency_ms + (1 - alpha) * bucket.latency_ms
+            bucket.error_rate *= 1 - alpha
+            bucket.consecutive_failures = 0
+            bucket.circuit_opens = 0
+        self._save_usage()
+
+    def record_failure(self, key_id: str):
+        """Records a failed call (not a 429); opens the key's circuit after consecutive failures."""
+        alpha = AI_RATE_LIMIT_CONFIG.get('latency_ewma_alpha', 0.3)
+        with self._lock:
+            bucket = self._keys[key_id]
+            bucket.error_rate = alpha + (1 - alpha) * bucket.error_rate
+            bucket.consecutive_failures += 1
+            if bucket.consecutive_failures < AI_RATE_LIMIT_CONFIG.get('circuit_failure_threshold', 3):
+                return
+            bucket.circuit_opens += 1
+            bucket.consecutive_failures = 0
+            seconds = AI_RATE_LIMIT_CONFIG.get('circuit_cooldown_seconds', 300) * 2 ** min(bucket.circuit_opens - 1, 3)
+            bucket.circuit_open_until = time.monotonic() + seconds
+        logger.warning(f"Key {bucket.label} failed repeatedly. Circuit open for {seconds:.0f}s.")
+
+    def cooldown(self, key_id: str, seconds: float, retry_delay: float = None):
+        """Keeps a key out of rotation for `seconds` after a 429. `retry_delay` is the one the API sent, if any."""
+        with self._lock:
+            bucket = self._keys[key_id]
+            bucket.cooldown_until = max(bucket.cooldown_until, time.monotonic() + seconds)
+            bucket.requests = min(bucket.requests, 0.0)
+            bucket.recent_429s.append(time.monotonic())
+            bucket.last_retry_delay = retry_delay
+        logger.warning(f"Key {bucket.label} rate limited. Out of rotation for {seconds:.0f}s.")
+
+    def _load_usage(self) -> dict:
+        if not self.usage_path:
+            return {}
+        try:
+            with open(self.usage_path, encoding='utf-8') as f:
+                usage = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read the saved key usage from {self.usage_path}: {e}")
+            return {}
+        return usage if isinstance(usage, dict) else {}
+
+    def _save_usage(self):
+        """Writes the daily counters of every key. Failures are logged and never interrupt the pipeline."""
+        if not self.usage_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                usage = {key_id: {'day': bucket.day, 'requests': bucket.daily_requests, 'tokens': bucket.daily_tokens}
+                         for key_id, bucket in self._keys.items()}
+            directory = os.path.dirname(self.usage_path) or '.'
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(usage, f)
+                    os.replace(tmp_path, self.usage_path)
+                except OSError:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            except OSError as e:
+                logger.warning(f"Could not save the key usage to {self.usage_path}: {e}")
+
+    def get_status(self, key_ids: list) -> list:
+        now = time.monotonic()
+        with self._lock:
+            status = []
+            for key_id in key_ids:
+                bucket = self._keys[key_id]
+                bucket.refill(now)
+                ready_in = bucket.wait_for(0, now)
+                status.append({
+                    'key': bucket.label,
+                    'healthy': bucket.circuit_open_until <= now and bucket.cooldown_until <= now,
+                    'ready_in_seconds': round(ready_in, 1),
+                    'requests_per_minute': bucket.rpm,
+                    'tokens_per_minute': int(bucket.tpm),
+                    'tokens_available': int(bucket.tokens),
+                    'quota_exhausted': bool(bucket.rpd and bucket.daily_requests >= bucket.rpd),
+                    'requests_today': bucket.daily_requests,
+                    'requests_per_day': bucket.rpd,
+                    'tokens_today': bucket.daily_tokens,
+                    'cooldown_seconds': round(max(0.0, bucket.cooldown_until - now), 1),
+                    'rate_limited_last_hour': len(bucket.recent_429s),
+                    'last_retry_delay': bucket.last_retry_delay,
+                    'circuit': 'open' if bucket.circuit_open_until > now else 'closed',
+                    'error_rate': round(bucket.error_rate, 3),
+                    'latency_ms': round(bucket.latency_ms, 1) if bucket.latency_ms is not None else None,
+                })
+            return status
@@ -0,0 +1,86 @@
+import logging
+
+from extensions import db
+from models import ExtractedMedia, MediaAsset, hash_url
+
+logger = logging.getLogger(__name__)
+
+class MediaIndex:
+    """
+    Records the images and YouTube/Twitter embeds found by ContentExtractor.
+
+    Every article gets its ExtractedMedia rows, while each distinct media URL is stored once
+    in MediaAsset (unique url_hash). Downstream stages look the asset up by URL, so an image
+    used by several articles is uploaded to WordPress only once.
+    """
+
+    def record(self, article_id: int, media: list) -> int:
+        """
+        Adds the media of an article in bulk, in the caller's transaction (not committed).
+        `media` is the list of {'media_type', 'url'} returned by the extractor. Returns the
+        number of media URLs not seen before.
+        """
+        items = {}
+        for item in media or []:
+            url = (item.get('url') or '')[:1024]
+            if url:
+                items.setdefault(hash_url(url), (item.get('media_type'), url))
+        if not items:
+            return 0
+
+        known = {
+            row[0] for row in MediaAsset.query.with_entities(MediaAsset.url_hash)
+            .filter(MediaAsset.url_hash.in_(list(items))).all()
+        }
+        new_hashes = [url_hash for url_hash in items if url_hash not in known]
+        if new_hashes:
+            db.session.execute(MediaAsset.__table__.insert(), [
+                {'url': items[url_hash][1], 'url_hash': url_hash, 'media_type': items[url_hash][0],
+                 'status': 'pending', 'article_count': 1}
+                for url_hash in new_hashes
+            ])
+        if known:
+            db.session.execute(
+                MediaAsset.__table__.update()
+                .where(MediaAsset.__table__.c.url_hash.in_(known))
+                .values(article_count=MediaAsset.__table__.c.article_count + 1)
+            )
+        db.session.execute(ExtractedMedia.__table__.insert(), [
+            {'article_id': article_id, 'media_type': media_type, 'url': url, 'url_hash': url_hash, 'status': 'pending'}
+            for url_hash, (media_type, url) in items.items()
+        ])
+        logger.debug(f"Article {article_id}: {len(items)} media recorded, {len(new_hashes)} new.")
+        return len(new_hashes)
+
+    def get_assets(self, urls: list) -> dict:
+        """Returns {url: MediaAsset} for the URLs already indexed."""
+        hashes = {hash_url(url): url for url in dict.fromkeys(urls)}
+        if not hashes:
+            return {}
+        assets = MediaAsset.query.filter(MediaAsset.url_hash.in_(list(hashes))).all()
+        return {hashes[asset.url_hash]: asset for asset in assets}
+
+    def get_uploaded_media_id(self, url: str) -> int | None:
+        """Returns the WordPress media ID of a URL already uploaded, if any."""
+        asset = self.get_assets([url]).get(url)
+        if asset and asset.status == 'uploaded':
+            return asset.wordpress_media_id
+        return None
+
+    def mark_uploaded(self, url: str, wordpress_media_id: int, hosted_url: str = None):
+        """Stores the upload result of a media URL (in the caller's transaction)."""
+        asset = self.get_assets([url]).get(url)
+        if asset is None:
+            asset = MediaAsset(url=url[:1024], url_hash=hash_url(url), media_type='image', article_count=1)
+            db.session.add(asset)
+        asset.status = 'uploaded'
+        asset.wordpress_media_id = wordpress_media_id
+        asset.hosted_url = hosted_url
+        ExtractedMedia.query.filter_by(url_hash=asset.url_hash).update({'status': 'uploaded'})
+
+    def get_stats(self) -> dict:
+        return {
+            'assets': MediaAsset.query.count(),
+            'uploaded': MediaAsset.query.filter_by(status='uploaded').count(),
+            'references': ExtractedMedia.query.count(),
+        }
@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+from config import POLITENESS_CONFIG, RSS_FEEDS
+
+logger = logging.getLogger(__name__)
+
+class HostCooldownError(requests.RequestException):
+    """A host asked us to back off for longer than POLITENESS_CONFIG['max_wait_seconds']."""
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Returns the delay in seconds of a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def host_limits_from_feeds(feeds: dict = None) -> dict:
+    """
+    Returns host -> limits for every host in RSS_FEEDS. A feed's 'rate_limit' overrides the
+    defaults for its host; when feeds of the same host disagree the lowest value wins.
+    """
+    overrides = {}
+    for feed in (feeds if feeds is not None else RSS_FEEDS).values():
+        for url in feed.get('urls', []):
+            host = urlparse(url).netloc.lower()
+            host_overrides = overrides.setdefault(host, {})
+            for key, value in (feed.get('rate_limit') or {}).items():
+                host_overrides[key] = min(host_overrides.get(key, value), value)
+    return {host: dict(POLITENESS_CONFIG['default_limits'], **values) for host, values in overrides.items()}
+
+class _HostState:
+    def __init__(self, host: str, limits: dict):
+        self.host = host
+        self.rate_limit = float(limits['requests_per_second'])
+        self.rate = self.rate_limit
+        self.burst = max(1, int(limits['burst']))
+        self.max_concurrency = max(1, int(limits['max_concurrency']))
+        self.concurrency = min(self.max_concurrency, POLITENESS_CONFIG.get('initial_concurrency', 2))
+        self.tokens = float(self.burst)
+        self.refilled_at = time.monotonic()
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.error_rate = 0.0  # EWMA of failed responses
+        self.successes = 0  # Consecutive successes since the last adjustment
+        self.stats = {'requests': 0, 'throttled': 0, 'errors': 0, 'wait_seconds': 0.0}
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def decrease(self):
+        """Multiplicative decrease of the concurrency and the request rate."""
+        self.concurrency = max(1, self.concurrency // 2)
+        self.rate = max(self.rate_limit / 10, self.rate / 2)
+        self.successes = 0
+        self.error_rate = 0.0  # Measure again at the new level
+
+    def increase(self):
+        """Additive increase, back towards the configured limits."""
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        self.rate = min(self.rate_limit, self.rate + self.rate_limit / 10)
+        self.successes = 0
+
+class HostPoliteness:
+    """
+    Per-host politeness for the source sites, used by HttpClient for the hosts in RSS_FEEDS.
+
+    Each host has a token bucket (requests_per_second, burst) and a concurrency limit. 429,
+    403 and 503 responses pause the host for the Retry-After delay (or a default cooldown)
+    and halve its concurrency and rate; a high error rate does the same. After a run of
+    successes both grow back towards the configured limits (AIMD). The concurrency limit
+    covers the time until the response headers arrive.
+    """
+
+    def __init__(self, limits: dict = None):
+        self._limits = {host.lower(): value for host, value in (limits if limits is not None else host_limits_from_feeds()).items()}
+        self._states = {}
+        self._cond = threading.Condition()
+
+    def hosts(self) -> list:
+        """The hosts with politeness limits (from RSS_FEEDS unless limits were given)."""
+        return list(self._limits)
+
+    def manages(self, host: str) -> bool:
+        return POLITENESS_CONFIG.get('enabled', True) and host.lower() in self._limits
+
+    def acquire(self, host: str):
+        """Blocks until a request to `host` is allowed. Raises HostCooldownError for long cooldowns."""
+        max_wait = POLITENESS_CONFIG.get('max_wait_seconds', 30)
+        start = time.monotonic()
+        with self._cond:
+            state = self._state(host)
+            while True:
+                now = time.monotonic()
+                state.refill(now)
+                cooldown = state.cooldown_until - now
+                if cooldown > max_wait:
+                    raise HostCooldownError(f"{host} asked us to back off for another {cooldown:.0f}s")
+                if cooldown > 0:
+                    wait = cooldown
+                elif state.in_flight >= state.concurrency:
+                    wait = 1.0  # Woken up earlier by release()
+                elif state.tokens < 1:
+                    wait = (1 - state.tokens) / state.rate
+                else:
+                    state.tokens -= 1
+                    state.in_flight += 1
+                    state.stats['requests'] += 1
+                    state.stats['wait_seconds'] += now - start
+                    return
+                self._cond.wait(wait)
+
+    def release(self, host: str, status_code: int = None, retry_after: str = None, error: bool = False):
+        """Records the outcome of a request started with acquire() and adapts the host's limits."""
+        throttled = status_code in POLITENESS_CONFIG.get('throttle_statuses', [403, 429, 503])
+        failed = throttled or error or (status_code or 0) >= 500
+        with self._cond:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            state.error_rate = 0.9 * state.error_rate + 0.1 * failed
+            threshold = POLITENESS_CONFIG.get('error_rate_threshold', 0.2)
+
+            if throttled:
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = POLITENESS_CONFIG.get('default_cooldown_seconds', 60)
+                delay = min(delay, POLITENESS_CONFIG.get('max_cooldown_seconds', 900))
+                state.cooldown_until = max(state.cooldown_until, time.monotonic() + delay)
+                state.stats['throttled'] += 1
+                state.decrease()
+                logger.warning(
+                    f"{host} answered {status_code}. Pausing it for {delay:.0f}s; "
+                    f"concurrency {state.concurrency}, {state.rate:.2f} req/s from now on."
+                )
+            elif failed:
+                state.stats['errors'] += 1
+                state.successes = 0
+                if state.error_rate > threshold:
+                    state.decrease()
+                    logger.warning(f"Error rate of {host} above {threshold:.0%}. Concurrency {state.concurrency}, {state.rate:.2f} req/s.")
+            else:
+                state.successes += 1
+                if state.successes >= POLITENESS_CONFIG.get('increase_after', 20) and state.error_rate < threshold / 2:
+                    state.increase()
+            self._cond.notify_all()
+
+    def get_status(self) -> dict:
+        now = time.monotonic()
+        with self._cond:
+            return {
+                host: {
+                    'concurrency': state.concurrency,
+                    'max_concurrency': state.max_concurrency,
+                    'requests_per_second': round(state.rate, 3),
+                    'max_requests_per_second': state.rate_limit,
+                    'in_flight': state.in_flight,
+                    'cooldown_seconds': round(max(0.0, state.cooldown_until - now), 1),
+                    'error_rate': round(state.error_rate, 3),
+                    'requests': state.stats['requests'],
+                    'throttled': state.stats['throttled'],
+                    'errors': state.stats['errors'],
+                    'wait_seconds': round(state.stats['wait_seconds'], 1),
+                }
+                for host, state in self._states.items()
+            }
+
+    def _state(self, host: str) -> _HostState:
+        host = host.lower()
+        state = self._states.get(host)
+        if state is None:
+            state = self._states[host] = _HostState(host, self._limits.get(host, POLITENESS_CONFIG['default_limits']))
+        return state
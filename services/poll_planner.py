@@ -0,0 +1,97 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from extensions import db
+from models import FeedCadence
+from config import ADAPTIVE_POLLING_CONFIG, SCHEDULE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class AdaptivePollPlanner:
+    """
+    Learns how often each feed key publishes and decides when it should be polled again.
+    Busy feeds are polled more often and quiet ones less often, always within the configured
+    minimum and maximum interval, with per-hour multipliers for the busiest times of the day.
+    """
+
+    def __init__(self, tz):
+        self.tz = tz
+
+    def due_feeds(self, feed_keys: list, now: datetime = None) -> list:
+        """Returns the feed keys (in the given order) whose next poll time has been reached."""
+        now = now or datetime.utcnow()
+        cadences = {c.feed_key: c for c in FeedCadence.query.filter(FeedCadence.feed_key.in_(feed_keys)).all()}
+        return [
+            feed_key for feed_key in feed_keys
+            if feed_key not in cadences or not cadences[feed_key].next_poll_at or cadences[feed_key].next_poll_at <= now
+        ]
+
+    def record_poll(self, feed_key: str, published_times: list, now: datetime = None):
+        """
+        Updates the publish rate of a feed with the publish times of the entries read in a poll
+        (every entry of the feed, not only the ones selected for processing) and schedules its
+        next poll. Times not newer than the last entry seen are ignored.
+        """
+        now = now or datetime.utcnow()
+        cadence = FeedCadence.query.filter_by(feed_key=feed_key).first()
+        if cadence is None:
+            cadence = FeedCadence(feed_key=feed_key, samples=0)
+            db.session.add(cadence)
+
+        alpha = ADAPTIVE_POLLING_CONFIG.get('ewma_alpha', 0.3)
+        for published_at in sorted(t for t in published_times if t):
+            if cadence.last_entry_at and published_at > cadence.last_entry_at:
+                gap = (published_at - cadence.last_entry_at).total_seconds()
+                if cadence.avg_interarrival_seconds is None:
+                    cadence.avg_interarrival_seconds = gap
+                else:
+                    cadence.avg_interarrival_seconds = alpha * gap + (1 - alpha) * cadence.avg_interarrival_seconds
+                cadence.samples = (cadence.samples or 0) + 1
+            if not cadence.last_entry_at or published_at > cadence.last_entry_at:
+                cadence.last_entry_at = published_at
+
+        cadence.interval_minutes = self._compute_interval(cadence, now)
+        cadence.last_polled_at = now
+        cadence.next_poll_at = now + timedelta(minutes=cadence.interval_minutes)
+        db.session.commit()
+        logger.debug(f"[{feed_key}] Próxima consulta em {cadence.interval_minutes:.1f} min.")
+
+    def _compute_interval(self, cadence: FeedCadence, now: datetime) -> float:
+        """Returns the polling interval in minutes for a feed at the given (UTC) time."""
+        min_interval = ADAPTIVE_POLLING_CONFIG.get('min_interval', 5)
+        max_interval = ADAPTIVE_POLLING_CONFIG.get('max_interval', 60)
+
+        if cadence.avg_interarrival_seconds is None:
+            interval = SCHEDULE_CONFIG.get('check_interval', 15)
+        else:
+            interval = cadence.avg_interarrival_seconds / 60 / ADAPTIVE_POLLING_CONFIG.get('polls_per_arrival', 2)
+            # A feed that has been silent for much longer than its average is probably in a quiet
+            # period (e.g. overnight); back off gradually instead of polling at the busy rate.
+            if cadence.last_entry_at:
+                silence = (now - cadence.last_entry_at).total_seconds()
+                if silence > 2 * cadence.avg_interarrival_seconds:
+                    interval *= silence / (2 * cadence.avg_interarrival_seconds)
+
+        interval *= self._hour_factor(now)
+        return max(min_interval, min(max_interval, interval))
+
+    def _hour_factor(self, now: datetime) -> float:
+        local_hour = now.replace(tzinfo=timezone.utc).astimezone(self.tz).hour
+        for boost in ADAPTIVE_POLLING_CONFIG.get('hour_boosts', []):
+            if boost['start'] <= local_hour < boost['end']:
+                return boost['factor']
+        return 1.0
+
+    def get_status(self) -> list:
+        """Returns the learned cadence of every feed key."""
+        return [
+            {
+                'feed_key': c.feed_key,
+                'avg_interarrival_minutes': round(c.avg_interarrival_seconds / 60, 1) if c.avg_interarrival_seconds else None,
+                'samples': c.samples or 0,
+                'interval_minutes': round(c.interval_minutes, 1) if c.interval_minutes else None,
+                'last_entry_at': c.last_entry_at.isoformat() if c.last_entry_at else None,
+                'next_poll_at': c.next_poll_at.isoformat() if c.next_poll_at else None,
+            }
+            for c in FeedCadence.query.order_by(FeedCadence.feed_key).all()
+        ]
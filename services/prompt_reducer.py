@@ -0,0 +1,159 @@
+import html
+import logging
+import re
+
+import lxml.html
+from lxml.etree import ParserError
+
+from config import PROMPT_REDUCTION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Lines of interface text that the Valnet templates (Screen Rant, CBR, Collider, Game Rant, ...)
+# leave in the extracted text: follow/newsletter widgets, related links, image credits.
+_VALNET_BOILERPLATE_LINES = re.compile(
+    r'^(?:'
+    r'related(?: posts?| articles?)?(?::.*)?'
+    r'|(?:read|see|watch) (?:more|next|also):.*'
+    r'|sign up for (?:our|the) .*newsletter.*'
+    r'|subscribe to (?:our|the) .*newsletter.*'
+    r'|by subscribing, you agree to .*'
+    r'|your changes have been saved'
+    r'|email is sent'
+    r'|please verify your email address\.?'
+    r'|you\'ve reached your account maximum for followed topics\.?'
+    r'|manage your list'
+    r'|follow(?:ed)?'
+    r'|like'
+    r'|thread'
+    r'|log in'
+    r'|close'
+    r'|credit: .*'
+    r'|image via .*'
+    r'|source: .*'
+    r')$',
+    re.IGNORECASE
+)
+
+# Blocks of the Valnet templates that never carry article content (matched against the class attribute)
+_VALNET_BOILERPLATE_CLASSES = (
+    'related', 'display-card', 'newsletter', 'w-follow', 'article-tags', 'social', 'share',
+    'ad-zone', 'affiliate', 'sidebar', 'next-article', 'comments', 'author-box', 'breadcrumbs',
+)
+_BOILERPLATE_TAGS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'button', 'svg')
+_BLOCK_TAGS = ('h1', 'h2', 'h3', 'h4', 'p', 'ul', 'ol', 'blockquote', 'figure', 'table', 'iframe')
+_KEPT_ATTRIBUTES = {'a': ('href',), 'img': ('src', 'alt'), 'iframe': ('src', 'frameborder', 'allowfullscreen'), 'blockquote': ('class',)}
+_HEADING_RE = re.compile(r'^<h[1-4][\s>]', re.IGNORECASE)
+_EMBED_RE = re.compile(r'<iframe|twitter-tweet', re.IGNORECASE)
+_WORD_RE = re.compile(r'\w+')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+def estimate_tokens(text: str) -> int:
+    """Fast token estimate (~4 characters per token), good enough for budgeting prompts."""
+    return (len(text or '') + 3) // 4
+
+def estimate_visible_tokens(content: str) -> int:
+    """Token estimate of the text a reader sees, ignoring HTML tags and attributes."""
+    return estimate_tokens(html.unescape(_TAG_RE.sub('', content or '')))
+
+class PromptReducer:
+    """
+    Shrinks the extracted content before it goes into UNIVERSAL_PROMPT: removes the Valnet
+    template blocks and attribute noise, then, if the content is still over the category's
+    token budget, drops the lowest-value blocks (short and late in the article) first.
+    The budget is measured on the visible text, so markup never costs article text.
+    The lead paragraphs, headings and YouTube/Twitter embeds are always kept.
+    """
+
+    def reduce(self, content: str, category: str, source_url: str = '') -> str:
+        if not PROMPT_REDUCTION_CONFIG.get('enabled', False) or not content:
+            return content or ''
+
+        tokens_before = estimate_visible_tokens(content)
+        is_html = bool(re.search(r'<(?:p|div|h[1-6]|ul|figure|iframe|blockquote|section|article)[\s>]', content, re.IGNORECASE))
+        blocks = self._html_blocks(content) if is_html else self._text_blocks(content)
+        budget = PROMPT_REDUCTION_CONFIG.get('token_budget', {}).get(category, PROMPT_REDUCTION_CONFIG.get('default_token_budget', 2500))
+        blocks = self._fit_budget(blocks, budget)
+        reduced = '\n'.join(blocks)
+
+        tokens_after = estimate_visible_tokens(reduced)
+        logger.info(
+            f"Prompt reduction for {source_url or 'article'}: ~{tokens_before} -> ~{tokens_after} text tokens "
+            f"(saved ~{tokens_before - tokens_after}, budget {budget})."
+        )
+        return reduced
+
+    def _text_blocks(self, content: str) -> list:
+        lines = (line.strip() for line in content.splitlines())
+        return [line for line in lines if line and not _VALNET_BOILERPLATE_LINES.match(line)]
+
+    def _html_blocks(self, content: str) -> list:
+        try:
+            root = lxml.html.fragment_fromstring(content, create_parent='div')
+        except ParserError:
+            return self._text_blocks(content)
+
+        for element in list(root.iter(*_BOILERPLATE_TAGS)):
+            self._drop(element)
+        for element in list(root.iter()):
+            if element.getparent() is None or not isinstance(element.tag, str):
+                continue
+            classes = element.get('class', '').lower()
+            if any(name in classes for name in _VALNET_BOILERPLATE_CLASSES) and 'twitter-tweet' not in classes:
+                self._drop(element)
+
+        blocks = []
+        for element in root.iter(*_BLOCK_TAGS):
+            # Only the outermost blocks; nested ones are serialized with their parent
+            if any(ancestor.tag in _BLOCK_TAGS for ancestor in element.iterancestors()):
+                continue
+            for child in element.iter():
+                if isinstance(child.tag, str):
+                    kept = _KEPT_ATTRIBUTES.get(child.tag, ())
+                    for name in list(child.attrib):
+                        if name not in kept:
+                            del child.attrib[name]
+            text = element.text_content().strip()
+            if element.tag in ('p', 'li') and _VALNET_BOILERPLATE_LINES.match(text):
+                continue
+            if text or element.tag in ('figure', 'iframe') or _EMBED_RE.search(lxml.html.tostring(element, encoding='unicode')):
+                blocks.append(lxml.html.tostring(element, encoding='unicode', with_tail=False))
+
+        if not blocks:
+            text = root.text_content()
+            return self._text_blocks(text)
+        return blocks
+
+    def _drop(self, element):
+        parent = element.getparent()
+        if parent is not None:
+            element.drop_tree()
+
+    def _fit_budget(self, blocks: list, budget: int) -> list:
+        """Removes the lowest-value blocks until the visible text fits the budget, keeping the order."""
+        sizes = [estimate_visible_tokens(block) for block in blocks]
+        total = sum(sizes)
+        if total <= budget:
+            return blocks
+
+        keep_leading = PROMPT_REDUCTION_CONFIG.get('keep_leading_blocks', 2)
+        candidates = []
+        paragraphs_seen = 0
+        for index, block in enumerate(blocks):
+            if _HEADING_RE.match(block) or _EMBED_RE.search(block) or block.startswith('<figure'):
+                continue
+            paragraphs_seen += 1
+            if paragraphs_seen <= keep_leading:
+                continue
+            words = len(_WORD_RE.findall(block))
+            # Earlier and longer paragraphs carry more of the story
+            position_weight = 1.0 - 0.5 * index / len(blocks)
+            candidates.append((words * position_weight, index))
+
+        removed = set()
+        for _, index in sorted(candidates):
+            if total <= budget:
+                break
+            total -= sizes[index]
+            removed.add(index)
+        return [block for index, block in enumerate(blocks) if index not in removed]
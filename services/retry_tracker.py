@@ -0,0 +1,86 @@
+import logging
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import Article, ArticleAttempt
+from config import RETRY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class RetryTracker:
+    """
+    Remembers articles that failed mid-pipeline so they are not fetched and sent to the AI
+    again on every cycle. Each failure pushes the next attempt further away (exponential
+    backoff); after RETRY_CONFIG['max_retries'] the article is stored as 'failed' for good.
+
+    Pending articles are excluded from feed discovery and come back through due_attempts(),
+    since the feed's validators and high-water mark may no longer surface them.
+    """
+
+    def record_failure(self, source_url: str, feed_key: str, stage: str, error: str, now: datetime = None):
+        """Records a failed attempt at the given stage (extraction, ai, json or db)."""
+        now = now or datetime.utcnow()
+        try:
+            attempt = ArticleAttempt.query.filter_by(source_url=source_url).first()
+            if attempt is None:
+                attempt = ArticleAttempt(source_url=source_url, retry_count=0)
+                db.session.add(attempt)
+            attempt.feed_key = feed_key
+            attempt.stage = stage
+            attempt.last_error = (error or '')[:2000]
+            attempt.last_attempt_at = now
+            attempt.retry_count = (attempt.retry_count or 0) + 1
+
+            if attempt.retry_count > RETRY_CONFIG.get('max_retries', 4):
+                db.session.delete(attempt)
+                db.session.add(Article(
+                    source_url=source_url,
+                    status='failed',
+                    feed_type=feed_key,
+                    error_message=f"Gave up after {attempt.retry_count} attempts ({stage}): {attempt.last_error}"
+                ))
+                logger.warning(f"Article {source_url} failed {attempt.retry_count} times (last at '{stage}'). Giving up.")
+            else:
+                delay = min(
+                    RETRY_CONFIG.get('base_delay_minutes', 30) * 2 ** (attempt.retry_count - 1),
+                    RETRY_CONFIG.get('max_delay_minutes', 720)
+                )
+                attempt.next_eligible_at = now + timedelta(minutes=delay)
+                logger.info(f"Article {source_url} failed at '{stage}' (attempt {attempt.retry_count}). Next attempt in {delay} min.")
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to record the failed attempt for {source_url}: {e}", exc_info=True)
+
+    def clear(self, source_url: str):
+        """Forgets the failed attempts of an article once it was processed or skipped."""
+        ArticleAttempt.query.filter_by(source_url=source_url).delete()
+        db.session.commit()
+
+    def pending_urls(self) -> list:
+        """Returns the URLs of every article waiting for a new attempt, due or not."""
+        return [row[0] for row in ArticleAttempt.query.with_entities(ArticleAttempt.source_url).all()]
+
+    def due_attempts(self, now: datetime = None) -> list[ArticleAttempt]:
+        """Returns the attempts whose backoff has expired, oldest first, up to max_per_cycle."""
+        now = now or datetime.utcnow()
+        return (
+            ArticleAttempt.query
+            .filter(ArticleAttempt.next_eligible_at <= now)
+            .order_by(ArticleAttempt.next_eligible_at)
+            .limit(RETRY_CONFIG.get('max_per_cycle', 3))
+            .all()
+        )
+
+    def get_status(self) -> list:
+        return [
+            {
+                'source_url': a.source_url,
+                'feed_key': a.feed_key,
+                'stage': a.stage,
+                'retry_count': a.retry_count or 0,
+                'last_error': a.last_error,
+                'next_eligible_at': a.next_eligible_at.isoformat() if a.next_eligible_at else None,
+            }
+            for a in ArticleAttempt.query.order_by(ArticleAttempt.next_eligible_at).all()
+        ]
@@ -1,23 +1,122 @@
+import hashlib
+import json
 import logging
+import threading
+import time
 import feedparser
 import requests
-from datetime import datetime, timedelta
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from xml.etree import ElementTree
+from xml.parsers.expat import ExpatError
+from xml.sax import SAXParseException
 from sqlalchemy import or_
 
 from extensions import db
-from models import Article
+from models import Article, FeedState
 from dto import ExtractedArticleDTO
-from config import USER_AGENT, SCHEDULE_CONFIG
+from services.url_index import KnownUrlIndex
+from services.http_client import get_http_client
+from config import USER_AGENT, SCHEDULE_CONFIG, RSS_MONITOR_CONFIG
 
 logger = logging.getLogger(__name__)
 
+_ATOM_NS = 'http://www.w3.org/2005/Atom'
+_ATOM_ENTRY = f'{{{_ATOM_NS}}}entry'
+
+def _percentile(sorted_values: list, percentile: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(percentile / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
 class RSSMonitor:
     """
     Monitors RSS feeds for new articles, checks for duplicates in the database,
     and handles feed parsing errors gracefully.
+    Uses conditional GETs (ETag/Last-Modified) and a body hash per feed URL to skip
+    downloading and parsing feeds that have not changed since the last cycle, and a
+    high-water mark to stop reading a changed feed at the first entry already consumed.
+    Each URL has a persisted health record; after repeated failures its circuit opens and
+    the URL is skipped with exponential backoff until a half-open probe succeeds.
     """
 
-    def fetch_new_articles(self, feed_key: str, urls: list, limit: int, existing_urls: set) -> list[ExtractedArticleDTO]:
+    def __init__(self):
+        self.cycle_stats = {}
+        self.cycle_published_times = {}  # feed_key -> publish times of every entry parsed this cycle
+        self._prefetched = {}
+
+    def start_cycle(self):
+        """Resets the per-cycle feed statistics. Called at the start of each automation cycle."""
+        self.cycle_stats = {}
+        self.cycle_published_times = {}
+        self._discard_prefetched()
+
+    def _discard_prefetched(self, urls=None):
+        """Closes and forgets prefetched responses that were not consumed (all of them when urls is None)."""
+        for url in list(self._prefetched if urls is None else urls):
+            response = self._prefetched.pop(url, None)
+            if isinstance(response, requests.Response):
+                response.close()
+
+    def prefetch_feeds(self, feed_urls: dict):
+        """
+        Downloads several feeds concurrently so that discovery latency is close to the slowest
+        single feed instead of the sum of all of them. Responses are kept in memory and consumed
+        by fetch_new_articles, which still does the parsing and deduplication sequentially.
+
+        Args:
+            feed_urls: A mapping of feed URL -> feed key, in the order the feeds will be processed.
+        """
+        if not feed_urls:
+            return
+
+        # Validators are read from the database on this thread; the workers only do network I/O.
+        # Feeds with an open circuit are not fetched at all.
+        now = datetime.utcnow()
+        requests_to_send = {}
+        for url, feed_key in feed_urls.items():
+            state = self._get_feed_state(feed_key, url)
+            if self._circuit_allows(state, now):
+                requests_to_send[url] = self._build_request_headers(state)
+        db.session.commit()
+        if not requests_to_send:
+            return
+
+        per_host_limit = RSS_MONITOR_CONFIG.get('per_host_limit', 2)
+        host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host_limit))
+        for url in requests_to_send:
+            host_slots[urlparse(url).netloc]  # Create every semaphore before the workers start
+
+        def fetch(url, headers):
+            # Any error is returned instead of raised, so one broken feed cannot abort the others.
+            # fetch_new_articles re-raises it on the main thread, where the failure is recorded.
+            with host_slots[urlparse(url).netloc]:
+                try:
+                    return self._request_feed(url, headers)
+                except requests.RequestException as e:
+                    return e
+                except Exception as e:
+                    logger.warning(f"Falha inesperada ao baixar o feed {url}: {e}", exc_info=True)
+                    return e
+
+        start = time.perf_counter()
+        max_workers = min(RSS_MONITOR_CONFIG.get('max_concurrent_fetches', 9), len(requests_to_send))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='feed-fetch') as executor:
+            futures = {url: executor.submit(fetch, url, headers) for url, headers in requests_to_send.items()}
+            for url, future in futures.items():
+                self._prefetched[url] = future.result()
+        logger.info(f"Descoberta: {len(futures)} feed(s) baixados em paralelo em {time.perf_counter() - start:.2f}s.")
+
+    def _request_feed(self, url: str, headers: dict) -> requests.Response:
+        """Performs the HTTP request for a feed. Safe to call from worker threads."""
+        return get_http_client().get(url, headers=headers, timeout=RSS_MONITOR_CONFIG.get('request_timeout', 15))
+
+    def fetch_new_articles(self, feed_key: str, urls: list, limit: int, existing_urls: KnownUrlIndex) -> list[ExtractedArticleDTO]:
         """
         Fetches new articles from a list of URLs for a given feed, avoiding duplicates.
 
@@ -25,7 +124,7 @@ class RSSMonitor:
             feed_key: The identifier for the feed source (e.g., 'screenrant_filmes_tv').
             urls: A list of RSS feed URLs to check.
             limit: The maximum number of new articles to fetch for this feed key.
-            existing_urls: A set of already known URLs to avoid reprocessing. The method will update this set.
+            existing_urls: The index of already known URLs to avoid reprocessing. The method will add the new URLs to it.
 
         Returns:
             A list of ExtractedArticleDTO objects for new articles.
@@ -39,48 +138,366 @@ class RSSMonitor:
                 break
 
             try:
-                # Fetch the feed content with requests to handle timeouts gracefully
-                response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=15)
-                response.raise_for_status()
-                
-                # Parse the fetched content
-                feed = feedparser.parse(response.content)
-
-                # Improved error handling for malformed feeds
-                if feed.bozo:
-                    # This specifically checks for XML format errors like "mismatched tag"
-                    if isinstance(feed.bozo_exception, (feedparser.expat.ExpatError, feedparser.sax.SAXParseException)):
-                        logger.warning(
-                            f"[{feed_key}] Ignorando feed malformado em {url}. "
-                            f"O provedor do feed parece ter um erro de XML. Detalhe: {feed.bozo_exception}"
-                        )
-                    else: # Log other types of "bozo" errors
-                        logger.warning(f"[{feed_key}] Problema de parsing no feed {url}. Detalhe: {feed.bozo_exception}")
-                    continue # Skip this faulty URL and move to the next one
-                
-                for entry in feed.entries:
+                state = self._get_feed_state(feed_key, url)
+                if not self._circuit_allows(state, datetime.utcnow()):
+                    self.cycle_stats[url] = {'feed_key': feed_key, 'result': 'circuit_open'}
+                    logger.info(f"[{feed_key}] Circuito aberto para {url} até {state.circuit_open_until}. Feed ignorado.")
+                    db.session.commit()
+                    continue
+
+                state.fetch_count = (state.fetch_count or 0) + 1
+                state.last_checked_at = datetime.utcnow()
+
+                # Use the response downloaded in the concurrent discovery phase when available,
+                # otherwise fetch the feed content with requests to handle timeouts gracefully
+                response = self._prefetched.pop(url, None)
+                if isinstance(response, Exception):
+                    raise response
+                if response is None:
+                    response = self._request_feed(url, self._build_request_headers(state))
+
+                if response.status_code != 304:
+                    response.raise_for_status()
+                self._record_latency(state, response)
+
+                if response.status_code == 304:
+                    self._record_success(state)
+                    self._record_cache_hit(state, 'not_modified', bytes_saved=state.last_body_size or 0)
+                    logger.info(f"[{feed_key}] Feed {url} não modificado (304). Parsing ignorado.")
+                    continue
+
+                body = response.content
+                body_hash = hashlib.sha256(body).hexdigest()
+                state.bytes_downloaded = (state.bytes_downloaded or 0) + len(body)
+
+                if RSS_MONITOR_CONFIG.get('conditional_get', True) and state.body_hash == body_hash:
+                    self._record_success(state)
+                    self._record_cache_hit(state, 'unchanged', bytes_downloaded=len(body))
+                    logger.info(f"[{feed_key}] Conteúdo do feed {url} inalterado (mesmo hash). Parsing ignorado.")
+                    continue
+
+                parse_start = time.perf_counter()
+                entries = None
+                result = 'parsed'
+
+                # Valnet feeds are newest-first: when a high-water mark exists, read the XML
+                # incrementally and stop at the mark instead of building the full feedparser result.
+                if state.hwm_guid or state.hwm_published:
+                    entries, mark_found = self._scan_until_mark(body, state)
+                    if mark_found:
+                        result = 'partial'
+                    else:
+                        logger.info(f"[{feed_key}] Marca d'água não encontrada em {url}. Fazendo leitura completa do feed.")
+                        entries = None
+
+                if entries is None:
+                    # Parse the fetched content
+                    feed = feedparser.parse(body)
+
+                    # Improved error handling for malformed feeds
+                    if feed.bozo:
+                        self.cycle_stats[url] = {'feed_key': feed_key, 'result': 'error'}
+                        # This specifically checks for XML format errors like "mismatched tag"
+                        if isinstance(feed.bozo_exception, (ExpatError, SAXParseException)):
+                            logger.warning(
+                                f"[{feed_key}] Ignorando feed malformado em {url}. "
+                                f"O provedor do feed parece ter um erro de XML. Detalhe: {feed.bozo_exception}"
+                            )
+                        else: # Log other types of "bozo" errors
+                            logger.warning(f"[{feed_key}] Problema de parsing no feed {url}. Detalhe: {feed.bozo_exception}")
+                        self._record_failure(feed_key, url, f"Bozo feed: {feed.bozo_exception}", bozo=True)
+                        continue # Skip this faulty URL and move to the next one
+
+                    entries = [
+                        {
+                            'link': entry.link,
+                            'title': entry.get('title', ''),
+                            'guid': entry.get('id') or entry.link,
+                            'published_at': self._entry_published_at(entry)
+                        }
+                        for entry in feed.entries if hasattr(entry, 'link')
+                    ]
+
+                parse_ms = (time.perf_counter() - parse_start) * 1000
+                self.cycle_stats[url] = {
+                    'feed_key': feed_key, 'result': result, 'bytes_downloaded': len(body),
+                    'bytes_saved': 0, 'parse_ms': parse_ms, 'parse_ms_saved': 0.0, 'entries': len(entries)
+                }
+
+                # Every entry read, regardless of the limit and of deduplication, for the poll planner
+                self.cycle_published_times.setdefault(feed_key, []).extend(entry['published_at'] for entry in entries if entry['published_at'])
+
+                # Check every link of the feed against the known URLs in one batch
+                unknown_links = set(existing_urls.unknown([entry['link'] for entry in entries]))
+
+                found_new = False
+                for entry in entries:
                     if len(new_articles) >= limit:
                         break
-                    
-                    if hasattr(entry, 'link') and entry.link not in existing_urls:
-                        logger.info(f"[{feed_key}] Novo artigo encontrado: {entry.title}")
-                        dto = ExtractedArticleDTO(source_url=entry.link)
+
+                    if entry['link'] in unknown_links:
+                        logger.info(f"[{feed_key}] Novo artigo encontrado: {entry['title']}")
+                        dto = ExtractedArticleDTO(source_url=entry['link'], published_at=entry['published_at'])
                         new_articles.append(dto)
-                        existing_urls.add(entry.link) # Avoid processing duplicates in the same run
+                        existing_urls.add(entry['link']) # Avoid processing duplicates in the same run
+                        found_new = True
+
+                # Validators and the high-water mark are only stored once a response yields no new
+                # entries. A body that still had unprocessed entries (limit reached or articles that
+                # failed downstream) must be read again next cycle instead of being answered with a
+                # 304 or cut off at the mark.
+                if not found_new:
+                    state.etag = response.headers.get('ETag')
+                    state.last_modified = response.headers.get('Last-Modified')
+                    state.body_hash = body_hash
+                    if entries:
+                        state.hwm_guid = entries[0]['guid'][:1024]
+                        state.hwm_published = entries[0]['published_at']
+                state.last_body_size = len(body)
+                state.last_parse_ms = parse_ms
+                self._record_success(state)
+                db.session.commit()
 
             except requests.RequestException as e:
+                db.session.rollback()
+                self.cycle_stats[url] = {'feed_key': feed_key, 'result': 'error'}
                 logger.error(f"[{feed_key}] Failed to fetch feed content from {url}. Error: {e}")
+                self._record_failure(feed_key, url, str(e))
             except Exception as e:
+                db.session.rollback()
+                self.cycle_stats[url] = {'feed_key': feed_key, 'result': 'error'}
                 logger.error(f"[{feed_key}] Falha inesperada ao processar o feed {url}. Erro: {e}", exc_info=True)
+                self._record_failure(feed_key, url, str(e))
                 continue
 
+        # Responses of URLs skipped by the limit or by an open circuit are not kept until the next cycle
+        self._discard_prefetched(urls)
         return new_articles
 
+    def _scan_until_mark(self, body: bytes, state: FeedState) -> tuple[list[dict], bool]:
+        """
+        Reads feed items incrementally until the stored high-water mark is reached.
+
+        Returns:
+            The entries newer than the mark (newest first) and whether the mark was found.
+            If the mark is not found (it dropped out of the feed, or the XML is malformed),
+            the caller must fall back to a full parse.
+        """
+        parser = ElementTree.XMLPullParser(events=('end',))
+        entries = []
+        chunk_size = 16 * 1024
+        try:
+            for offset in range(0, len(body), chunk_size):
+                parser.feed(body[offset:offset + chunk_size])
+                for _, element in parser.read_events():
+                    if element.tag not in ('item', _ATOM_ENTRY):
+                        continue
+                    entry = self._item_fields(element)
+                    element.clear()
+                    if not entry['link']:
+                        continue
+                    if entry['guid'] == state.hwm_guid or (
+                        state.hwm_published and entry['published_at'] and entry['published_at'] < state.hwm_published
+                    ):
+                        return entries, True
+                    entries.append(entry)
+        except ElementTree.ParseError as e:
+            logger.debug(f"Leitura incremental de {state.feed_url} falhou ({e}); usando o feedparser.")
+        return entries, False
+
+    def _item_fields(self, element) -> dict:
+        """Extracts link, title, guid and publish time from an RSS <item> or Atom <entry> element."""
+        if element.tag == _ATOM_ENTRY:
+            link_element = element.find(f'{{{_ATOM_NS}}}link')
+            link = link_element.get('href') if link_element is not None else None
+            title = element.findtext(f'{{{_ATOM_NS}}}title', '')
+            guid = element.findtext(f'{{{_ATOM_NS}}}id')
+            published = element.findtext(f'{{{_ATOM_NS}}}published') or element.findtext(f'{{{_ATOM_NS}}}updated')
+            published_at = self._parse_date(published, iso=True)
+        else:
+            link = (element.findtext('link') or '').strip() or None
+            title = element.findtext('title', '')
+            guid = element.findtext('guid')
+            published_at = self._parse_date(element.findtext('pubDate'))
+        return {
+            'link': link,
+            'title': (title or '').strip(),
+            'guid': (guid or '').strip() or link,
+            'published_at': published_at
+        }
+
+    def _parse_date(self, value: str | None, iso: bool = False) -> datetime | None:
+        """Parses an RFC 822 (RSS) or ISO 8601 (Atom) date into a naive UTC datetime."""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.strip()) if iso else parsedate_to_datetime(value.strip())
+        except (TypeError, ValueError):
+            return None
+        if parsed.tzinfo:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    def _entry_published_at(self, entry) -> datetime | None:
+        """Returns the entry's publish time as a naive UTC datetime, if the feed provides one."""
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        return datetime(*parsed[:6]) if parsed else None
+
+    def _get_feed_state(self, feed_key: str, url: str) -> FeedState:
+        """Loads the persisted state for a feed URL, creating it on first use."""
+        state = FeedState.query.filter_by(feed_url=url).first()
+        if state is None:
+            state = FeedState(feed_url=url, feed_key=feed_key)
+            db.session.add(state)
+        return state
+
+    def _circuit_allows(self, state: FeedState, now: datetime) -> bool:
+        """
+        Returns whether a feed URL may be fetched now. An open circuit whose backoff has expired
+        moves to half-open and lets a single probe through.
+        """
+        if state.circuit_state != 'open':
+            return True
+        if state.circuit_open_until and now < state.circuit_open_until:
+            return False
+        state.circuit_state = 'half_open'
+        logger.info(f"[{state.feed_key}] Circuito de {state.feed_url} meio-aberto. Tentando uma requisição de teste.")
+        return True
+
+    def _record_latency(self, state: FeedState, response: requests.Response):
+        samples = json.loads(state.recent_latencies_ms or '[]')
+        samples.append(round(response.elapsed.total_seconds() * 1000, 1))
+        state.recent_latencies_ms = json.dumps(samples[-RSS_MONITOR_CONFIG.get('latency_samples', 50):])
+
+    def _record_success(self, state: FeedState):
+        if state.circuit_state != 'closed' and state.circuit_state is not None:
+            logger.info(f"[{state.feed_key}] Circuito de {state.feed_url} fechado novamente.")
+        state.circuit_state = 'closed'
+        state.circuit_open_until = None
+        state.consecutive_failures = 0
+        state.last_success_at = datetime.utcnow()
+
+    def _record_failure(self, feed_key: str, url: str, error: str, bozo: bool = False):
+        """Counts a failed fetch or parse and opens the circuit after repeated failures."""
+        try:
+            state = self._get_feed_state(feed_key, url)
+            state.consecutive_failures = (state.consecutive_failures or 0) + 1
+            state.failure_count = (state.failure_count or 0) + 1
+            if bozo:
+                state.bozo_count = (state.bozo_count or 0) + 1
+            state.last_error = error[:2000]
+            state.last_failure_at = datetime.utcnow()
+
+            threshold = RSS_MONITOR_CONFIG.get('circuit_failure_threshold', 3)
+            # A failed half-open probe reopens the circuit with a doubled backoff.
+            if state.circuit_state == 'half_open' or state.consecutive_failures >= threshold:
+                exponent = max(0, state.consecutive_failures - threshold)
+                backoff = min(
+                    RSS_MONITOR_CONFIG.get('circuit_base_backoff', 5) * 2 ** exponent,
+                    RSS_MONITOR_CONFIG.get('circuit_max_backoff', 240)
+                )
+                state.circuit_state = 'open'
+                state.circuit_open_until = datetime.utcnow() + timedelta(minutes=backoff)
+                logger.warning(
+                    f"[{feed_key}] Circuito aberto para {url} após {state.consecutive_failures} falha(s) seguidas. "
+                    f"Nova tentativa em {backoff} min."
+                )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[{feed_key}] Não foi possível registrar a falha do feed {url}: {e}")
+
+    def get_feed_health(self) -> list[dict]:
+        """Returns the health record and circuit state of every known feed URL."""
+        health = []
+        for state in FeedState.query.order_by(FeedState.feed_key, FeedState.feed_url).all():
+            latencies = sorted(json.loads(state.recent_latencies_ms or '[]'))
+            health.append({
+                'feed_key': state.feed_key,
+                'feed_url': state.feed_url,
+                'circuit_state': state.circuit_state or 'closed',
+                'circuit_open_until': state.circuit_open_until.isoformat() if state.circuit_open_until else None,
+                'consecutive_failures': state.consecutive_failures or 0,
+                'failure_count': state.failure_count or 0,
+                'bozo_count': state.bozo_count or 0,
+                'latency_p50_ms': _percentile(latencies, 50),
+                'latency_p95_ms': _percentile(latencies, 95),
+                'last_error': state.last_error,
+                'last_success_at': state.last_success_at.isoformat() if state.last_success_at else None,
+                'last_failure_at': state.last_failure_at.isoformat() if state.last_failure_at else None
+            })
+        return health
+
+    def _build_request_headers(self, state: FeedState) -> dict:
+        """Builds the request headers, adding conditional GET validators when available."""
+        headers = {'User-Agent': USER_AGENT}
+        if RSS_MONITOR_CONFIG.get('conditional_get', True):
+            if state.etag:
+                headers['If-None-Match'] = state.etag
+            if state.last_modified:
+                headers['If-Modified-Since'] = state.last_modified
+        return headers
+
+    def _record_cache_hit(self, state: FeedState, result: str, bytes_saved: int = 0, bytes_downloaded: int = 0):
+        """Updates the hit counters of a feed whose parsing was skipped and commits them."""
+        if result == 'not_modified':
+            state.not_modified_count = (state.not_modified_count or 0) + 1
+        else:
+            state.unchanged_count = (state.unchanged_count or 0) + 1
+        parse_ms_saved = state.last_parse_ms or 0.0
+        state.bytes_saved = (state.bytes_saved or 0) + bytes_saved
+        state.parse_ms_saved = (state.parse_ms_saved or 0.0) + parse_ms_saved
+        db.session.commit()
+
+        self.cycle_stats[state.feed_url] = {
+            'feed_key': state.feed_key, 'result': result, 'bytes_downloaded': bytes_downloaded,
+            'bytes_saved': bytes_saved, 'parse_ms': 0.0, 'parse_ms_saved': parse_ms_saved
+        }
+
+    def log_cycle_summary(self):
+        """Logs how many feeds were skipped in this cycle and the bytes and parse time saved."""
+        if not self.cycle_stats:
+            return
+        results = [stats['result'] for stats in self.cycle_stats.values()]
+        total = len(results)
+        hits = results.count('not_modified') + results.count('unchanged')
+        bytes_downloaded = sum(stats.get('bytes_downloaded', 0) for stats in self.cycle_stats.values())
+        bytes_saved = sum(stats.get('bytes_saved', 0) for stats in self.cycle_stats.values())
+        parse_ms = sum(stats.get('parse_ms', 0.0) for stats in self.cycle_stats.values())
+        parse_ms_saved = sum(stats.get('parse_ms_saved', 0.0) for stats in self.cycle_stats.values())
+        logger.info(
+            f"Feed cache: {hits}/{total} feeds skipped ({results.count('not_modified')} x 304, "
+            f"{results.count('unchanged')} unchanged, {results.count('partial')} read up to the high-water mark, "
+            f"{results.count('error')} errors, {results.count('circuit_open')} with open circuit). "
+            f"Downloaded {bytes_downloaded / 1024:.1f} KB, saved {bytes_saved / 1024:.1f} KB. "
+            f"Parse time {parse_ms:.1f} ms, saved {parse_ms_saved:.1f} ms."
+        )
+
+    def get_feed_cache_stats(self) -> list[dict]:
+        """Returns the lifetime cache hit rates of every known feed URL."""
+        stats = []
+        for state in FeedState.query.order_by(FeedState.feed_key, FeedState.feed_url).all():
+            fetches = state.fetch_count or 0
+            hits = (state.not_modified_count or 0) + (state.unchanged_count or 0)
+            stats.append({
+                'feed_key': state.feed_key,
+                'feed_url': state.feed_url,
+                'fetches': fetches,
+                'not_modified': state.not_modified_count or 0,
+                'unchanged': state.unchanged_count or 0,
+                'hit_rate': round(hits / fetches, 3) if fetches else 0.0,
+                'bytes_downloaded': state.bytes_downloaded or 0,
+                'bytes_saved': state.bytes_saved or 0,
+                'parse_ms_saved': round(state.parse_ms_saved or 0.0, 1),
+                'last_checked_at': state.last_checked_at.isoformat() if state.last_checked_at else None
+            })
+        return stats
+
     def cleanup_old_articles(self):
         """Removes old articles from the database to keep it clean."""
         cleanup_hours = SCHEDULE_CONFIG.get('cleanup_after_hours', 24)
         cutoff_date = datetime.utcnow() - timedelta(hours=cleanup_hours)
-        
+
         articles_to_delete = Article.query.filter(Article.created_at < cutoff_date).delete()
         db.session.commit()
         logger.info(f"Cleanup complete. Removed {articles_to_delete} articles older than {cleanup_hours} hours.")
\ No newline at end of file
@@ -1,6 +1,8 @@
 import logging
 import os
 import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from apscheduler.schedulers.background import BackgroundScheduler
 import time
 import re
@@ -9,6 +11,14 @@ from datetime import datetime, timedelta
 from pytz import timezone
 from urllib.parse import urlparse
 from services.rss_monitor import RSSMonitor
+from services.url_index import KnownUrlIndex
+from services.poll_planner import AdaptivePollPlanner
+from services.dedup import NearDuplicateDetector
+from services.websub import WebSubSubscriber
+from services.retry_tracker import RetryTracker
+from services.extraction_pool import ExtractionPool
+from services.prompt_reducer import PromptReducer
+from services.media_index import MediaIndex
 from services.ai_processor import AIProcessor
 from services.wordpress_publisher import WordPressPublisher
 from services.content_extractor import ContentExtractor
@@ -16,7 +26,7 @@ from services.schema_generator import SchemaGenerator
 from models import Article
 from extensions import db
 from dto import PublishedArticleDTO, FeaturedImageDTO, ExtractedArticleDTO
-from config import SCHEDULE_CONFIG, PIPELINE_CONFIG, UNIVERSAL_PROMPT, WORDPRESS_CONFIG, PIPELINE_ORDER, RSS_FEEDS
+from config import SCHEDULE_CONFIG, PIPELINE_CONFIG, UNIVERSAL_PROMPT, WORDPRESS_CONFIG, PIPELINE_ORDER, RSS_FEEDS, ADAPTIVE_POLLING_CONFIG, WEBSUB_CONFIG, EXTRACTION_POOL_CONFIG, AI_DISPATCH_CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -53,10 +63,22 @@ class ContentAutomationScheduler:
             logger.info(f"Scheduler persistence enabled using SQLAlchemyJobStore at {db_url}")
 
         self.rss_monitor = RSSMonitor()
+        self.known_urls = KnownUrlIndex()
+        # No modo adaptativo cada feed tem seu próprio intervalo, aprendido do ritmo de publicação.
+        self.poll_planner = AdaptivePollPlanner(self.scheduler.timezone) if ADAPTIVE_POLLING_CONFIG.get('enabled') else None
         self.ai_processor = AIProcessor()
         self.content_extractor = ContentExtractor()
+        # Com EXTRACTION_WORKERS > 0 as páginas são extraídas em processos separados antes do processamento
+        self.extraction_pool = ExtractionPool() if EXTRACTION_POOL_CONFIG.get('workers') else None
         self.schema_generator = SchemaGenerator()
+        self.prompt_reducer = PromptReducer()
+        self.duplicate_detector = NearDuplicateDetector()
+        self.retry_tracker = RetryTracker()
+        self.media_index = MediaIndex()
         self.wordpress_publisher = WordPressPublisher()
+        self.websub = WebSubSubscriber()
+        # Serializa o ciclo de polling e o processamento de entradas recebidas via WebSub
+        self._pipeline_lock = threading.Lock()
         self.is_running = False
 
     def start(self):
@@ -79,10 +101,18 @@ class ContentAutomationScheduler:
             # coalesce=True: Se várias execuções estiverem pendentes (ex: após a app ficar offline), agrupa em uma só.
             # max_instances=1: Garante que apenas uma instância deste job rode por vez.
             # misfire_grace_time: Tolerância em segundos para executar um job que perdeu seu horário.
+            # No modo adaptativo o job roda em intervalos curtos e só consulta os feeds vencidos.
+            # Com WebSub ativo, o polling é apenas uma rede de segurança e roda com menos frequência.
+            if self.poll_planner:
+                interval_minutes = ADAPTIVE_POLLING_CONFIG.get('tick_minutes', 5)
+            elif WEBSUB_CONFIG.get('enabled'):
+                interval_minutes = WEBSUB_CONFIG.get('safety_net_interval', 60)
+            else:
+                interval_minutes = SCHEDULE_CONFIG.get('check_interval', 15)
             self.scheduler.add_job(
                 func=self.automation_cycle,
                 trigger='interval',
-                minutes=SCHEDULE_CONFIG.get('check_interval', 15),
+                minutes=interval_minutes,
                 id='content_automation_cycle',
                 name='Content Automation Cycle',
                 replace_existing=True,
@@ -105,6 +135,20 @@ class ContentAutomationScheduler:
                 misfire_grace_time=300
             )
 
+            if WEBSUB_CONFIG.get('enabled'):
+                # Assina os feeds nos hubs e renova as assinaturas antes do fim do lease.
+                self.scheduler.add_job(
+                    func=self.websub_cycle,
+                    trigger='interval',
+                    hours=1,
+                    next_run_time=datetime.now(self.scheduler.timezone) + timedelta(seconds=10),
+                    id='websub_subscriptions',
+                    name='WebSub Subscriptions',
+                    replace_existing=True,
+                    coalesce=True,
+                    max_instances=1
+                )
+
             self.scheduler.start()
             self.is_running = True
             logger.info(f"Scheduler started with timezone: {self.scheduler.timezone}")
@@ -113,81 +157,260 @@ class ContentAutomationScheduler:
         """Stop the automation scheduler"""
         if self.is_running:
             self.scheduler.shutdown(wait=False)
+            if self.extraction_pool:
+                self.extraction_pool.close()
+            self.ai_processor.shutdown()
             self.is_running = False
             logger.info("Content automation scheduler stopped")
 
     def automation_cycle(self, limit: int = None):
         """
         Main automation cycle. Fetches, processes, and prepares articles for publishing.
-        Processes feeds sequentially based on the order defined in PIPELINE_ORDER.
+        Feeds are discovered concurrently, then processed sequentially based on the order
+        defined in PIPELINE_ORDER.
         """
-        with self.app.app_context():
+        with self.app.app_context(), self._pipeline_lock:
             try:
                 logger.info("=== Starting automation cycle ===")
+                self.rss_monitor.start_cycle()
                 
-                # Fetch all existing URLs ONCE at the beginning of the cycle for efficiency.
-                all_known_urls = {article.source_url for article in Article.query.with_entities(Article.source_url).all()}
-                logger.info(f"Initialized with {len(all_known_urls)} known URLs from the database.")
-
-                # Processa os feeds na ordem definida em PIPELINE_ORDER
-                for feed_key in PIPELINE_ORDER:
-                    if feed_key not in RSS_FEEDS:
-                        logger.warning(f"Feed key '{feed_key}' from PIPELINE_ORDER not found in RSS_FEEDS. Skipping.")
-                        continue
+                # Bring the known URL index up to date with the articles saved since the last cycle.
+                self.known_urls.refresh()
+                # Articles that failed earlier come back through their retry schedule, not the feeds.
+                self.known_urls.exclude(self.retry_tracker.pending_urls())
+
+                # Discovery phase: all feeds are downloaded concurrently, then parsed and
+                # deduplicated in the deterministic order defined in PIPELINE_ORDER.
+                discovered = self._add_due_retries(self.discover_articles(self.known_urls))
+                pre_extracted = self.pre_extract_articles(discovered) if self.extraction_pool else {}
+
+                # Processing phase
+                if AI_DISPATCH_CONFIG.get('max_concurrent_prompts', 1) > 1:
+                    self.process_articles_concurrently(discovered, pre_extracted)
+                else:
+                    for feed_key, category, articles_to_process in discovered:
+                        logger.info(f"--- Starting processing for feed: {feed_key} (Category: {category}) ---")
+
+                        for article_data in articles_to_process:
+                            if article_data.source_url in pre_extracted and pre_extracted[article_data.source_url] is None:
+                                continue  # Extraction failed in the pool; the failure is already recorded
+                            # Os limites por minuto da API são respeitados pelo AIProcessor, chave a chave
+                            self.process_single_article(article_data, category, feed_key, pre_extracted.get(article_data.source_url))
+
+                        logger.info(f"--- Finished processing for feed: {feed_key} ---")
+
+                self.known_urls.save()
+                self.rss_monitor.log_cycle_summary()
+                logger.info("=== Automation cycle completed. ===")
 
-                    feed_config = RSS_FEEDS[feed_key]
-                    category = feed_config.get('category')
-                    if not category:
-                        logger.warning(f"Feed '{feed_key}' has no category defined. Skipping.")
-                        continue
-                    
-                    logger.info(f"--- Starting processing for feed: {feed_key} (Category: {category}) ---")
-
-                    # Step 1: Fetch new articles for the current feed
-                    articles_to_process = self.rss_monitor.fetch_new_articles(
-                        feed_key=feed_key,
-                        urls=feed_config['urls'],
-                        limit=SCHEDULE_CONFIG.get('max_articles_per_feed', 3),
-                        existing_urls=all_known_urls
-                    )
-                    logger.info(f"Found {len(articles_to_process)} new articles from {feed_key}.")
-
-                    if not articles_to_process:
-                        logger.info(f"--- No new articles for feed: {feed_key}. Moving to next. ---")
-                        continue
+            except Exception as e:
+                logger.error(f"Error in automation cycle: {str(e)}", exc_info=True)
 
-                    for article_data in articles_to_process:
-                        self.process_single_article(article_data, category, feed_key)
-                        # Adiciona uma pausa para evitar atingir os limites de taxa da API por minuto.
-                        delay = SCHEDULE_CONFIG.get('api_call_delay', 20)
-                        logger.debug(f"Aguardando {delay} segundos antes do próximo artigo...")
-                        time.sleep(delay)
-                    
-                    logger.info(f"--- Finished processing for feed: {feed_key} ---")
+    def discover_articles(self, known_urls: KnownUrlIndex) -> list[tuple[str, str, list[ExtractedArticleDTO]]]:
+        """
+        Finds new articles in every feed of PIPELINE_ORDER before any processing starts.
+        Feed downloads run concurrently; parsing and deduplication run in PIPELINE_ORDER so
+        the result is deterministic regardless of which host answers first.
 
-                logger.info("=== Automation cycle completed. ===")
+        Returns:
+            A list of (feed_key, category, articles) tuples in PIPELINE_ORDER, containing only
+            feeds with new articles.
+        """
+        feeds = []
+        for feed_key in PIPELINE_ORDER:
+            if feed_key not in RSS_FEEDS:
+                logger.warning(f"Feed key '{feed_key}' from PIPELINE_ORDER not found in RSS_FEEDS. Skipping.")
+                continue
+
+            feed_config = RSS_FEEDS[feed_key]
+            category = feed_config.get('category')
+            if not category:
+                logger.warning(f"Feed '{feed_key}' has no category defined. Skipping.")
+                continue
+            feeds.append((feed_key, category, feed_config['urls']))
+
+        if self.poll_planner:
+            due = set(self.poll_planner.due_feeds([feed_key for feed_key, _, _ in feeds]))
+            logger.info(f"Adaptive polling: {len(due)}/{len(feeds)} feed(s) due in this cycle.")
+            feeds = [feed for feed in feeds if feed[0] in due]
+
+        self.rss_monitor.prefetch_feeds({url: feed_key for feed_key, _, urls in feeds for url in urls})
+
+        discovered = []
+        for feed_key, category, urls in feeds:
+            articles = self.rss_monitor.fetch_new_articles(
+                feed_key=feed_key,
+                urls=urls,
+                limit=SCHEDULE_CONFIG.get('max_articles_per_feed', 3),
+                existing_urls=known_urls
+            )
+            logger.info(f"Found {len(articles)} new articles from {feed_key}.")
+            if self.poll_planner:
+                # The publish rate comes from every entry of the feed, not only the ones kept by the limit
+                self.poll_planner.record_poll(feed_key, self.rss_monitor.cycle_published_times.get(feed_key, []))
+            if articles:
+                discovered.append((feed_key, category, articles))
+
+        total = sum(len(articles) for _, _, articles in discovered)
+        logger.info(f"Discovery finished: {total} new articles in {len(discovered)} feed(s).")
+        return discovered
+
+    def _add_due_retries(self, discovered: list) -> list:
+        """Adds the failed articles whose backoff has expired to their feeds, keeping PIPELINE_ORDER."""
+        due = self.retry_tracker.due_attempts()
+        if not due:
+            return discovered
+
+        by_feed = {feed_key: (category, list(articles)) for feed_key, category, articles in discovered}
+        for attempt in due:
+            category = RSS_FEEDS.get(attempt.feed_key, {}).get('category')
+            if not category:
+                logger.warning(f"Retry of {attempt.source_url} belongs to unknown feed '{attempt.feed_key}'. Skipping.")
+                continue
+            by_feed.setdefault(attempt.feed_key, (category, []))[1].append(ExtractedArticleDTO(source_url=attempt.source_url))
+        logger.info(f"Retrying {len(due)} previously failed article(s).")
+
+        order = [feed_key for feed_key in PIPELINE_ORDER if feed_key in by_feed]
+        order += [feed_key for feed_key in by_feed if feed_key not in order]
+        return [(feed_key, by_feed[feed_key][0], by_feed[feed_key][1]) for feed_key in order]
+
+    def pre_extract_articles(self, discovered: list) -> dict:
+        """
+        Downloads and extracts every discovered article up front, using all the workers of
+        the extraction pool. Returns source URL -> extracted data, or None if it failed.
+        """
+        urls = [(article.source_url, feed_key) for feed_key, _, articles in discovered for article in articles]
+        if not urls:
+            return {}
 
+        def extract(source_url):
+            try:
+                html_content = self.content_extractor.fetch_html(source_url)
             except Exception as e:
-                logger.error(f"Error in automation cycle: {str(e)}", exc_info=True)
+                logger.error(f"Failed to fetch URL {source_url}: {e}")
+                return None
+            return self.extraction_pool.extract(source_url, html_content)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.extraction_pool.size, thread_name_prefix='pre-extract') as executor:
+            results = dict(zip([url for url, _ in urls], executor.map(extract, [url for url, _ in urls])))
+
+        # Failures are recorded here, on the scheduler thread, which owns the database session
+        for source_url, feed_key in urls:
+            if results[source_url] is None:
+                logger.error(f"Extraction failed for {source_url}, skipping.")
+                self.retry_tracker.record_failure(source_url, feed_key, 'extraction', 'Content extraction returned nothing')
+        logger.info(f"Pre-extracted {len(urls)} article(s) in {time.perf_counter() - start:.2f}s with {self.extraction_pool.size} worker process(es).")
+        return results
+
+    def process_articles_concurrently(self, discovered: list, pre_extracted: dict):
+        """
+        Prepares the articles in PIPELINE_ORDER on this thread, sends their prompts to the AI
+        concurrently (AI_DISPATCH_CONFIG) and finishes each one (JSON, schema, database,
+        publishing) here as its response arrives. Database work never leaves this thread.
+        """
+        pending = {}
+        deferred = {}  # source_url of a story in flight -> contexts of its copies
+
+        def dispatch(context):
+            if context is None:
+                return
+            if 'deferred_for' in context:
+                deferred.setdefault(context['deferred_for'], []).append(context)
+                return
+            # Stories in flight count for the near-duplicate check of the next ones
+            self.duplicate_detector.hold(context['source_url'], context['feed_key'], context['metadata'].get('title') or '', context['extracted_data'].get('content_html') or '')
+            pending[self.ai_processor.submit_prompt(context['prompt'], context['category'])] = context
+
+        try:
+            for feed_key, category, articles_to_process in discovered:
+                for article_data in articles_to_process:
+                    if article_data.source_url in pre_extracted and pre_extracted[article_data.source_url] is None:
+                        continue  # Extraction failed in the pool; the failure is already recorded
+                    dispatch(self.prepare_article(article_data, category, feed_key, pre_extracted.get(article_data.source_url)))
+            logger.info(f"{len(pending)} prompt(s) dispatched to the AI, {sum(len(copies) for copies in deferred.values())} copy(ies) deferred.")
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    context = pending.pop(future)
+                    try:
+                        ai_result_json = future.result()
+                    except Exception as e:
+                        logger.error(f"AI processing raised for {context['source_url']}: {e}", exc_info=True)
+                        ai_result_json = None
+                    self.duplicate_detector.release(context['source_url'])
+                    self.finish_article(context, ai_result_json)
+                    # Copies are skipped if the story was saved, and processed in its place if it failed
+                    for copy in deferred.pop(context['source_url'], []):
+                        dispatch(self.prepare_prompt(copy['source_url'], copy['category'], copy['feed_key'], copy['extracted_data']))
+        finally:
+            for context in pending.values():
+                self.duplicate_detector.release(context['source_url'])
+            # Only left over when the loop was interrupted: retry them instead of losing the story
+            for copies in deferred.values():
+                for copy in copies:
+                    self.retry_tracker.record_failure(copy['source_url'], copy['feed_key'], 'ai', 'Deferred near-duplicate was not processed')
+
+    def process_single_article(self, article_dto: ExtractedArticleDTO, category: str, feed_key: str, extracted_data: dict = None):
+        """
+        Processes a single article from extraction to publishing readiness.
+        `extracted_data` is the result of a previous extraction (see pre_extract_articles), if any.
+        """
+        context = self.prepare_article(article_dto, category, feed_key, extracted_data)
+        if context and 'prompt' in context:
+            self.finish_article(context, self.ai_processor.send_prompt(context['prompt'], category=category))
 
-    def process_single_article(self, article_dto: ExtractedArticleDTO, category: str, feed_key: str):
-        """Processes a single article from extraction to publishing readiness."""
+    def prepare_article(self, article_dto: ExtractedArticleDTO, category: str, feed_key: str, extracted_data: dict = None) -> dict | None:
+        """
+        Extracts an article and builds its prompt. Returns the context used by finish_article,
+        or None if the article was skipped or failed (the failure is recorded). A copy of a
+        story still in flight gets a context with 'deferred_for' (the URL of that story) and
+        no prompt; see prepare_prompt.
+        """
         source_url = article_dto.source_url
         logger.info(f"--- Processing URL: {source_url} ---")
 
         # Step 2: Extract and sanitize content
-        extracted_data = self.content_extractor.extract(source_url)
+        if extracted_data is None:
+            extracted_data = self.content_extractor.extract(source_url)
         if not extracted_data:
             logger.error(f"Extraction failed for {source_url}, skipping.")
+            self.retry_tracker.record_failure(source_url, feed_key, 'extraction', 'Content extraction returned nothing')
+            return
+
+        return self.prepare_prompt(source_url, category, feed_key, extracted_data)
+
+    def prepare_prompt(self, source_url: str, category: str, feed_key: str, extracted_data: dict) -> dict | None:
+        """
+        Checks an extracted article against the stories already covered and builds its prompt.
+        A duplicate of a saved story is marked as skipped. A duplicate of a story still held
+        in flight is only deferred: its context carries 'deferred_for' and is checked again
+        once that story finishes, so the copy is processed if the original fails.
+        """
+        # Acessa os metadados corretamente dentro do dicionário aninhado
+        metadata = extracted_data.get('metadata', {})
+
+        # Step 2.5: Skip stories another source already covered, before spending an AI call
+        duplicate = self.duplicate_detector.find_duplicate(metadata.get('title') or '', extracted_data.get('content_html') or '')
+        if duplicate and self.duplicate_detector.is_held(duplicate.source_url):
+            logger.info(f"{source_url} looks like {duplicate.source_url}, still in flight. Deferring it until that one finishes.")
+            return {
+                'source_url': source_url,
+                'category': category,
+                'feed_key': feed_key,
+                'extracted_data': extracted_data,
+                'metadata': metadata,
+                'deferred_for': duplicate.source_url,
+            }
+        if duplicate:
+            self._save_skipped_article(source_url, feed_key, metadata, f"Near-duplicate of {duplicate.source_url}")
             return
 
         # Step 3: Rewrite with AI
         wp_url = WORDPRESS_CONFIG.get('url', '')
         parsed_url = urlparse(wp_url)
         domain = f"{parsed_url.scheme}://{parsed_url.netloc}" if wp_url else ""
-        
-        # Acessa os metadados corretamente dentro do dicionário aninhado
-        metadata = extracted_data.get('metadata', {})
 
         featured_image_url = metadata.get('featured_image') or ""
         prompt = UNIVERSAL_PROMPT.format(
@@ -195,12 +418,26 @@ class ContentAutomationScheduler:
             excerpt=metadata.get('summary') or "Sem resumo",
             domain=domain,
             featured_image_url=featured_image_url,
-            content=extracted_data.get('content_html')
+            # Template blocks removed and trimmed to the category's token budget
+            content=self.prompt_reducer.reduce(extracted_data.get('content_html'), category, source_url)
         )
-        ai_result_json = self.ai_processor.send_prompt(prompt, category=category)
+        return {
+            'source_url': source_url,
+            'category': category,
+            'feed_key': feed_key,
+            'extracted_data': extracted_data,
+            'metadata': metadata,
+            'prompt': prompt,
+        }
+
+    def finish_article(self, context: dict, ai_result_json: str | None):
+        """Parses the AI response of a prepared article, then saves and publishes it."""
+        source_url, feed_key = context['source_url'], context['feed_key']
+        extracted_data, metadata = context['extracted_data'], context['metadata']
 
         if not ai_result_json:
             logger.error(f"AI processing failed for {source_url}. Skipping article.")
+            self.retry_tracker.record_failure(source_url, feed_key, 'ai', 'AI processing returned no response')
             return
         
         # The AI can sometimes wrap the JSON in markdown or add extra text.
@@ -208,6 +445,8 @@ class ContentAutomationScheduler:
         match = re.search(r'\{.*\}', ai_result_json, re.DOTALL)
         if not match:
             logger.error(f"Could not find a valid JSON object in the AI's response for {source_url}. Full response: {ai_result_json}")
+            self.retry_tracker.record_failure(source_url, feed_key, 'json', 'No JSON object in the AI response')
+            self.ai_processor.discard_cached_response(context['prompt'])  # Generate it again on the retry
             return
         cleaned_json = match.group(0)
         
@@ -215,6 +454,15 @@ class ContentAutomationScheduler:
             ai_result = json.loads(cleaned_json)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to decode JSON from AI for {source_url}. Error: {e}. Cleaned response was: {cleaned_json}")
+            self.retry_tracker.record_failure(source_url, feed_key, 'json', f"Invalid JSON: {e}")
+            self.ai_processor.discard_cached_response(context['prompt'])  # Generate it again on the retry
+            return
+
+        missing_fields = [field for field in ('titulo_final', 'meta_description', 'conteudo_final', 'tags', 'categoria') if field not in ai_result]
+        if missing_fields:
+            logger.error(f"AI response for {source_url} is missing fields: {missing_fields}")
+            self.retry_tracker.record_failure(source_url, feed_key, 'json', f"Missing fields: {', '.join(missing_fields)}")
+            self.ai_processor.discard_cached_response(context['prompt'])  # Generate it again on the retry
             return
 
         # Step 4: Generate Schema.org
@@ -224,6 +472,7 @@ class ContentAutomationScheduler:
             image_url=metadata.get('featured_image'),
             canonical_url=metadata.get('canonical_url'),
             date_published=metadata.get('published_time'),
+            date_modified=metadata.get('modified_time'),
             author_name=metadata.get('author'),
             publisher_name=PIPELINE_CONFIG['publisher_name'],
             publisher_logo_url=PIPELINE_CONFIG['publisher_logo_url']
@@ -246,6 +495,7 @@ class ContentAutomationScheduler:
 
         # Step 6: Persist the article to the database to prevent reprocessing.
         # This is crucial for the rss_monitor to know which articles have been seen.
+        saved = False
         try:
             # NOTE: Field names are inferred from context. Adjust if your Article model is different.
             new_article = Article(
@@ -266,8 +516,14 @@ class ContentAutomationScheduler:
                 attribution=final_dto.attribution
             )
             db.session.add(new_article)
+            db.session.flush()
+            # Images and embeds go in the same transaction, in one bulk insert
+            self.media_index.record(new_article.id, extracted_data.get('media'))
             db.session.commit()
+            saved = True
             logger.info(f"Article '{final_dto.title}' saved to database with status 'processed'.")
+            self.retry_tracker.clear(source_url)
+            self.duplicate_detector.remember(source_url, feed_key, metadata.get('title') or '', extracted_data.get('content_html') or '')
 
             # Step 7: Publish the newly created article to WordPress
             self.wordpress_publisher.publish_article(new_article.id)
@@ -275,9 +531,68 @@ class ContentAutomationScheduler:
         except Exception as e:
             db.session.rollback()
             logger.error(f"Failed to save article {source_url} to database. It will be retried later. Error: {e}", exc_info=True)
+            if not saved:
+                self.retry_tracker.record_failure(source_url, feed_key, 'db', str(e))
             return  # Exit if we can't save, to avoid trying to publish an unsaved article
 
 
+    def enqueue_pushed_articles(self, feed_key: str, articles: list[ExtractedArticleDTO]):
+        """Schedules entries pushed by a WebSub hub to be processed right away, off the request thread."""
+        self.scheduler.add_job(
+            func=self.process_pushed_articles,
+            trigger='date',
+            args=[feed_key, articles],
+            name=f'WebSub push ({feed_key})',
+            misfire_grace_time=300
+        )
+
+    def process_pushed_articles(self, feed_key: str, articles: list[ExtractedArticleDTO]):
+        """Runs entries received via WebSub through the same pipeline used by polling."""
+        with self.app.app_context(), self._pipeline_lock:
+            try:
+                category = RSS_FEEDS.get(feed_key, {}).get('category')
+                if not category:
+                    logger.warning(f"Pushed entries for unknown feed '{feed_key}'. Skipping.")
+                    return
+
+                self.known_urls.refresh()
+                self.known_urls.exclude(self.retry_tracker.pending_urls())
+                new_urls = self.known_urls.unknown([article.source_url for article in articles])
+                logger.info(f"WebSub: {len(new_urls)} new article(s) pushed for {feed_key}.")
+                for article in articles:
+                    if article.source_url not in new_urls:
+                        continue
+                    self.known_urls.add(article.source_url)
+                    self.process_single_article(article, category, feed_key)
+                self.known_urls.save()
+            except Exception as e:
+                logger.error(f"Error processing pushed articles for {feed_key}: {str(e)}", exc_info=True)
+
+    def websub_cycle(self):
+        """Subscribes feeds to their WebSub hubs and renews expiring subscriptions."""
+        with self.app.app_context():
+            try:
+                self.websub.subscribe_all()
+            except Exception as e:
+                logger.error(f"Error in WebSub subscription cycle: {str(e)}", exc_info=True)
+
+    def _save_skipped_article(self, source_url: str, feed_key: str, metadata: dict, reason: str):
+        """Persists an article that will not be processed so discovery does not pick it up again."""
+        try:
+            db.session.add(Article(
+                source_url=source_url,
+                original_title=metadata.get('title'),
+                status='skipped',
+                feed_type=feed_key,
+                error_message=reason
+            ))
+            db.session.commit()
+            logger.info(f"Article {source_url} marked as skipped: {reason}")
+            self.retry_tracker.clear(source_url)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to mark article {source_url} as skipped. Error: {e}", exc_info=True)
+
     def cleanup_cycle(self):
         """Database cleanup cycle"""
         # Adicionado para garantir que o ciclo de limpeza tenha acesso ao contexto da aplicação.
@@ -285,6 +600,11 @@ class ContentAutomationScheduler:
             try:
                 logger.info("Starting cleanup cycle")
                 self.rss_monitor.cleanup_old_articles()
+                self.duplicate_detector.cleanup()
+                if self.content_extractor.html_cache:
+                    self.content_extractor.html_cache.purge_expired()
+                if self.ai_processor.response_cache:
+                    self.ai_processor.response_cache.purge_expired()
                 logger.info("Cleanup cycle completed")
             except Exception as e:
                 logger.error(f"Error in cleanup cycle: {str(e)}", exc_info=True)
@@ -298,7 +618,7 @@ class ContentAutomationScheduler:
 
     def get_status(self):
         """Get scheduler status"""
-        return {
+        status = {
             'running': self.is_running,
             'jobs': [
                 {
@@ -309,6 +629,14 @@ class ContentAutomationScheduler:
                 for job in self.scheduler.get_jobs()
             ]
         }
+        if self.poll_planner:
+            status['feed_cadence'] = self.poll_planner.get_status()
+        if WEBSUB_CONFIG.get('enabled'):
+            status['websub'] = self.websub.get_status()
+        status['pending_retries'] = self.retry_tracker.get_status()
+        if self.extraction_pool:
+            status['extraction_pool'] = self.extraction_pool.get_stats()
+        return status
 
 # Global scheduler instance
 scheduler_instance = None
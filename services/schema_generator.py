@@ -17,7 +17,8 @@ class SchemaGenerator:
         date_published: str,
         author_name: str,
         publisher_name: str,
-        publisher_logo_url: str
+        publisher_logo_url: str,
+        date_modified: str = None
     ) -> dict:
         """
         Creates a NewsArticle schema object.
@@ -29,7 +30,7 @@ class SchemaGenerator:
             "description": summary,
             "image": [image_url],
             "datePublished": date_published or datetime.utcnow().isoformat(),
-            "dateModified": datetime.utcnow().isoformat(),
+            "dateModified": date_modified or datetime.utcnow().isoformat(),
             "author": {"@type": "Person", "name": author_name or publisher_name},
             "publisher": {
                 "@type": "Organization",
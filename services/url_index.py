@@ -0,0 +1,217 @@
+import json
+import logging
+import math
+import os
+import struct
+import time
+from sqlalchemy import bindparam, func
+
+from extensions import db
+from models import Article, hash_url
+from config import URL_INDEX_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over sha256 hex digests.
+    Answers "definitely not seen" or "maybe seen"; it never forgets an added item.
+    """
+
+    _MAGIC = b'IAMNBF1'
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: str):
+        # Double hashing (Kirsch-Mitzenmacher) over two independent slices of the sha256 digest.
+        h1 = int(digest[:16], 16)
+        h2 = int(digest[16:32], 16) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, digest: str):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def save(self, path: str, metadata: dict):
+        """Writes the filter atomically, with a JSON header holding its parameters and `metadata`."""
+        header = json.dumps({
+            'capacity': self.capacity,
+            'error_rate': self.error_rate,
+            'count': self.count,
+            **metadata
+        }).encode('utf-8')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self._MAGIC)
+            f.write(struct.pack('>I', len(header)))
+            f.write(header)
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """Reads a filter written by save(). Returns (filter, metadata) or (None, None) if unusable."""
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(cls._MAGIC)) != cls._MAGIC:
+                    return None, None
+                header_size, = struct.unpack('>I', f.read(4))
+                metadata = json.loads(f.read(header_size))
+                bloom = cls(metadata['capacity'], metadata['error_rate'])
+                bits = f.read()
+        except (OSError, ValueError, KeyError, struct.error):
+            return None, None
+        if len(bits) != len(bloom.bits):
+            return None, None
+        bloom.bits = bytearray(bits)
+        bloom.count = metadata['count']
+        return bloom, metadata
+
+
+class KnownUrlIndex:
+    """
+    Set-like view of the source URLs already stored in the articles table.
+
+    A persisted Bloom filter answers most "is this URL new?" questions without touching the
+    database. Only URLs the filter reports as "maybe seen" are confirmed with one batched
+    IN query on the indexed source_url_hash column. The filter is updated incrementally with
+    the articles inserted since it was last saved, so the cost of a cycle does not grow with
+    the size of the table.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or URL_INDEX_CONFIG['bloom_path']
+        self.bloom = None
+        self.last_article_id = 0
+        self._seen_this_cycle = set()
+
+    def refresh(self):
+        """Loads the filter (once) and adds the articles inserted since the last refresh."""
+        start = time.perf_counter()
+        self._seen_this_cycle = set()
+        backfilled = self._backfill_missing_hashes()
+
+        if self.bloom is None and not backfilled:
+            self.bloom, metadata = BloomFilter.load(self.path)
+            if self.bloom is not None:
+                self.last_article_id = metadata.get('last_article_id', 0)
+
+        # Backfilled rows are older than the filter's high-water mark, so they need a full rebuild.
+        if self.bloom is None or backfilled or self.bloom.count > self.bloom.capacity:
+            self._rebuild()
+        else:
+            # Tables created without AUTOINCREMENT on SQLite reuse the ids of deleted rows: once the
+            # newest rows are gone the next insert takes max(id) + 1, which may be at or below the mark
+            max_id = db.session.query(func.max(Article.id)).scalar() or 0
+            if max_id < self.last_article_id:
+                self.last_article_id = max_id
+            added = self._add_articles_after(self.last_article_id)
+            logger.info(f"Known URL index updated with {added} new article(s) in {time.perf_counter() - start:.3f}s.")
+
+    def _rebuild(self):
+        """Rebuilds the filter from scratch, growing it when the table outgrew its capacity."""
+        start = time.perf_counter()
+        capacity = URL_INDEX_CONFIG.get('capacity', 1_000_000)
+        total = Article.query.count()
+        while total > capacity:
+            capacity *= 2
+        self.bloom = BloomFilter(capacity, URL_INDEX_CONFIG.get('error_rate', 0.001))
+        self.last_article_id = 0
+        added = self._add_articles_after(0)
+        self.save()
+        logger.info(f"Known URL index rebuilt with {added} article(s) (capacity {capacity}) in {time.perf_counter() - start:.2f}s.")
+
+    def _add_articles_after(self, article_id: int) -> int:
+        batch_size = URL_INDEX_CONFIG.get('batch_size', 10000)
+        added = 0
+        while True:
+            rows = (
+                Article.query.with_entities(Article.id, Article.source_url_hash)
+                .filter(Article.id > article_id, Article.source_url_hash.isnot(None))
+                .order_by(Article.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            for row_id, url_hash in rows:
+                self.bloom.add(url_hash)
+            article_id = rows[-1][0]
+            added += len(rows)
+        self.last_article_id = max(self.last_article_id, article_id)
+        return added
+
+    def _backfill_missing_hashes(self) -> int:
+        """Fills source_url_hash for rows created before the column existed."""
+        batch_size = URL_INDEX_CONFIG.get('batch_size', 10000)
+        filled = 0
+        while True:
+            rows = (
+                Article.query.with_entities(Article.id, Article.source_url)
+                .filter(Article.source_url_hash.is_(None))
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            db.session.execute(
+                Article.__table__.update()
+                .where(Article.__table__.c.id == bindparam('row_id'))
+                .values(source_url_hash=bindparam('url_hash')),
+                [{'row_id': row_id, 'url_hash': hash_url(url)} for row_id, url in rows]
+            )
+            db.session.commit()
+            filled += len(rows)
+        if filled:
+            logger.info(f"Backfilled source_url_hash for {filled} existing article(s).")
+        return filled
+
+    def unknown(self, urls: list) -> list:
+        """Returns the URLs of `urls` that are not known, preserving their order."""
+        candidates = [url for url in dict.fromkeys(urls) if url not in self._seen_this_cycle]
+        hashes = {url: hash_url(url) for url in candidates}
+        maybe_known = [hashes[url] for url in candidates if hashes[url] in self.bloom]
+
+        known_hashes = set()
+        if maybe_known:
+            known_hashes = {
+                row[0] for row in Article.query.with_entities(Article.source_url_hash)
+                .filter(Article.source_url_hash.in_(maybe_known)).all()
+            }
+        return [url for url in candidates if hashes[url] not in known_hashes]
+
+    def __contains__(self, url: str) -> bool:
+        return not self.unknown([url])
+
+    def add(self, url: str):
+        """Marks a URL as seen for the rest of the cycle."""
+        self._seen_this_cycle.add(url)
+        self.bloom.add(hash_url(url))
+
+    def exclude(self, urls: list):
+        """Hides URLs from unknown() for the rest of the cycle without recording them as known."""
+        self._seen_this_cycle.update(urls)
+
+    def __len__(self) -> int:
+        return self.bloom.count if self.bloom else 0
+
+    def save(self):
+        """Persists the filter so the next start only needs the incremental update."""
+        try:
+            self.bloom.save(self.path, {'last_article_id': self.last_article_id})
+        except OSError as e:
+            logger.warning(f"Could not persist the known URL index to {self.path}: {e}")
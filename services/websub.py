@@ -0,0 +1,214 @@
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import datetime, timedelta
+from xml.etree import ElementTree
+
+import feedparser
+import requests
+
+from extensions import db
+from models import WebSubSubscription
+from dto import ExtractedArticleDTO
+from services.http_client import get_http_client
+from config import RSS_FEEDS, WEBSUB_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_ATOM_LINK = '{http://www.w3.org/2005/Atom}link'
+
+# Algoritmos aceitos no cabeçalho X-Hub-Signature (WebSub, seção 8)
+_SIGNATURE_ALGORITHMS = {
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha384': hashlib.sha384,
+    'sha512': hashlib.sha512,
+}
+
+class WebSubSubscriber:
+    """
+    Subscribes the RSS feeds to their WebSub hubs so new entries are pushed to us as soon
+    as they are published, instead of waiting for the next polling cycle.
+    Handles hub discovery, intent verification and HMAC validation of pushed content.
+    """
+
+    def subscribe_all(self):
+        """Subscribes every feed URL, renewing subscriptions whose lease is about to expire."""
+        if not WEBSUB_CONFIG.get('enabled'):
+            return
+        if not WEBSUB_CONFIG.get('callback_base_url'):
+            logger.warning("WebSub habilitado, mas WEBSUB_CALLBACK_URL não está definida. Assinaturas ignoradas.")
+            return
+
+        renew_before = timedelta(hours=WEBSUB_CONFIG.get('renew_before_hours', 12))
+        for feed_key, feed_config in RSS_FEEDS.items():
+            for topic_url in feed_config['urls']:
+                subscription = WebSubSubscription.query.filter_by(topic_url=topic_url).first()
+                if (
+                    subscription and subscription.state == 'verified' and subscription.lease_expires_at
+                    and subscription.lease_expires_at - renew_before > datetime.utcnow()
+                ):
+                    continue
+                self.subscribe(feed_key, topic_url)
+
+    def subscribe(self, feed_key: str, topic_url: str) -> WebSubSubscription | None:
+        """Sends a subscription request to the feed's hub. The hub confirms it asynchronously."""
+        try:
+            hub_url, self_url = self.discover_hub(topic_url)
+            if not hub_url:
+                logger.info(f"[{feed_key}] Feed {topic_url} não anuncia um hub WebSub. Mantendo apenas o polling.")
+                return None
+
+            subscription = WebSubSubscription.query.filter_by(topic_url=topic_url).first()
+            if subscription is None:
+                subscription = WebSubSubscription(topic_url=topic_url, feed_key=feed_key)
+                db.session.add(subscription)
+            subscription.hub_url = hub_url
+            subscription.hub_topic = self_url or topic_url
+            # A renewal keeps the current secret and state until the hub verifies it, so the
+            # pushes it keeps sending in the meantime are still accepted
+            subscription.pending_secret = secrets.token_hex(32)
+            if subscription.state != 'verified':
+                subscription.state = 'pending'
+            db.session.commit()  # The id is part of the callback URL
+
+            response = get_http_client().post(
+                hub_url,
+                data={
+                    'hub.mode': 'subscribe',
+                    'hub.topic': subscription.hub_topic,
+                    'hub.callback': self.callback_url(subscription),
+                    'hub.secret': subscription.pending_secret,
+                    'hub.lease_seconds': WEBSUB_CONFIG.get('lease_seconds', 432000),
+                },
+                timeout=15
+            )
+            if response.status_code not in (202, 204):
+                raise requests.RequestException(f"Hub returned {response.status_code}: {response.text[:200]}")
+            logger.info(f"[{feed_key}] Assinatura WebSub de {subscription.hub_topic} enviada para {hub_url}.")
+            return subscription
+
+        except requests.RequestException as e:
+            db.session.rollback()
+            logger.error(f"[{feed_key}] Falha ao assinar {topic_url} via WebSub: {e}")
+            return None
+
+    def discover_hub(self, topic_url: str) -> tuple[str | None, str | None]:
+        """
+        Returns the (hub, self) URLs advertised by a feed, via HTTP Link headers or <atom:link>
+        elements. WEBSUB_CONFIG['hub_url'] overrides the advertised hub (e.g. a local hub).
+        """
+        response = get_http_client().get(topic_url, timeout=15)
+        response.raise_for_status()
+
+        hub_url = response.links.get('hub', {}).get('url')
+        self_url = response.links.get('self', {}).get('url')
+        if not hub_url:
+            try:
+                root = ElementTree.fromstring(response.content)
+                for link in root.iter(_ATOM_LINK):
+                    if link.get('rel') == 'hub' and not hub_url:
+                        hub_url = link.get('href')
+                    elif link.get('rel') == 'self' and not self_url:
+                        self_url = link.get('href')
+            except ElementTree.ParseError:
+                pass
+
+        return WEBSUB_CONFIG.get('hub_url') or hub_url, self_url
+
+    def callback_url(self, subscription: WebSubSubscription) -> str:
+        return f"{WEBSUB_CONFIG['callback_base_url'].rstrip('/')}/websub/callback/{subscription.id}"
+
+    def verify_intent(self, subscription_id: int, args: dict) -> tuple[str, int]:
+        """
+        Answers the hub's verification of intent (GET on the callback).
+        Returns the response body and status code.
+        """
+        subscription = db.session.get(WebSubSubscription, subscription_id)
+        mode = args.get('hub.mode')
+        if subscription is None or args.get('hub.topic') != subscription.hub_topic:
+            logger.warning(f"Verificação WebSub recusada para a assinatura {subscription_id}: tópico desconhecido.")
+            return 'Unknown topic', 404
+
+        if mode == 'denied':
+            subscription.state = 'denied'
+            db.session.commit()
+            logger.warning(f"[{subscription.feed_key}] Hub recusou a assinatura de {subscription.hub_topic}: {args.get('hub.reason')}")
+            return '', 200
+
+        expected_state = {'subscribe': 'pending', 'unsubscribe': 'unsubscribing'}.get(mode)
+        if expected_state is None or subscription.state not in (expected_state, 'verified'):
+            return 'Unexpected mode', 404
+
+        if mode == 'subscribe':
+            try:
+                lease_seconds = int(args.get('hub.lease_seconds') or WEBSUB_CONFIG.get('lease_seconds', 432000))
+            except ValueError:
+                logger.warning(f"[{subscription.feed_key}] Verificação WebSub com hub.lease_seconds inválido: {args.get('hub.lease_seconds')!r}")
+                return 'Invalid hub.lease_seconds', 400
+            if subscription.pending_secret:
+                subscription.secret, subscription.pending_secret = subscription.pending_secret, None
+            subscription.state = 'verified'
+            subscription.lease_expires_at = datetime.utcnow() + timedelta(seconds=lease_seconds)
+        else:
+            subscription.state = 'unsubscribed'
+        db.session.commit()
+        logger.info(f"[{subscription.feed_key}] Intenção WebSub '{mode}' confirmada para {subscription.hub_topic}.")
+        return args.get('hub.challenge', ''), 200
+
+    def receive_push(self, subscription_id: int, body: bytes, signature_header: str | None) -> tuple[str | None, list[ExtractedArticleDTO]]:
+        """
+        Validates and parses content pushed by the hub.
+        Returns the feed key and the entries, or (None, []) if the push must be ignored.
+        """
+        subscription = db.session.get(WebSubSubscription, subscription_id)
+        if subscription is None or subscription.state != 'verified':
+            logger.warning(f"Conteúdo WebSub recebido para assinatura desconhecida ou inativa: {subscription_id}")
+            return None, []
+        if not self.signature_is_valid(subscription.secret, body, signature_header):
+            logger.warning(f"[{subscription.feed_key}] Assinatura HMAC inválida em conteúdo WebSub. Ignorando.")
+            return None, []
+
+        feed = feedparser.parse(body)
+        articles = []
+        for entry in feed.entries:
+            if not hasattr(entry, 'link'):
+                continue
+            parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+            articles.append(ExtractedArticleDTO(source_url=entry.link, published_at=datetime(*parsed[:6]) if parsed else None))
+
+        subscription.last_push_at = datetime.utcnow()
+        subscription.push_count = (subscription.push_count or 0) + 1
+        db.session.commit()
+        logger.info(f"[{subscription.feed_key}] WebSub: {len(articles)} entrada(s) recebida(s) do hub.")
+        return subscription.feed_key, articles
+
+    @staticmethod
+    def signature_is_valid(secret: str, body: bytes, signature_header: str | None) -> bool:
+        """Checks an X-Hub-Signature header ('<algorithm>=<hex digest>') against the body."""
+        if not secret or not signature_header or '=' not in signature_header:
+            return False
+        algorithm, _, received = signature_header.partition('=')
+        digestmod = _SIGNATURE_ALGORITHMS.get(algorithm.strip().lower())
+        if digestmod is None:
+            return False
+        expected = hmac.new(secret.encode('utf-8'), body, digestmod).hexdigest()
+        return hmac.compare_digest(expected, received.strip().lower())
+
+    def has_active_subscriptions(self) -> bool:
+        return WebSubSubscription.query.filter_by(state='verified').count() > 0
+
+    def get_status(self) -> list:
+        return [
+            {
+                'feed_key': s.feed_key,
+                'topic_url': s.topic_url,
+                'hub_url': s.hub_url,
+                'state': s.state,
+                'lease_expires_at': s.lease_expires_at.isoformat() if s.lease_expires_at else None,
+                'last_push_at': s.last_push_at.isoformat() if s.last_push_at else None,
+                'push_count': s.push_count or 0,
+            }
+            for s in WebSubSubscription.query.order_by(WebSubSubscription.feed_key).all()
+        ]
@@ -1,9 +1,10 @@
 import json
 import logging
-import requests
 from datetime import datetime
 from extensions import db
 from models import Article, ProcessingLog
+from services.http_client import get_http_client
+from services.media_index import MediaIndex
 from config import WORDPRESS_CONFIG, WORDPRESS_CATEGORIES
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,7 @@ class WordPressPublisher:
         self.auth = (WORDPRESS_CONFIG['user'], WORDPRESS_CONFIG['password'])
         if not self.auth[0] or not self.auth[1]:
             logger.warning("Usuário ou senha do WordPress não configurados. A publicação provavelmente falhará.")
+        self.media_index = MediaIndex()
 
     def publish_processed_articles(self, max_articles=3):
         """
@@ -68,7 +70,7 @@ class WordPressPublisher:
                     post_data['featured_media'] = featured_image_id
 
                 # Publish post
-                response = requests.post(
+                response = get_http_client().post(
                     f"{self.base_url}posts",
                     json=post_data,
                     auth=self.auth,
@@ -147,7 +149,7 @@ class WordPressPublisher:
                 post_data['featured_media'] = featured_image_id
 
             # Publish post
-            response = requests.post(
+            response = get_http_client().post(
                 f"{self.base_url}posts",
                 json=post_data,
                 auth=self.auth,
@@ -179,13 +181,18 @@ class WordPressPublisher:
             db.session.commit()
 
     def _upload_featured_image(self, image_url, title):
-        """Upload featured image to WordPress media library"""
+        """Upload featured image to WordPress media library, reusing a previous upload of the same URL"""
         try:
+            media_id = self.media_index.get_uploaded_media_id(image_url)
+            if media_id:
+                logger.info(f"Featured image already in the media library (ID {media_id}). Skipping upload.")
+                return media_id
+
             # Download image
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(image_url, timeout=30, headers=headers)
+            response = get_http_client().get(image_url, timeout=30, headers=headers)
             response.raise_for_status()
             
             # Check if response is actually an image
@@ -214,7 +221,7 @@ class WordPressPublisher:
                 'alt_text': title[:100]
             }
 
-            upload_response = requests.post(
+            upload_response = get_http_client().post(
                 f"{self.base_url}media",
                 files=files,
                 data=data,
@@ -230,6 +237,7 @@ class WordPressPublisher:
                     media_data = media_data[0]
 
                 logger.info(f"Successfully uploaded featured image with ID: {media_data['id']}")
+                self.media_index.mark_uploaded(image_url, media_data['id'], media_data.get('source_url'))
                 return media_data['id']
             else:
                 logger.error(f"Failed to upload featured image: {upload_response.status_code} - {upload_response.text}")
@@ -275,7 +283,7 @@ class WordPressPublisher:
         for tag_name in tag_names:
             try:
                 # Check if tag exists
-                response = requests.get(
+                response = get_http_client().get(
                     f"{self.base_url}tags",
                     params={'search': tag_name},
                     auth=self.auth,
@@ -286,7 +294,7 @@ class WordPressPublisher:
                     tag_ids.append(response.json()[0]['id'])
                 else:
                     # Create new tag
-                    new_tag_response = requests.post(
+                    new_tag_response = get_http_client().post(
                         f"{self.base_url}tags",
                         json={'name': tag_name},
                         auth=self.auth,
@@ -317,7 +325,7 @@ class WordPressPublisher:
         """Test WordPress connection"""
         try:
             # Test with a simple GET request to the posts endpoint
-            response = requests.get(f"{self.base_url}posts", auth=self.auth, timeout=10)
+            response = get_http_client().get(f"{self.base_url}posts", auth=self.auth, timeout=10)
             logger.info(f"WordPress connection test: {response.status_code} - {self.base_url}posts")
             return response.status_code == 200
         except Exception as e: